@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of calibrating Nelson-Siegel-Svensson curves directly to the
+dirty prices of coupon bonds (sparse cash-flow matrix on a monthly grid).
+
+Run as ``python benchmarks/bench_bonds.py`` from the repository root.
+"""
+
+from timeit import default_timer
+
+import numpy as np
+from scipy.sparse import lil_matrix
+
+from nelson_siegel_svensson import NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.bonds import bond_prices, calibrate_nss_bonds
+
+N_BONDS = 300
+N_RUNS = 10
+
+
+def sample_bonds(n: int, seed: int = 0):
+    """Cash-flow matrix, cash-flow times and noisy dirty prices of n
+    semi-annual coupon bonds with random maturities up to 30 years.
+    """
+    rng = np.random.default_rng(seed)
+    times = np.arange(1, 30 * 12 + 1) / 12
+    cash_flows = lil_matrix((n, times.size))
+    for i in range(n):
+        last = int(rng.integers(3, times.size))
+        cash_flows[i, last::-6] = rng.uniform(0.0, 0.06) / 2
+        cash_flows[i, last] += 1
+    cash_flows = cash_flows.tocsr()
+    curve = NelsonSiegelSvenssonCurve(0.03, -0.02, 0.01, -0.01, 0.8, 6.0)
+    prices = bond_prices(curve, cash_flows, times)
+    return cash_flows, times, prices * (1 + rng.normal(0.0, 1e-4, n))
+
+
+def main() -> None:
+    cash_flows, times, prices = sample_bonds(N_BONDS)
+    for errors, weights in [
+        ("price", None),
+        ("price", "duration"),
+        ("yield", None),
+    ]:
+        start = default_timer()
+        for _ in range(N_RUNS):
+            curve, opt_res = calibrate_nss_bonds(
+                cash_flows, times, prices, errors=errors, weights=weights
+            )
+        elapsed = default_timer() - start
+        name = f"{errors} errors, weights {weights}"
+        print(
+            f"{name:<32} nfev {opt_res.nfev:3d}  njev {opt_res.njev:3d}  "
+            f"{1e3 * elapsed / N_RUNS:7.2f} ms/curve"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of bounded, log-tau reparameterized calibration against
+unconstrained calibration of Nelson-Siegel-Svensson curves: failures,
+degenerate taus, evaluation counts, fit quality and the tail of wall
+times over a fleet of noisy curves with random parameters, quoted as decimals
+(scale 1) and in percent (scale %).
+
+Run as ``python benchmarks/bench_bounded.py`` from the repository root.
+"""
+
+from timeit import default_timer
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.calibrate import (
+    calibrate_nss_ols,
+    calibrate_nss_ols_bounded,
+)
+
+T = np.array([0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0])
+N_CURVES = 300
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    tasks = []
+    for _ in range(N_CURVES):
+        curve = NelsonSiegelSvenssonCurve(
+            rng.uniform(0.01, 0.05),
+            rng.uniform(-0.03, 0.03),
+            rng.uniform(-0.05, 0.05),
+            rng.uniform(-0.05, 0.05),
+            rng.uniform(0.2, 3.0),
+            rng.uniform(3.0, 15.0),
+        )
+        tasks.append(curve(T) + rng.normal(0.0, 5e-5, T.size))
+
+    for scale, name, calibrate in [
+        (1, "calibrate_nss_ols", calibrate_nss_ols),
+        (1, "calibrate_nss_ols_bounded", calibrate_nss_ols_bounded),
+        (100, "calibrate_nss_ols", calibrate_nss_ols),
+        (100, "calibrate_nss_ols_bounded", calibrate_nss_ols_bounded),
+    ]:
+        calibrate(T, tasks[0])  # warm-up (imports)
+        seconds, nfev, sse, failures, degenerate = [], [], [], 0, 0
+        for y in tasks:
+            y = scale * y
+            start = default_timer()
+            try:
+                with np.errstate(all="ignore"):
+                    curve, opt_res = calibrate(T, y)
+            except np.linalg.LinAlgError:
+                seconds.append(default_timer() - start)
+                failures += 1
+                degenerate += 1
+                continue
+            seconds.append(default_timer() - start)
+            nfev.append(opt_res.nfev if "nfev" in opt_res else 0)
+            sse.append(np.sum((curve(T) - y) ** 2) / scale**2)
+            failures += not opt_res.success
+            tau1, tau2 = sorted([curve.tau1, curve.tau2])
+            degenerate += tau1 <= 0 or tau2 > 100 or tau2 / tau1 < 1.1
+        seconds_ms = 1e3 * np.array(seconds)
+        print(
+            f"{'%' if scale == 100 else '1':<2} {name:<26} failures {failures:4d}"
+            f"  degenerate taus {degenerate:4d}"
+            f"  nfev mean {np.mean(nfev):6.1f} max {np.max(nfev):5d}"
+            f"  median SSE {np.median(sse):.2e}"
+            f"  ms mean {seconds_ms.mean():6.2f}"
+            f" p99 {np.percentile(seconds_ms, 99):6.2f} max {seconds_ms.max():6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of the batch mode of the calibrate CLI command: throughput
+and peak memory of one process calibrating growing numbers of tasks
+streamed from a JSON Lines file.
+
+Run as ``python benchmarks/bench_cli_batch.py`` from the repository root.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from timeit import default_timer
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelSvenssonCurve
+
+T = [0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0]
+SCRIPT = (
+    "import resource, sys\n"
+    "from nelson_siegel_svensson.cli import cli_main\n"
+    "try:\n"
+    "    cli_main(sys.argv[1:])\n"
+    "finally:\n"
+    "    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "    print(f'peak RSS {rss / 1024:.1f} MB', file=sys.stderr)\n"
+)
+
+
+def write_tasks(path: str, n: int) -> None:
+    """Write n noisy Nelson-Siegel-Svensson calibration tasks to path."""
+    rng = np.random.default_rng(0)
+    curve = NelsonSiegelSvenssonCurve(0.03, -0.02, 0.01, -0.01, 0.8, 6.0)
+    y = curve(np.array(T))
+    with open(path, "w") as f:
+        for i in range(n):
+            values = (y + rng.normal(0.0, 5e-5, len(T))).tolist()
+            f.write(json.dumps({"id": i, "values": values}) + "\n")
+
+
+def main() -> None:
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (1_000, 10_000):
+            path = os.path.join(tmp, f"tasks_{n}.jsonl")
+            write_tasks(path, n)
+            start = default_timer()
+            proc = subprocess.run(
+                [sys.executable, "-c", SCRIPT, "calibrate", "-b", path]
+                + ["-t", json.dumps(T)],
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=True,
+            )
+            elapsed = default_timer() - start
+            print(
+                f"{n:>7} tasks  {n / elapsed:8.1f} fits/s  "
+                f"{proc.stderr.strip().splitlines()[-1]}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of the batch mode of the evaluate CLI command: throughput
+and peak memory of evaluating many curves streamed from a JSON Lines file
+on a monthly grid of 30 years, for each output format.
+
+Run as ``python benchmarks/bench_cli_evaluate.py`` from the repository root.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from timeit import default_timer
+
+import numpy as np
+
+N_CURVES = 100_000
+TIMES = (np.arange(1, 361) / 12).tolist()
+SCRIPT = (
+    "import resource, sys\n"
+    "from nelson_siegel_svensson.cli import cli_main\n"
+    "try:\n"
+    "    cli_main(sys.argv[1:])\n"
+    "finally:\n"
+    "    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "    print(f'peak RSS {rss / 1024:.1f} MB', file=sys.stderr)\n"
+)
+
+
+def write_curves(path: str, n: int) -> None:
+    """Write n random Nelson-Siegel-Svensson curves to path."""
+    rng = np.random.default_rng(0)
+    with open(path, "w") as f:
+        for i in range(n):
+            curve = {
+                "id": i,
+                "beta0": rng.uniform(0.02, 0.06),
+                "beta1": rng.uniform(-0.03, 0.01),
+                "beta2": rng.uniform(-0.03, 0.03),
+                "beta3": rng.uniform(-0.03, 0.03),
+                "tau1": rng.uniform(0.5, 3.0),
+                "tau2": rng.uniform(4.0, 12.0),
+            }
+            f.write(json.dumps(curve) + "\n")
+
+
+def main() -> None:
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "curves.jsonl")
+        write_curves(path, N_CURVES)
+        for output_format in ("npy", "csv", "jsonl"):
+            output = os.path.join(tmp, "values." + output_format)
+            start = default_timer()
+            proc = subprocess.run(
+                [sys.executable, "-c", SCRIPT, "evaluate", "-b", path]
+                + ["-t", json.dumps(TIMES), "-o", output],
+                env=env,
+                stderr=subprocess.PIPE,
+                text=True,
+                check=True,
+            )
+            elapsed = default_timer() - start
+            size = os.path.getsize(output) / 2**20
+            print(
+                f"{output_format:<6} {N_CURVES / elapsed:10.0f} curves/s  "
+                f"{size:8.1f} MB written  {proc.stderr.strip().splitlines()[-1]}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of the dynamic Nelson-Siegel model: wall time and peak of
+traced memory of Kalman filter, smoother and calibration over simulated
+yield panels of increasing numbers of dates, fully quoted and with 5% of
+quotes missing. Both should grow linearly in the number of dates.
+
+Run as ``python benchmarks/bench_dynamic.py`` from the repository root.
+"""
+
+import tracemalloc
+from timeit import default_timer
+from typing import Callable, Tuple
+
+import numpy as np
+
+from nelson_siegel_svensson.dynamic import DynamicNelsonSiegel, calibrate_dynamic_ns
+
+T = np.array([0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0])
+MODEL = DynamicNelsonSiegel(
+    T,
+    1.8,
+    [0.04, -0.02, 0.01],
+    np.diag([0.99, 0.95, 0.9]),
+    np.diag([1e-6, 2e-6, 4e-6]),
+    np.full(T.size, 1e-8),
+)
+
+
+def simulate(n_dates: int, missing: float) -> np.ndarray:
+    """Yield panel simulated from MODEL with a fraction of missing quotes."""
+    rng = np.random.default_rng(0)
+    innovations = (
+        rng.normal(size=(n_dates, 3)) @ np.linalg.cholesky(MODEL.state_covariance).T
+    )
+    factors = np.empty((n_dates, 3))
+    x = MODEL.mean
+    for i in range(n_dates):
+        x = MODEL.mean + MODEL.transition @ (x - MODEL.mean) + innovations[i]
+        factors[i] = x
+    Y = factors @ MODEL.loadings().T + rng.normal(0.0, 1e-4, (n_dates, T.size))
+    Y[rng.random(Y.shape) < missing] = np.nan
+    return Y
+
+
+def measure(func: Callable[[], object]) -> Tuple[float, float]:
+    """Wall time (seconds) and peak of traced memory (MB) of func, measured
+    in separate runs as tracing slows down execution.
+    """
+    start = default_timer()
+    func()
+    seconds = default_timer() - start
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def main() -> None:
+    calibrate_dynamic_ns(T, simulate(100, 0.0), max_iter=1)  # warm-up (imports)
+    for missing in (0.0, 0.05):
+        for n_dates in (1_000, 10_000, 100_000):
+            Y = simulate(n_dates, missing)
+            cases = [
+                ("filter", lambda: MODEL.filter(Y)),
+                ("smooth", lambda: MODEL.smooth(Y)),
+            ]
+            if n_dates <= 1_000:
+                cases.append(
+                    ("calibrate", lambda: calibrate_dynamic_ns(T, Y, max_iter=20))
+                )
+            for name, func in cases:
+                seconds, peak = measure(func)
+                print(
+                    f"missing {missing:4.0%} dates {n_dates:7d} {name:<10}"
+                    f" {1e3 * seconds:10.1f} ms {1e6 * seconds / n_dates:7.2f} us/date"
+                    f" peak {peak:8.2f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
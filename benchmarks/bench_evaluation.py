@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+"""Micro-benchmark of curve evaluation (zero rates, forward rates,
+discount factors, annuities, par rates and factor matrices) for scalar,
+small-array and large-array times.
+
+Run as ``python benchmarks/bench_evaluation.py`` from the repository root.
+"""
+
+from timeit import Timer
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelCurve, NelsonSiegelSvenssonCurve
+
+CURVES = [
+    NelsonSiegelCurve(0.028, -0.03, -0.04, 1.5),
+    NelsonSiegelSvenssonCurve(0.028, -0.03, -0.04, -0.015, 1.1, 4.0),
+]
+INPUTS = [
+    ("scalar", 5.0),
+    ("array[10]", np.linspace(0.5, 30.0, 10)),
+    ("array[100000]", np.linspace(0.5, 30.0, 100_000)),
+]
+
+
+def best_time(func, T) -> float:
+    """Best time per call (seconds) of func(T)."""
+    timer = Timer(lambda: func(T))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def main() -> None:
+    for curve in CURVES:
+        for method in (
+            "zero",
+            "forward",
+            "discount",
+            "annuity",
+            "par_rate",
+            "factor_matrix",
+        ):
+            if not hasattr(curve, method):
+                continue
+            for name, T in INPUTS:
+                seconds = best_time(getattr(curve, method), T)
+                print(
+                    f"{type(curve).__name__:<26} {method:<13} {name:<14} "
+                    f"{1e6 * seconds:10.3f} us"
+                )
+        # factor matrices written into preallocated buffers
+        for name, T in INPUTS[1:]:
+            out = np.empty(T.shape + (len(curve.factors(1.0)) + 1,))
+            try:
+                seconds = best_time(lambda T: curve.factor_matrix(T, out=out), T)
+            except TypeError:  # no support for out
+                continue
+            print(
+                f"{type(curve).__name__:<26} {'(out=)':<13} {name:<14} "
+                f"{1e6 * seconds:10.3f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of forward rates between start and end times: averaging the
+instantaneous forward rate over fine grids of each interval (trapezoidal
+rule on GRID points) against the closed-form `forward_rate`, for single
+curves and curve sets. Reports the best time per evaluation of all
+intervals and the largest difference between both approaches.
+
+Run as ``python benchmarks/bench_forward_rates.py`` from the repository root.
+"""
+
+from timeit import Timer
+from typing import Callable
+
+import numpy as np
+
+from nelson_siegel_svensson import (
+    NelsonSiegelCurve,
+    NelsonSiegelSvenssonCurve,
+    NelsonSiegelSvenssonCurveSet,
+)
+
+N_INTERVALS = 10_000
+GRID = 1_000
+CURVES = [
+    NelsonSiegelCurve(0.028, -0.03, -0.04, 1.5),
+    NelsonSiegelSvenssonCurve(0.028, -0.03, -0.04, -0.015, 1.1, 4.0),
+]
+
+
+def best_time(func: Callable[[], object]) -> float:
+    """Best time per call (seconds) of func."""
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def sampled_forward_rate(
+    forward: Callable[[np.ndarray], np.ndarray], T1: np.ndarray, T2: np.ndarray
+) -> np.ndarray:
+    """Average forward rates by the trapezoidal rule on GRID points per
+    interval (evaluated in chunks of intervals to bound memory)."""
+    weights = np.full(GRID, 1.0 / (GRID - 1))
+    weights[[0, -1]] /= 2
+    u = np.linspace(0.0, 1.0, GRID)
+    chunks = np.arange(1_000, T1.size, 1_000)
+    rates = [
+        forward(start[:, None] + (end - start)[:, None] * u) @ weights
+        for start, end in zip(np.split(T1, chunks), np.split(T2, chunks))
+    ]
+    return np.concatenate(rates)
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    T1 = rng.uniform(0.0, 30.0, N_INTERVALS)
+    T2 = T1 + rng.uniform(0.01, 10.0, N_INTERVALS)
+    for curve in CURVES:
+        name = type(curve).__name__
+        sampled = sampled_forward_rate(curve.forward, T1, T2)  # type: ignore
+        closed = curve.forward_rate(T1, T2)
+        seconds_sampled = best_time(
+            lambda: sampled_forward_rate(curve.forward, T1, T2)  # type: ignore
+        )
+        seconds_closed = best_time(lambda: curve.forward_rate(T1, T2))
+        print(
+            f"{name:<28} intervals {N_INTERVALS}"
+            f"  sampled ({GRID} points) {1e3 * seconds_sampled:9.2f} ms"
+            f"  closed form {1e3 * seconds_closed:7.3f} ms"
+            f"  max abs difference {np.max(np.abs(sampled - closed)):.1e}"
+        )
+    curve_set = NelsonSiegelSvenssonCurveSet.from_curves([CURVES[1]] * 100)
+    seconds_set = best_time(lambda: curve_set.forward_rate(T1, T2))
+    print(
+        f"{'NelsonSiegelSvenssonCurveSet':<28} curves 100 intervals {N_INTERVALS}"
+        f"  closed form {1e3 * seconds_set:7.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
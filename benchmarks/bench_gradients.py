@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of OLS-based calibration with analytic and with finite
+difference derivatives of the profiled error function.
+
+On decimal-scale yields the gradient of the error function at the start
+is mostly below the default ``gtol`` of `minimize`, which then stops at
+tau0 right away. The `minimize` rows therefore fit the yields in percent
+so that the optimizer actually moves, using L-BFGS-B within the bounds of
+the `least_squares` rows (unbounded BFGS steps to negative taus for a
+few of these curves). Each row reports the mean number of function and
+derivative evaluations, the share of curves whose taus moved away from
+tau0 and the median final SSE (of decimal yields, for all rows alike),
+next to the wall time.
+
+Run as ``python benchmarks/bench_gradients.py`` from the repository root.
+"""
+
+from timeit import default_timer
+
+import numpy as np
+from scipy.optimize import least_squares, minimize
+
+from nelson_siegel_svensson import NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.calibrate import (
+    errorfn_ns_ols,
+    errorfn_nss_ols,
+    gradient_ns_ols,
+    gradient_nss_ols,
+    jacobian_nss_ols,
+    residuals_nss_ols,
+)
+
+T = np.array(
+    [0.0, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0]
+)
+N_CURVES = 200
+
+
+def sample_curves(n: int, seed: int = 0) -> np.ndarray:
+    """Noisy yields of n random Nelson-Siegel-Svensson curves on T."""
+    rng = np.random.default_rng(seed)
+    Y = np.empty((n, T.size))
+    for i in range(n):
+        curve = NelsonSiegelSvenssonCurve(
+            rng.uniform(0.02, 0.06),
+            rng.uniform(-0.03, 0.01),
+            rng.uniform(-0.03, 0.03),
+            rng.uniform(-0.03, 0.03),
+            rng.uniform(0.5, 3.0),
+            rng.uniform(4.0, 12.0),
+        )
+        Y[i] = curve(T) + rng.normal(0.0, 5e-5, T.size)
+    return Y
+
+
+def run(name: str, calibrate, Y: np.ndarray, tau0, scale: float = 1.0) -> None:
+    """Calibrate all rows of Y (multiplied by scale) starting at tau0 and
+    print evaluations, moved share, SSE (of Y) and wall time."""
+    nfev, njev, moved, sse = [], [], [], []
+    Y = scale * Y
+    start = default_timer()
+    for y in Y:
+        res = calibrate(y)
+        nfev.append(res.nfev)
+        njev.append(res.njev or 0)
+        moved.append(not np.allclose(res.x, tau0, rtol=1e-6, atol=0))
+        sse.append((2 * res.cost if "cost" in res else res.fun) / scale**2)
+    elapsed = default_timer() - start
+    print(
+        f"{name:<40} nfev {np.mean(nfev):5.1f}  njev {np.mean(njev):5.1f}  "
+        f"moved {np.mean(moved):4.0%}  median SSE {np.median(sse):.3e}  "
+        f"{1e3 * elapsed / len(Y):6.2f} ms/curve"
+    )
+
+
+def main() -> None:
+    Y = sample_curves(N_CURVES)
+    tau0 = np.array([2.0, 5.0])
+    percent = 100.0
+    bounds = (0.1, 30.0)
+    options_ns = dict(method="L-BFGS-B", bounds=[bounds])
+    options_nss = dict(method="L-BFGS-B", bounds=[bounds, bounds])
+    run(
+        "NS minimize (finite differences)",
+        lambda y: minimize(errorfn_ns_ols, 2.0, (T, y), **options_ns),
+        Y,
+        2.0,
+        percent,
+    )
+    run(
+        "NS minimize (analytic gradient)",
+        lambda y: minimize(
+            errorfn_ns_ols, 2.0, (T, y), jac=gradient_ns_ols, **options_ns
+        ),
+        Y,
+        2.0,
+        percent,
+    )
+    run(
+        "NSS minimize (finite differences)",
+        lambda y: minimize(errorfn_nss_ols, tau0, (T, y), **options_nss),
+        Y,
+        tau0,
+        percent,
+    )
+    run(
+        "NSS minimize (analytic gradient)",
+        lambda y: minimize(
+            errorfn_nss_ols, tau0, (T, y), jac=gradient_nss_ols, **options_nss
+        ),
+        Y,
+        tau0,
+        percent,
+    )
+    run(
+        "NSS least_squares (finite differences)",
+        lambda y: least_squares(residuals_nss_ols, tau0, args=(T, y), bounds=bounds),
+        Y,
+        tau0,
+    )
+    run(
+        "NSS least_squares (analytic jacobian)",
+        lambda y: least_squares(
+            residuals_nss_ols, tau0, jac=jacobian_nss_ols, args=(T, y), bounds=bounds
+        ),
+        Y,
+        tau0,
+    )
+
+
+if __name__ == "__main__":
+    main()
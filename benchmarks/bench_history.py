@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of calibrating histories of curves: empirical factors of a
+yield matrix with 2% missing quotes by a Python loop of interpolations and
+`empirical_factors` against `empirical_factors_panel`, and panel
+calibration of a history cold (grid search) against warm-started by the
+taus of the previous date (as when recalibrating a history after a data
+update). Reports wall times (best of three) and the largest difference of
+the sums of squared errors of warm and cold calibrations.
+
+Run as ``python benchmarks/bench_history.py`` from the repository root.
+"""
+
+from timeit import default_timer
+from typing import Callable, Tuple
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelSvenssonCurveSet
+from nelson_siegel_svensson.calibrate import (
+    calibrate_nss_ols_panel,
+    empirical_factors,
+    empirical_factors_panel,
+)
+
+T = np.array([0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0])
+N_DATES = 2_500
+REPEAT = 3
+
+
+def simulate(n_dates: int) -> np.ndarray:
+    """History of yields of slowly moving Nelson-Siegel-Svensson curves."""
+    rng = np.random.default_rng(0)
+    walk = np.cumsum(rng.normal(0.0, 1.0, (n_dates, 6)), axis=0)
+    curves = NelsonSiegelSvenssonCurveSet(
+        0.03 + 1e-4 * walk[:, 0],
+        -0.02 + 1e-4 * walk[:, 1],
+        0.01 + 1e-4 * walk[:, 2],
+        -0.01 + 1e-4 * walk[:, 3],
+        np.exp(0.2 + 5e-3 * walk[:, 4]),
+        np.exp(1.7 + 5e-3 * walk[:, 5]),
+    )
+    return curves(T) + rng.normal(0.0, 1e-5, (n_dates, T.size))
+
+
+def factors_loop(Y: np.ndarray) -> np.ndarray:
+    factors = np.empty((Y.shape[0], 3))
+    for i, y in enumerate(Y):
+        valid = np.isfinite(y)
+        key = np.interp([0.25, 2.0, 10.0], T[valid], y[valid])
+        factors[i] = empirical_factors(key[0], key[1], key[2])
+    return factors
+
+
+def best_time(func: Callable[[], object]) -> Tuple[float, object]:
+    """Best wall time (seconds) of REPEAT calls of func and its result."""
+    times = []
+    for _ in range(REPEAT):
+        start = default_timer()
+        result = func()
+        times.append(default_timer() - start)
+    return min(times), result
+
+
+def main() -> None:
+    Y = simulate(N_DATES)
+    Y_missing = Y.copy()
+    Y_missing[np.random.default_rng(1).random(Y.shape) < 0.02] = np.nan
+    loop_seconds, loop_factors = best_time(lambda: factors_loop(Y_missing))
+    panel_seconds, panel_factors = best_time(
+        lambda: np.column_stack(empirical_factors_panel(T, Y_missing))
+    )
+    print(
+        f"empirical factors  loop {1e3 * loop_seconds:8.1f} ms"
+        f"  panel {1e3 * panel_seconds:8.1f} ms"
+        f"  max abs difference"
+        f" {np.max(np.abs(loop_factors - panel_factors)):.1e}"  # type: ignore
+    )
+
+    calibrate_nss_ols_panel(T, Y[:10])  # warm-up (imports)
+    cold_seconds, (_, cold) = best_time(  # type: ignore
+        lambda: calibrate_nss_ols_panel(T, Y)
+    )
+    previous = np.vstack([cold.x[:1], cold.x[:-1]])
+    warm_seconds, (_, warm) = best_time(  # type: ignore
+        lambda: calibrate_nss_ols_panel(T, Y, tau0=previous)
+    )
+    print(
+        f"panel calibration  cold {1e3 * cold_seconds:8.1f} ms"
+        f" (mean nit {cold.nit.mean():5.1f})"
+        f"  warm {1e3 * warm_seconds:8.1f} ms"
+        f" (mean nit {warm.nit.mean():5.1f})"
+        f"  max sse difference (warm - cold) {np.max(warm.fun - cold.fun):.1e}"
+    )
+
+
+if __name__ == "__main__":
+    main()
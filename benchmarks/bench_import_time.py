@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of the startup time of the library and of the CLI commands,
+each measured in a fresh interpreter (best of several runs). Exits with
+status 1 if a case exceeds its time budget.
+
+Run as ``python benchmarks/bench_import_time.py`` from the repository root.
+"""
+
+import subprocess
+import sys
+from timeit import default_timer
+
+REPEAT = 5
+CURVE = '{"beta0": 0.017, "beta1": -0.023, "beta2": 0.24, "tau": 2}'
+# (name, python code, budget in seconds)
+CASES = [
+    ("python", "pass", None),
+    ("import nelson_siegel_svensson", "import nelson_siegel_svensson", 0.4),
+    (
+        "import ...calibrate",
+        "import nelson_siegel_svensson.calibrate",
+        0.4,
+    ),
+    ("import ...cli", "import nelson_siegel_svensson.cli", 0.5),
+    (
+        "cli evaluate",
+        "from nelson_siegel_svensson.cli import cli_main\n"
+        f"cli_main(['evaluate', '-c', '{CURVE}', '-t', '[1,2,3]'],"
+        " standalone_mode=False)",
+        0.5,
+    ),
+    (
+        "cli calibrate",
+        "from nelson_siegel_svensson.cli import cli_main\n"
+        "cli_main(['calibrate', '-t', '[1,2,5,10,20]',"
+        " '-y', '[0.01,0.012,0.02,0.025,0.027]'], standalone_mode=False)",
+        1.5,
+    ),
+    (
+        "cli plot --help",
+        "from nelson_siegel_svensson.cli import cli_main\n"
+        "cli_main(['plot', '--help'], standalone_mode=False)",
+        0.5,
+    ),
+]
+
+
+def best_time(code: str) -> float:
+    """Best wall time (seconds) of running code in a fresh interpreter."""
+    times = []
+    for _ in range(REPEAT):
+        start = default_timer()
+        subprocess.run(
+            [sys.executable, "-c", code], check=True, stdout=subprocess.DEVNULL
+        )
+        times.append(default_timer() - start)
+    return min(times)
+
+
+def main() -> int:
+    exceeded = 0
+    for name, code, budget in CASES:
+        seconds = best_time(code)
+        status = "" if budget is None else f"(budget {1e3 * budget:6.0f} ms)"
+        if budget is not None and seconds > budget:
+            status += " EXCEEDED"
+            exceeded += 1
+        print(f"{name:<30} {1e3 * seconds:8.1f} ms  {status}")
+    return 1 if exceeded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of per-tick latency of warm-started incremental recalibration
+against calibration from scratch on every quote update.
+
+Run as ``python benchmarks/bench_incremental.py`` from the repository root.
+"""
+
+from timeit import default_timer
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.calibrate import calibrate_nss_ols, calibrate_nss_ols_grid
+from nelson_siegel_svensson.incremental import IncrementalCalibrator
+
+T = np.array([0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0])
+N_TICKS = 2000
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    curve = NelsonSiegelSvenssonCurve(0.03, -0.02, 0.01, -0.01, 0.8, 6.0)
+    y = curve(T) + rng.normal(0.0, 2e-5, T.size)
+    ticks = [
+        (int(i), float(dy))
+        for i, dy in zip(
+            rng.integers(T.size, size=N_TICKS), rng.normal(0, 1e-5, N_TICKS)
+        )
+    ]
+
+    calibrator = IncrementalCalibrator(T, y)
+    nit, betas_only = [], []
+    start = default_timer()
+    for i, dy in ticks:
+        _, opt_res = calibrator.update(T[i], calibrator.y[i] + dy)
+        nit.append(opt_res.nit)
+        betas_only.append(opt_res.betas_only)
+    elapsed = default_timer() - start
+    print(
+        f"{'IncrementalCalibrator.update':<30} {1e3 * elapsed / N_TICKS:7.3f} ms/tick"
+        f"  nit {np.mean(nit):.2f}  betas only {np.mean(betas_only):.0%}"
+        f"  final SSE {2 * opt_res.cost:.3e}"
+    )
+
+    for name, calibrate in [
+        ("calibrate_nss_ols", calibrate_nss_ols),
+        ("calibrate_nss_ols_grid", calibrate_nss_ols_grid),
+    ]:
+        y_tick = y.copy()
+        n = N_TICKS // 10
+        start = default_timer()
+        for i, dy in ticks[:n]:
+            y_tick[i] += dy
+            calibrate(T, y_tick)
+        elapsed = default_timer() - start
+        print(f"{name:<30} {1e3 * elapsed / n:7.3f} ms/tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of calibrating many independent Nelson-Siegel-Svensson curves
+with `calibrate_many` on the available executors.
+
+Run as ``python benchmarks/bench_parallel.py`` from the repository root.
+"""
+
+import os
+from timeit import default_timer
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.parallel import calibrate_many
+
+T = np.array([0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0])
+N_CURVES = 240
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    Y = np.array(
+        [
+            NelsonSiegelSvenssonCurve(
+                rng.uniform(0.02, 0.06),
+                rng.uniform(-0.03, 0.01),
+                rng.uniform(-0.03, 0.03),
+                rng.uniform(-0.03, 0.03),
+                rng.uniform(0.5, 3.0),
+                rng.uniform(4.0, 12.0),
+            )(T)
+            + rng.normal(0.0, 5e-5, T.size)
+            for _ in range(N_CURVES)
+        ]
+    )
+    print(f"{os.cpu_count()} processors")
+    for method in ("ols", "grid"):
+        for executor in ("serial", "thread", "process"):
+            start = default_timer()
+            calibrate_many(T, Y, method=method, executor=executor)
+            elapsed = default_timer() - start
+            name = f"{method} {executor}"
+            print(f"{name:<16} {1e3 * elapsed / N_CURVES:7.3f} ms/curve")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of key-rate risk of a portfolio of coupon bonds priced off a
+Nelson-Siegel-Svensson curve calibrated to yields at 11 tenors: bumping
+each input yield by 1 bp, recalibrating (started at the unbumped taus)
+and repricing all bonds against the analytic `key_rate_risk`. Bumps are
+recalibrated by `calibrate_nss_ols` (BFGS with its default tolerances)
+and, as a precise reference, by a tight least squares fit of the taus
+using `residuals_nss_ols` and `jacobian_nss_ols`. Reports the best of
+three wall times and the largest difference of the price changes
+relative to the largest price change. The difference to the tight fit is
+the nonlinearity of a 1 bp bump (it vanishes for smaller bumps), the
+one to `calibrate_nss_ols` is dominated by its optimizer tolerance.
+
+Run as ``python benchmarks/bench_risk.py`` from the repository root.
+"""
+
+from timeit import default_timer
+from typing import Any, Callable, Tuple
+
+import numpy as np
+from scipy.optimize import least_squares
+from scipy.sparse import csr_matrix
+
+from nelson_siegel_svensson import NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.bonds import bond_prices
+from nelson_siegel_svensson.calibrate import (
+    betas_nss_ols,
+    calibrate_nss_ols,
+    jacobian_nss_ols,
+    residuals_nss_ols,
+)
+from nelson_siegel_svensson.risk import key_rate_risk
+
+T = np.array([0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0])
+CURVE = NelsonSiegelSvenssonCurve(0.04, -0.03, 0.02, -0.01, 1.5, 6.0)
+BUMP = 1e-4
+REPEAT = 3
+
+
+def portfolio(n_bonds: int) -> Tuple[csr_matrix, np.ndarray]:
+    """Sparse cash-flow matrix of semi-annual coupon bonds with random
+    maturities of up to 30 years on a monthly grid of payment times."""
+    rng = np.random.default_rng(0)
+    times = np.arange(1, 361) / 12
+    rows, cols, data = [], [], []
+    for i in range(n_bonds):
+        maturity = rng.integers(6, 361)
+        coupon = rng.uniform(0.0, 0.06) / 2
+        payments = np.arange(maturity, 0, -6) - 1
+        rows.extend([i] * payments.size)
+        cols.extend(payments.tolist())
+        data.extend([coupon] * payments.size)
+        data[-payments.size] += 1.0
+    cash_flows = csr_matrix((data, (rows, cols)), shape=(n_bonds, times.size))
+    return cash_flows, times
+
+
+def best_time(func: Callable[[], Any]) -> Tuple[float, Any]:
+    """Best wall time (seconds) of REPEAT calls of func and its result."""
+    times = []
+    for _ in range(REPEAT):
+        start = default_timer()
+        result = func()
+        times.append(default_timer() - start)
+    return min(times), result
+
+
+def recalibrate_bfgs(
+    curve: NelsonSiegelSvenssonCurve, y: np.ndarray
+) -> NelsonSiegelSvenssonCurve:
+    recalibrated, _ = calibrate_nss_ols(T, y, tau0=(curve.tau1, curve.tau2))
+    return recalibrated
+
+
+def recalibrate_tight(
+    curve: NelsonSiegelSvenssonCurve, y: np.ndarray
+) -> NelsonSiegelSvenssonCurve:
+    opt_res = least_squares(
+        residuals_nss_ols,
+        x0=[curve.tau1, curve.tau2],
+        jac=jacobian_nss_ols,
+        args=(T, y),
+        method="lm",
+        xtol=1e-15,
+        ftol=1e-15,
+        gtol=1e-15,
+    )
+    recalibrated, _ = betas_nss_ols(tuple(opt_res.x), T, y)
+    return recalibrated
+
+
+def bumped_price_changes(
+    recalibrate: Callable[..., NelsonSiegelSvenssonCurve],
+    curve: NelsonSiegelSvenssonCurve,
+    y: np.ndarray,
+    cash_flows: csr_matrix,
+    times: np.ndarray,
+) -> np.ndarray:
+    """Price changes of all bonds for bumping each input yield by BUMP,
+    recalibrating by recalibrate and repricing."""
+    prices = bond_prices(curve, cash_flows, times)
+    changes = np.empty((prices.size, T.size))
+    for k in range(T.size):
+        bumped = y.copy()
+        bumped[k] += BUMP
+        recalibrated = recalibrate(curve, bumped)
+        changes[:, k] = bond_prices(recalibrated, cash_flows, times) - prices
+    return changes
+
+
+def main() -> None:
+    rng = np.random.default_rng(1)
+    y = CURVE(T) + rng.normal(0.0, 1e-4, T.size)
+    curve = recalibrate_tight(CURVE, y)
+    for n_bonds in (100, 1_000, 10_000):
+        cash_flows, times = portfolio(n_bonds)
+        seconds_analytic, risk = best_time(
+            lambda: key_rate_risk(curve, T, y, cash_flows, times)
+        )
+        analytic = risk.price_changes(BUMP)
+        scale = np.max(np.abs(analytic))
+        print(
+            f"bonds {n_bonds:6d} tenors {T.size}"
+            f"  analytic {1e3 * seconds_analytic:8.2f} ms"
+        )
+        for name, recalibrate in (
+            ("calibrate_nss_ols", recalibrate_bfgs),
+            ("tight least squares", recalibrate_tight),
+        ):
+            seconds_bumped, bumped = best_time(
+                lambda: bumped_price_changes(recalibrate, curve, y, cash_flows, times)
+            )
+            difference = np.max(np.abs(bumped - analytic)) / scale
+            print(
+                f"  bump and recalibrate ({name:<19}) {1e3 * seconds_bumped:8.2f} ms"
+                f"  max relative difference {difference:.1e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
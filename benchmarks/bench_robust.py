@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of robust calibration of Nelson-Siegel-Svensson curves to
+quotes with stale outliers: ordinary least squares, an outer loop of
+least squares calibrations dropping outliers (the usual workaround) and
+IRLS with Huber and bisquare losses. Reports the error of the calibrated
+curves against the true curves and wall times over a fleet of noisy
+curves with random parameters and 10% outliers (best of three wall times
+per curve).
+
+Run as ``python benchmarks/bench_robust.py`` from the repository root.
+"""
+
+from timeit import default_timer
+from typing import Any, Tuple
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.calibrate import calibrate_nss_robust, calibrate_nss_wls
+
+T = np.array(
+    [0.25, 0.5, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+    + [9.0, 10.0, 12.0, 15.0, 20.0, 25.0, 30.0]
+)
+N_CURVES = 300
+TAU0 = (1.0, 5.0)
+# best of repeated calibrations of each curve
+REPEAT = 3
+
+
+def calibrate_ols(y: np.ndarray) -> Tuple[Any, Any]:
+    return calibrate_nss_wls(T, y, np.ones(T.size), tau0=TAU0)
+
+
+def calibrate_outer_loop(y: np.ndarray) -> Tuple[Any, Any]:
+    """Least squares calibrations dropping the worst point beyond three
+    robust standard deviations until there is none."""
+    weights = np.ones(T.size)
+    while True:
+        curve, opt_res = calibrate_nss_wls(T, y, weights, tau0=TAU0)
+        residuals = np.where(weights > 0, curve(T) - y, 0.0)
+        kept = residuals[weights > 0]
+        scale = np.median(np.abs(kept - np.median(kept))) / 0.6745
+        worst = np.argmax(np.abs(residuals))
+        if abs(residuals[worst]) <= 3 * scale or np.sum(weights) <= 8:
+            return curve, opt_res
+        weights[worst] = 0.0
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    tasks = []
+    for _ in range(N_CURVES):
+        curve = NelsonSiegelSvenssonCurve(
+            rng.uniform(0.01, 0.05),
+            rng.uniform(-0.03, 0.03),
+            rng.uniform(-0.05, 0.05),
+            rng.uniform(-0.05, 0.05),
+            rng.uniform(0.2, 3.0),
+            rng.uniform(3.0, 15.0),
+        )
+        y = curve(T) + rng.normal(0.0, 2e-5, T.size)
+        outliers = rng.random(T.size) < 0.1
+        y[outliers] += rng.choice([-1, 1], outliers.sum()) * rng.uniform(
+            1e-3, 5e-3, outliers.sum()
+        )
+        tasks.append((curve, y))
+
+    for name, calibrate in [
+        ("ols", calibrate_ols),
+        ("ols outer loop", calibrate_outer_loop),
+        ("robust huber", lambda y: calibrate_nss_robust(T, y, tau0=TAU0)),
+        (
+            "robust bisquare",
+            lambda y: calibrate_nss_robust(T, y, loss="bisquare", tau0=TAU0),
+        ),
+    ]:
+        calibrate(tasks[0][1])  # warm-up (imports)
+        seconds, errors = [], []
+        for curve, y in tasks:
+            times = []
+            for _ in range(REPEAT):
+                start = default_timer()
+                with np.errstate(all="ignore"):
+                    fitted, _ = calibrate(y)
+                times.append(default_timer() - start)
+            seconds.append(min(times))
+            errors.append(np.max(np.abs(fitted(T) - curve(T))))
+        seconds_ms = 1e3 * np.array(seconds)
+        errors_bp = 1e4 * np.array(errors)
+        print(
+            f"{name:<16} max abs error (bp) median {np.median(errors_bp):7.3f}"
+            f" p90 {np.percentile(errors_bp, 90):7.3f}"
+            f"  ms mean {seconds_ms.mean():6.2f}"
+            f" p99 {np.percentile(seconds_ms, 99):6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
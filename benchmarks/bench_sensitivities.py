@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of parameter sensitivities of zero and forward rates: central
+differences bumping each parameter of every curve (two evaluations per
+parameter) against the analytic `zero_jacobian` and `forward_jacobian`,
+for single curves and a Nelson-Siegel-Svensson curve set. Reports the
+best time per full Jacobian and the largest difference of both approaches.
+
+Run as ``python benchmarks/bench_sensitivities.py`` from the repository root.
+"""
+
+from dataclasses import fields, replace
+from timeit import Timer
+from typing import Any, Callable
+
+import numpy as np
+
+from nelson_siegel_svensson import (
+    NelsonSiegelCurve,
+    NelsonSiegelSvenssonCurve,
+    NelsonSiegelSvenssonCurveSet,
+)
+
+T = np.linspace(0.1, 30.0, 300)
+N_CURVES = 1_000
+BUMP = 1e-6
+CURVES = [
+    NelsonSiegelCurve(0.028, -0.03, -0.04, 1.5),
+    NelsonSiegelSvenssonCurve(0.028, -0.03, -0.04, -0.015, 1.1, 4.0),
+]
+
+
+def best_time(func: Callable[[], object]) -> float:
+    """Best time per call (seconds) of func."""
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def bumped_jacobian(curve: Any, method: str) -> np.ndarray:
+    """Jacobian of method (e.g. zero) by central differences of bumped
+    copies of curve (a curve or curve set)."""
+    columns = []
+    for field in fields(curve):
+        value = getattr(curve, field.name)
+        up = getattr(replace(curve, **{field.name: value + BUMP}), method)(T)
+        down = getattr(replace(curve, **{field.name: value - BUMP}), method)(T)
+        columns.append((up - down) / (2 * BUMP))
+    return np.stack(columns, axis=-1)
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    curve_set = NelsonSiegelSvenssonCurveSet(
+        rng.uniform(0.01, 0.05, N_CURVES),
+        rng.uniform(-0.03, 0.03, N_CURVES),
+        rng.uniform(-0.05, 0.05, N_CURVES),
+        rng.uniform(-0.05, 0.05, N_CURVES),
+        rng.uniform(0.2, 3.0, N_CURVES),
+        rng.uniform(3.0, 15.0, N_CURVES),
+    )
+    for curve in CURVES + [curve_set]:  # type: ignore
+        for method in ("zero", "forward"):
+            analytic = getattr(curve, method + "_jacobian")
+            seconds_bumped = best_time(lambda: bumped_jacobian(curve, method))
+            seconds_analytic = best_time(lambda: analytic(T))
+            difference = np.max(np.abs(bumped_jacobian(curve, method) - analytic(T)))
+            print(
+                f"{type(curve).__name__:<28} {method:<8} maturities {T.size}"
+                f"  bumped {1e3 * seconds_bumped:8.3f} ms"
+                f"  analytic {1e3 * seconds_analytic:8.3f} ms"
+                f"  max abs difference {difference:.1e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
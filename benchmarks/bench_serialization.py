@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of saving and loading a collection of daily curves in the
+binary format of the `serialization` module against JSON Lines, and of
+selecting single dates from a memory-mapped file.
+
+Run as ``python benchmarks/bench_serialization.py`` from the repository root.
+"""
+
+import json
+import os
+import tempfile
+from dataclasses import asdict
+from timeit import default_timer
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelSvenssonCurveSet
+from nelson_siegel_svensson.serialization import (
+    load_curves,
+    records_to_curve_set,
+    save_curves,
+    select_dates,
+)
+
+N_DATES = 25_000
+N_MARKETS = 40
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    n = N_DATES * N_MARKETS
+    curve_set = NelsonSiegelSvenssonCurveSet(
+        rng.uniform(0.01, 0.05, n),
+        rng.uniform(-0.03, 0.0, n),
+        rng.uniform(-0.02, 0.02, n),
+        rng.uniform(-0.02, 0.02, n),
+        rng.uniform(0.5, 2.0, n),
+        rng.uniform(3.0, 10.0, n),
+    )
+    dates = np.repeat(np.datetime64("1950-01-01") + np.arange(N_DATES), N_MARKETS)
+    ids = np.tile([f"M{i:03d}" for i in range(N_MARKETS)], N_DATES)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "curves.npy")
+        start = default_timer()
+        save_curves(path, curve_set, dates, ids)
+        elapsed = default_timer() - start
+        size = os.path.getsize(path) / 2**20
+        print(f"{'npy save':<28} {elapsed:8.3f} s  {size:8.1f} MiB")
+
+        start = default_timer()
+        records_to_curve_set(load_curves(path, mmap_mode=None))
+        print(f"{'npy load (all)':<28} {default_timer() - start:8.3f} s")
+
+        records = load_curves(path)
+        days = rng.integers(N_DATES, size=1000)
+        start = default_timer()
+        for day in days:
+            records_to_curve_set(select_dates(records, dates[day * N_MARKETS]))
+        elapsed = (default_timer() - start) / days.size
+        print(f"{'npy mmap select date':<28} {1e6 * elapsed:8.1f} us")
+
+        # JSON Lines of a tenth of the curves
+        n_json = n // 10
+        path = os.path.join(tmpdir, "curves.jsonl")
+        curves = curve_set.to_curves()[:n_json]
+        start = default_timer()
+        with open(path, "w") as f:
+            for curve, date, id in zip(curves, dates.tolist(), ids.tolist()):
+                f.write(json.dumps(dict(asdict(curve), date=str(date), id=id)))
+                f.write("\n")
+        elapsed = 10 * (default_timer() - start)
+        size = 10 * os.path.getsize(path) / 2**20
+        print(f"{'jsonl save (extrapolated)':<28} {elapsed:8.3f} s  {size:8.1f} MiB")
+        start = default_timer()
+        with open(path) as f:
+            decoded = [json.loads(line) for line in f]
+        NelsonSiegelSvenssonCurveSet(
+            *[
+                np.array([d[name] for d in decoded])
+                for name in ("beta0", "beta1", "beta2", "beta3", "tau1", "tau2")
+            ]
+        )
+        elapsed = 10 * (default_timer() - start)
+        print(f"{'jsonl load (extrapolated)':<28} {elapsed:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
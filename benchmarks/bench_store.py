@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark of the curve store: daily appends, point lookups by date and
+market, and range scans evaluated as curve sets, against reconstructing
+curves from JSON.
+
+Run as ``python benchmarks/bench_store.py`` from the repository root.
+"""
+
+import json
+import os
+import tempfile
+from dataclasses import asdict
+from timeit import default_timer
+
+import numpy as np
+
+from nelson_siegel_svensson import (
+    NelsonSiegelSvenssonCurve,
+    NelsonSiegelSvenssonCurveSet,
+)
+from nelson_siegel_svensson.store import CurveStore
+
+N_DATES = 25_000
+N_MARKETS = 40
+N_QUERIES = 10_000
+
+
+def random_curve_set(rng: np.random.Generator, n: int) -> NelsonSiegelSvenssonCurveSet:
+    return NelsonSiegelSvenssonCurveSet(
+        rng.uniform(0.01, 0.05, n),
+        rng.uniform(-0.03, 0.0, n),
+        rng.uniform(-0.02, 0.02, n),
+        rng.uniform(-0.02, 0.02, n),
+        rng.uniform(0.5, 2.0, n),
+        rng.uniform(3.0, 10.0, n),
+    )
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    n = N_DATES * N_MARKETS
+    markets = [f"M{i:03d}" for i in range(N_MARKETS)]
+    dates = np.datetime64("1950-01-01") + np.arange(N_DATES)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = CurveStore(os.path.join(tmpdir, "store"))
+        start = default_timer()
+        store.append(
+            random_curve_set(rng, n),
+            np.repeat(dates, N_MARKETS),
+            np.tile(markets, N_DATES),
+        )
+        print(f"{'bulk append':<24} {default_timer() - start:8.3f} s  ({n} curves)")
+
+        n_days = 250
+        start = default_timer()
+        for day in range(n_days):
+            date = dates[-1] + 1 + day
+            store.append(random_curve_set(rng, N_MARKETS), [date] * N_MARKETS, markets)
+        elapsed = (default_timer() - start) / n_days
+        print(f"{'daily append':<24} {1e3 * elapsed:8.3f} ms")
+
+        days = rng.integers(N_DATES, size=N_QUERIES)
+        ids = rng.integers(N_MARKETS, size=N_QUERIES)
+        start = default_timer()
+        for day, i in zip(days, ids):
+            store.get(dates[day], markets[i])
+        elapsed = (default_timer() - start) / N_QUERIES
+        print(f"{'get':<24} {1e6 * elapsed:8.1f} us")
+
+        t = np.linspace(0.5, 30.0, 60)
+        start = default_timer()
+        for day in days[:1000]:
+            store.curve_set(dates[day], dates[day] + 29)(t)
+        elapsed = (default_timer() - start) / 1000
+        print(f"{'month scan + evaluate':<24} {1e6 * elapsed:8.1f} us")
+
+        # reconstruction of a curve from JSON for comparison
+        encoded = json.dumps(asdict(store.get(dates[0], markets[0])))
+        start = default_timer()
+        for _ in range(N_QUERIES):
+            NelsonSiegelSvenssonCurve(**json.loads(encoded))
+        elapsed = (default_timer() - start) / N_QUERIES
+        print(f"{'json.loads (no lookup)':<24} {1e6 * elapsed:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark suite of the hot paths of curve evaluation and calibration:
+scalar and array evaluation, factor matrices, single and batched
+calibration on realistic tenor grids, end-to-end CLI latency and peak
+memory. Runs offline without extra dependencies.
+
+Results are compared against stored baselines (``benchmarks/baseline.json``
+by default) in a report listing the ratio of current to baseline value of
+each case. Baselines are machine-specific; store them with ``--save`` on the
+machine running the comparisons.
+
+Run as ``python benchmarks/suite.py`` from the repository root, e.g.::
+
+    python benchmarks/suite.py --save benchmarks/baseline.json
+    python benchmarks/suite.py --filter calibrate --check
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+from timeit import Timer, default_timer
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import scipy
+
+from nelson_siegel_svensson import (
+    NelsonSiegelCurve,
+    NelsonSiegelSvenssonCurve,
+    NelsonSiegelSvenssonCurveSet,
+)
+from nelson_siegel_svensson.calibrate import (
+    betas_nss_ols,
+    calibrate_ns_ols,
+    calibrate_nss_ols,
+    calibrate_nss_ols_grid,
+    calibrate_nss_ols_panel,
+)
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+NS = NelsonSiegelCurve(0.028, -0.03, -0.04, 1.5)
+NSS = NelsonSiegelSvenssonCurve(0.028, -0.03, -0.04, -0.015, 1.1, 4.0)
+
+# tenor grids (in years) of typical government curves
+TENORS = {
+    "6": np.array([1.0, 2.0, 5.0, 10.0, 20.0, 30.0]),
+    "11": np.array([0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0]),
+    "30": np.array(
+        [0.08, 0.17, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 4.0]
+        + [5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0, 13.0, 14.0]
+        + [15.0, 16.0, 17.0, 18.0, 19.0, 20.0, 22.0, 25.0, 28.0, 30.0]
+    ),
+}
+INPUTS = {
+    "scalar": 5.0,
+    "array[10]": np.linspace(0.5, 30.0, 10),
+    "array[100000]": np.linspace(0.5, 30.0, 100_000),
+}
+CLI_CURVE = '{"beta0": 0.028, "beta1": -0.03, "beta2": -0.04, "tau": 1.5}'
+# child process reporting its peak resident set size (MB) on stderr; the
+# high-water mark of /proc is used where available as ru_maxrss includes
+# the peak of the parent process (before exec) on Linux
+CLI_SCRIPT = (
+    "import resource, sys\n"
+    "from nelson_siegel_svensson.cli import cli_main\n"
+    "try:\n"
+    "    cli_main(sys.argv[1:])\n"
+    "finally:\n"
+    "    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024\n"
+    "    try:\n"
+    "        with open('/proc/self/status') as f:\n"
+    "            hwm = [l for l in f if l.startswith('VmHWM:')][0]\n"
+    "        rss = int(hwm.split()[1]) / 1024\n"
+    "    except (OSError, IndexError):\n"
+    "        pass\n"
+    "    print(rss, file=sys.stderr)\n"
+)
+
+
+def noisy_yields(n: int, t: np.ndarray, seed: int = 0) -> np.ndarray:
+    """Matrix of n rows of yields of NSS at t with noise."""
+    rng = np.random.default_rng(seed)
+    return NSS(t) + rng.normal(0.0, 5e-5, (n, t.size))
+
+
+def timing_cases() -> List[Tuple[str, Callable[[], object]]]:
+    """Named functions to time (seconds per call)."""
+    cases: List[Tuple[str, Callable[[], object]]] = []
+    for curve_name, curve in [("ns", NS), ("nss", NSS)]:
+        for method in ("zero", "forward", "discount", "factors"):
+            for input_name, T in INPUTS.items():
+                func = getattr(curve, method)
+                cases.append(
+                    (f"{curve_name}.{method} {input_name}", lambda f=func, T=T: f(T))
+                )
+        for input_name in ("array[10]", "array[100000]"):
+            T = INPUTS[input_name]
+            cases.append(
+                (
+                    f"{curve_name}.factor_matrix {input_name}",
+                    lambda c=curve, T=T: c.factor_matrix(T),
+                )
+            )
+    curve_set = NelsonSiegelSvenssonCurveSet.from_curves([NSS] * 1000)
+    T = np.linspace(0.5, 30.0, 360)
+    cases.append(("nss_set[1000].zero array[360]", lambda: curve_set.zero(T)))
+    for grid_name, t in TENORS.items():
+        y = noisy_yields(1, t)[0]
+        cases += [
+            (
+                f"betas_nss_ols tenors[{grid_name}]",
+                lambda t=t, y=y: betas_nss_ols((1.1, 4.0), t, y),
+            ),
+            (
+                f"calibrate_ns_ols tenors[{grid_name}]",
+                lambda t=t, y=y: calibrate_ns_ols(t, y),
+            ),
+            (
+                f"calibrate_nss_ols tenors[{grid_name}]",
+                lambda t=t, y=y: calibrate_nss_ols(t, y),
+            ),
+            (
+                f"calibrate_nss_ols_grid tenors[{grid_name}]",
+                lambda t=t, y=y: calibrate_nss_ols_grid(t, y),
+            ),
+        ]
+        Y = noisy_yields(250, t)
+        cases.append(
+            (
+                f"calibrate_nss_ols_panel[250] tenors[{grid_name}]",
+                lambda t=t, Y=Y: calibrate_nss_ols_panel(t, Y),
+            )
+        )
+    return cases
+
+
+def memory_cases() -> List[Tuple[str, Callable[[], object]]]:
+    """Named functions to measure the peak of traced memory (MB) of."""
+    t = TENORS["11"]
+    Y = noisy_yields(2500, t)
+    curve_set = NelsonSiegelSvenssonCurveSet.from_curves([NSS] * 10_000)
+    T = np.linspace(0.5, 30.0, 360)
+    return [
+        (
+            "peak calibrate_nss_ols_panel[2500] tenors[11]",
+            lambda: calibrate_nss_ols_panel(t, Y),
+        ),
+        ("peak nss_set[10000].zero array[360]", lambda: curve_set.zero(T)),
+        (
+            "peak nss.factor_matrix array[100000]",
+            lambda: NSS.factor_matrix(INPUTS["array[100000]"]),
+        ),
+    ]
+
+
+def cli_cases() -> List[Tuple[str, List[str]]]:
+    """Named CLI arguments to run end to end in a fresh interpreter."""
+    t = json.dumps(TENORS["11"].tolist())
+    y = json.dumps(noisy_yields(1, TENORS["11"])[0].tolist())
+    return [
+        ("cli evaluate", ["evaluate", "-c", CLI_CURVE, "-t", t]),
+        ("cli calibrate", ["calibrate", "-t", t, "-y", y]),
+    ]
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Best time per call (seconds) of func."""
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def peak_memory(func: Callable[[], object]) -> float:
+    """Peak of memory (MB) allocated by func as traced by tracemalloc."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def run_cli(args: List[str], repeat: int) -> Tuple[float, float]:
+    """Best wall time (seconds) and peak RSS (MB) of running the CLI."""
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    times, rss = [], []
+    for _ in range(repeat):
+        start = default_timer()
+        proc = subprocess.run(
+            [sys.executable, "-c", CLI_SCRIPT] + args,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+        times.append(default_timer() - start)
+        rss.append(float(proc.stderr.split()[-1]))
+    return min(times), min(rss)
+
+
+def run(pattern: str, repeat: int) -> Dict[str, Dict[str, Any]]:
+    """Results (value and unit) of all cases containing pattern."""
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def report(name: str, value: float, unit: str) -> None:
+        results[name] = {"value": value, "unit": unit}
+        scaled, shown = (1e6 * value, "us") if unit == "s" else (value, unit)
+        print(f"{name:<50} {scaled:12.3f} {shown}", flush=True)
+
+    for name, func in timing_cases():
+        if pattern in name:
+            report(name, best_time(func, repeat), "s")
+    for name, func in memory_cases():
+        if pattern in name:
+            report(name, peak_memory(func), "MB")
+    for name, args in cli_cases():
+        if pattern in name:
+            seconds, rss = run_cli(args, repeat)
+            report(name, seconds, "s")
+            report(f"peak rss {name}", rss, "MB")
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> int:
+    """Print a report of results against baseline and return the number
+    of cases exceeding their baseline by more than the threshold ratio.
+    """
+    regressions = 0
+    print()
+    print(f"{'case':<50} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<50} {'-':>12} {result['value']:12.4g} {'new':>7}")
+            continue
+        base = baseline[name]["value"]
+        ratio = result["value"] / base if base else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = " REGRESSION"
+            regressions += 1
+        elif ratio < 1 / (1 + threshold):
+            flag = " improved"
+        print(f"{name:<50} {base:12.4g} {result['value']:12.4g} {ratio:7.2f}{flag}")
+    print(
+        f"\n{regressions} regression(s) beyond {threshold:.0%} of "
+        f"{len(results)} case(s)"
+    )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-f", "--filter", default="", help="run cases containing")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="repetitions")
+    parser.add_argument("--save", help="store results as baseline in this file")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="tolerated relative slowdown"
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="exit with status 1 on regressions"
+    )
+    args = parser.parse_args()
+
+    results = run(args.filter, args.repeat)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "environment": {
+                        "machine": platform.machine(),
+                        "processor": platform.processor(),
+                        "python": platform.python_version(),
+                        "numpy": np.__version__,
+                        "scipy": scipy.__version__,
+                    },
+                    "results": results,
+                },
+                f,
+                indent=1,
+            )
+            f.write("\n")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline {args.baseline}, store one with --save")
+        return 0
+    with open(args.baseline) as f:
+        stored = json.load(f)
+    print(f"\nBaseline environment: {stored['environment']}")
+    regressions = compare(results, stored["results"], args.threshold)
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,21 @@
 # -*- coding: utf-8 -*-
 
 """Implementation of the Nelson-Siegel-Svensson interest rate curve model.
-For details, see classes `NelsonSiegelCurve` and `NelsonSiegelSvenssonCurve`.
+For details, see classes `NelsonSiegelCurve` and `NelsonSiegelSvenssonCurve`
+as well as their vectorized collections `NelsonSiegelCurveSet` and
+`NelsonSiegelSvenssonCurveSet`.
 """
 
 __author__ = """luphord"""
 __email__ = "luphord@protonmail.com"
 __version__ = "0.5.0"
 
-from .ns import NelsonSiegelCurve
-from .nss import NelsonSiegelSvenssonCurve
+from .ns import NelsonSiegelCurve, NelsonSiegelCurveSet
+from .nss import NelsonSiegelSvenssonCurve, NelsonSiegelSvenssonCurveSet
 
-__all__ = ["NelsonSiegelCurve", "NelsonSiegelSvenssonCurve"]
+__all__ = [
+    "NelsonSiegelCurve",
+    "NelsonSiegelSvenssonCurve",
+    "NelsonSiegelCurveSet",
+    "NelsonSiegelSvenssonCurveSet",
+]
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+
+"""Pricing of coupon bonds and calibration of Nelson-Siegel(-Svensson)
+curves directly to (dirty) bond prices.
+Bonds are described by a cash-flow matrix (one row per bond, one column
+per cash-flow time), which is typically sparse. Sparse (SciPy) input is
+kept in CSR format and dense input as a dense array, so that pricing and
+risk of dense cash flows do not import SciPy.
+See `calibrate_ns_bonds` and `calibrate_nss_bonds` for details.
+"""
+
+from dataclasses import fields
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .calibrate import _check_weights, betas_ns_ols, betas_nss_ols
+from .calibrate import calibrate_ns_ols_grid, calibrate_nss_ols_grid
+from .ns import NelsonSiegelCurve
+from .nss import NelsonSiegelSvenssonCurve
+
+
+def _cash_flow_matrix(cash_flows: Any, times: np.ndarray) -> Any:
+    """Cash flows (bonds x times) as sparse matrix in CSR format for
+    sparse input (any SciPy sparse matrix or array), else as dense array.
+    """
+    if hasattr(cash_flows, "tocsr"):
+        from scipy.sparse import csr_matrix
+
+        cash_flows = csr_matrix(cash_flows, dtype=float)
+    else:
+        cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    assert cash_flows.shape[1] == times.size, "Mismatching cash flows and times"
+    return cash_flows
+
+
+def _discounted_cash_flows(
+    cash_flows: Any, times: np.ndarray, yields: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Prices of all bonds at (continuously compounded) yields and their
+    derivatives with respect to the yields, summed over the stored
+    cash flows of each bond (all cash flows for a dense matrix).
+    """
+    if isinstance(cash_flows, np.ndarray):
+        discounted = cash_flows * np.exp(-yields[:, None] * times)
+        return discounted.sum(axis=1), -(discounted @ times)
+    n_bonds = cash_flows.shape[0]
+    rows = np.repeat(np.arange(n_bonds), np.diff(cash_flows.indptr))
+    cash_flow_times = times[cash_flows.indices]
+    discounted = cash_flows.data * np.exp(-yields[rows] * cash_flow_times)
+    prices = np.bincount(rows, discounted, minlength=n_bonds)
+    dprices = -np.bincount(rows, discounted * cash_flow_times, minlength=n_bonds)
+    return prices, dprices
+
+
+def bond_prices(curve: Any, cash_flows: Any, times: np.ndarray) -> np.ndarray:
+    """Prices of bonds with cash-flow matrix cash_flows (bonds x times)
+    paid at times, discounted by the given curve.
+    """
+    times = np.asarray(times, dtype=float)
+    return _cash_flow_matrix(cash_flows, times) @ curve.discount(times)
+
+
+def bond_yields(
+    cash_flows: Any,
+    times: np.ndarray,
+    prices: np.ndarray,
+    y0: Optional[np.ndarray] = None,
+    tol: float = 1e-12,
+    maxiter: int = 50,
+) -> np.ndarray:
+    """Continuously compounded yields to maturity of bonds with cash-flow
+    matrix cash_flows (bonds x times) and (dirty) prices, obtained by
+    Newton iterations on all bonds at once (starting from y0 if given).
+    """
+    times = np.asarray(times, dtype=float)
+    prices = np.asarray(prices, dtype=float)
+    cash_flows = _cash_flow_matrix(cash_flows, times)
+    if y0 is None:
+        # yield of a single payment of all cash flows at their mean time
+        total = np.asarray(cash_flows.sum(axis=1)).ravel()
+        mean_time = (cash_flows @ times) / total
+        yields = np.log(total / prices) / mean_time
+    else:
+        yields = np.array(y0, dtype=float)
+    for _ in range(maxiter):
+        model_prices, dprices = _discounted_cash_flows(cash_flows, times, yields)
+        step = (model_prices - prices) / dprices
+        yields -= step
+        if np.max(np.abs(step), initial=0.0) <= tol:
+            break
+    return yields
+
+
+def bond_durations(
+    cash_flows: Any, times: np.ndarray, yields: np.ndarray
+) -> np.ndarray:
+    """Macaulay durations of bonds with cash-flow matrix cash_flows
+    (bonds x times) at (continuously compounded) yields.
+    """
+    times = np.asarray(times, dtype=float)
+    cash_flows = _cash_flow_matrix(cash_flows, times)
+    prices, dprices = _discounted_cash_flows(
+        cash_flows, times, np.asarray(yields, dtype=float)
+    )
+    return -dprices / prices
+
+
+def _calibrate_bonds(
+    curve_type: type,
+    n_tau: int,
+    betas_ols: Callable[..., Tuple[Any, Any]],
+    calibrate_grid: Callable[..., Tuple[Any, Any]],
+    cash_flows: Any,
+    times: np.ndarray,
+    prices: np.ndarray,
+    tau0: Optional[Any],
+    errors: str,
+    weights: Union[None, str, np.ndarray],
+    bounds: Tuple[float, float],
+) -> Tuple[Any, Any]:
+    """Fit all parameters of a curve of type curve_type to bond prices by
+    bounded nonlinear least squares with analytic Jacobian.
+    """
+    from scipy.optimize import least_squares
+
+    assert errors in ("price", "yield"), "errors must be 'price' or 'yield'"
+    times = np.asarray(times, dtype=float)
+    prices = np.asarray(prices, dtype=float)
+    cash_flows = _cash_flow_matrix(cash_flows, times)
+    assert cash_flows.shape[0] == prices.size, "Mismatching cash flows and prices"
+    yields = bond_yields(cash_flows, times, prices)
+    durations = bond_durations(cash_flows, times, yields)
+    if isinstance(weights, str):
+        assert weights == "duration", "weights must be 'duration' or an array"
+        weights = 1 / durations**2
+    else:
+        weights = _check_weights(weights, prices)
+    # weights multiply squared errors, as in the WLS calibrations
+    sqrt_weights = np.sqrt(weights)
+
+    # starting values from the yields at the durations of the bonds
+    if tau0 is None:
+        curve0, _ = calibrate_grid(durations, yields, n_starts=1)
+    else:
+        curve0, _ = betas_ols(tau0, durations, yields)
+    x0 = np.array([getattr(curve0, f.name) for f in fields(curve0)], dtype=float)
+    n_beta = x0.size - n_tau
+    x0[n_beta:] = np.clip(x0[n_beta:], *bounds)
+    lower = np.r_[np.full(n_beta, -np.inf), np.full(n_tau, bounds[0])]
+    upper = np.r_[np.full(n_beta, np.inf), np.full(n_tau, bounds[1])]
+
+    # evaluation at the latest parameters, shared by residuals and Jacobian
+    cache: Dict[str, Any] = {"x": None}
+
+    def evaluate(x: np.ndarray) -> Dict[str, Any]:
+        if cache["x"] is None or not np.array_equal(cache["x"], x):
+            curve = curve_type(*x.tolist())
+            discount = curve.discount(times)
+            model_prices = cash_flows @ discount
+            cache.update(x=x.copy(), curve=curve, discount=discount)
+            cache.update(prices=model_prices)
+            if errors == "yield":
+                model_yields = bond_yields(cash_flows, times, model_prices, yields)
+                cache.update(yields=model_yields)
+        return cache
+
+    def residuals(x: np.ndarray) -> np.ndarray:
+        state = evaluate(x)
+        if errors == "yield":
+            return sqrt_weights * (state["yields"] - yields)
+        return sqrt_weights * (state["prices"] - prices)
+
+    def jacobian(x: np.ndarray) -> np.ndarray:
+        state = evaluate(x)
+        curve, discount = state["curve"], state["discount"]
+        factors = np.asarray(curve.factor_matrix(times))
+        dfactors = curve.factor_matrix_derivatives(times)
+        dzero = np.column_stack([factors, (dfactors @ x[:n_beta]).T])
+        dprices = cash_flows @ (-(times * discount)[:, None] * dzero)
+        if errors == "yield":
+            _, dprices_dyield = _discounted_cash_flows(
+                cash_flows, times, state["yields"]
+            )
+            dprices /= dprices_dyield[:, None]
+        return sqrt_weights[:, None] * dprices
+
+    opt_res = least_squares(
+        residuals,
+        x0,
+        jac=jacobian,
+        bounds=(lower, upper),
+        method="trf",
+        x_scale="jac",
+        xtol=1e-10,
+        ftol=1e-12,
+        gtol=1e-10,
+    )
+    curve = curve_type(*opt_res.x.tolist())
+    opt_res.fitted_prices = evaluate(opt_res.x)["prices"]
+    opt_res.yields = yields
+    opt_res.durations = durations
+    opt_res.weights = weights
+    return curve, opt_res
+
+
+def calibrate_ns_bonds(
+    cash_flows: Any,
+    times: np.ndarray,
+    prices: np.ndarray,
+    tau0: Optional[float] = None,
+    errors: str = "price",
+    weights: Union[None, str, np.ndarray] = None,
+    bounds: Tuple[float, float] = (0.1, 30.0),
+) -> Tuple[NelsonSiegelCurve, Any]:
+    """Calibrate a Nelson-Siegel curve to the dirty prices of bonds with
+    cash-flow matrix cash_flows (bonds x times, dense or sparse) paid at
+    times (in years).
+    All parameters are fitted by least squares of the price errors or, if
+    errors is "yield", of the errors in continuously compounded yields to
+    maturity, optionally weighted by weights per bond (multiplying the
+    squared errors, as in `calibrate_ns_wls`) or by the inverse squared
+    Macaulay durations (weights="duration", approximating yield errors
+    by price errors). Discount factors of all cash-flow times are
+    evaluated by a single vectorized call per iteration, derivatives are
+    analytic. Tau is bounded by bounds and starts at tau0 or, by default,
+    at the result of `calibrate_ns_ols_grid` fitted to the yields of the
+    bonds at their durations.
+    Returns the calibrated curve and the `OptimizeResult` of
+    `scipy.optimize.least_squares`, extended by `fitted_prices`, as well
+    as the market `yields`, `durations` and `weights` of the bonds.
+    """
+    return _calibrate_bonds(
+        NelsonSiegelCurve,
+        1,
+        betas_ns_ols,
+        calibrate_ns_ols_grid,
+        cash_flows,
+        times,
+        prices,
+        tau0,
+        errors,
+        weights,
+        bounds,
+    )
+
+
+def calibrate_nss_bonds(
+    cash_flows: Any,
+    times: np.ndarray,
+    prices: np.ndarray,
+    tau0: Optional[Tuple[float, float]] = None,
+    errors: str = "price",
+    weights: Union[None, str, np.ndarray] = None,
+    bounds: Tuple[float, float] = (0.1, 30.0),
+) -> Tuple[NelsonSiegelSvenssonCurve, Any]:
+    """Calibrate a Nelson-Siegel-Svensson curve to the dirty prices of
+    bonds with cash-flow matrix cash_flows (bonds x times, dense or
+    sparse) paid at times (in years).
+    All parameters are fitted by least squares of the price errors or, if
+    errors is "yield", of the errors in continuously compounded yields to
+    maturity, optionally weighted by weights per bond (multiplying the
+    squared errors, as in `calibrate_nss_wls`) or by the inverse squared
+    Macaulay durations (weights="duration", approximating yield errors
+    by price errors). Discount factors of all cash-flow times are
+    evaluated by a single vectorized call per iteration, derivatives are
+    analytic. Tau1 and tau2 are bounded by bounds and start at tau0 or,
+    by default, at the result of `calibrate_nss_ols_grid` fitted to the
+    yields of the bonds at their durations.
+    Returns the calibrated curve and the `OptimizeResult` of
+    `scipy.optimize.least_squares`, extended by `fitted_prices`, as well
+    as the market `yields`, `durations` and `weights` of the bonds.
+    """
+    return _calibrate_bonds(
+        NelsonSiegelSvenssonCurve,
+        2,
+        betas_nss_ols,
+        calibrate_nss_ols_grid,
+        cash_flows,
+        times,
+        prices,
+        tau0,
+        errors,
+        weights,
+        bounds,
+    )
@@ -2,23 +2,69 @@
 
 """Calibration methods for Nelson-Siegel(-Svensson) Models.
 See `calibrate_ns_ols` and `calibrate_nss_ols` for ordinary least squares
-(OLS) based methods.
+(OLS) based methods and `calibrate_ns_ols_panel` and `calibrate_nss_ols_panel`
+for calibrating many curves (e.g. a history of dates) at once, optionally
+warm-started. `empirical_factors_panel` computes the empirical factors of
+Diebold and Li for whole yield matrices.
+`calibrate_ns_ols_grid` and `calibrate_nss_ols_grid` combine a global grid
+search with local refinement instead of relying on a single starting value.
+`calibrate_ns_ols_bounded` and `calibrate_nss_ols_bounded` keep tau within
+bounds (and tau1 and tau2 apart) by optimizing in logarithmic scale.
+`calibrate_ns_wls` and `calibrate_nss_wls` fit weighted least squares,
+`calibrate_ns_robust` and `calibrate_nss_robust` limit the influence of
+outliers by iteratively reweighted least squares (Huber or bisquare loss).
+`CalibrationContext` caches factor matrices for repeated calibrations
+on the same maturities. Analytic gradients and Jacobians of the OLS-based
+error functions with respect to tau are provided by `gradient_ns_ols`,
+`jacobian_ns_ols`, `gradient_nss_ols` and `jacobian_nss_ols`.
+`calibrate_ns_ols` and `calibrate_nss_ols` can be instrumented, see the
+`instrumentation` module.
+SciPy is imported by the optimizing functions only, so that evaluating
+betas, error functions and their derivatives does not pay its import time.
 """
 
-from typing import Tuple, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Tuple, Any, Callable, Dict, List, Optional
 
 import numpy as np
-from numpy.linalg import lstsq
-from scipy.optimize import minimize
+from numpy.linalg import lstsq, pinv
 
-from .ns import NelsonSiegelCurve
-from .nss import NelsonSiegelSvenssonCurve
+from .instrumentation import CalibrationTrace, _instrumented, _report
+from .ns import NelsonSiegelCurve, NelsonSiegelCurveSet
+from .nss import NelsonSiegelSvenssonCurve, NelsonSiegelSvenssonCurveSet
+
+# maximum number of elements of temporary arrays in panel calibration
+_PANEL_CHUNK_ELEMENTS = 2**22
+
+# factor matrix, its pseudo-inverse and its derivatives with respect to tau
+_CacheEntry = Tuple[np.ndarray, np.ndarray, np.ndarray]
 
 
 def _assert_same_shape(t: np.ndarray, y: np.ndarray) -> None:
     assert t.shape == y.shape, "Mismatching shapes of time and values"
 
 
+def _jacobian_ols(
+    factors: np.ndarray, factors_pinv: np.ndarray, dfactors: np.ndarray, y: np.ndarray
+) -> np.ndarray:
+    """Jacobian of the residuals of the OLS fit of factor matrix factors
+    (with pseudo-inverse factors_pinv) to y with respect to the taus, given
+    the derivatives dfactors of the factor matrix stacked along the first
+    axis (one per tau), following Golub and Pereyra (1973).
+    """
+    beta = factors_pinv @ y
+    residuals = factors @ beta - y
+    dfitted = (dfactors @ beta).T
+    dfactors_residuals = (np.swapaxes(dfactors, 1, 2) @ residuals).T
+    return (
+        dfitted
+        - factors @ (factors_pinv @ dfitted)
+        - factors_pinv.T @ dfactors_residuals
+    )
+
+
 def betas_ns_ols(
     tau: float, t: np.ndarray, y: np.ndarray
 ) -> Tuple[NelsonSiegelCurve, Any]:
@@ -44,15 +90,126 @@ def errorfn_ns_ols(tau: float, t: np.ndarray, y: np.ndarray) -> float:
     return np.sum((curve(t) - y) ** 2)
 
 
+def residuals_ns_ols(tau: Any, t: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Residuals of a Nelson-Siegel model for time-value pairs t and y.
+    All betas are obtained by ordinary least squares given tau (a float
+    or an array containing tau only).
+    """
+    _assert_same_shape(t, y)
+    curve, lstsq_res = betas_ns_ols(np.ravel(tau)[0], t, y)
+    return curve(t) - y
+
+
+def gradient_ns_ols(tau: Any, t: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Gradient (array of length 1) of `errorfn_ns_ols` with respect to
+    tau. As the betas are optimal given tau, only the derivatives of the
+    factor loadings contribute (variable projection).
+    """
+    _assert_same_shape(t, y)
+    curve, lstsq_res = betas_ns_ols(np.ravel(tau)[0], t, y)
+    dfactor1, dfactor2 = curve.factor_derivatives(t)
+    dfitted = curve.beta1 * dfactor1 + curve.beta2 * dfactor2
+    return np.array([2 * np.sum((curve(t) - y) * dfitted)])
+
+
+def jacobian_ns_ols(tau: Any, t: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Jacobian (of shape (len(t), 1)) of `residuals_ns_ols` with respect
+    to tau, taking into account the dependence of the optimal betas on tau
+    (variable projection).
+    """
+    _assert_same_shape(t, y)
+    curve = NelsonSiegelCurve(0, 0, 0, np.ravel(tau)[0])
+    factors = np.asarray(curve.factor_matrix(t))
+    dfactors = curve.factor_matrix_derivatives(t)
+    return _jacobian_ols(factors, pinv(factors), dfactors, y)
+
+
+def _calibrate_ols_instrumented(
+    function: str,
+    curve_type: type,
+    n_beta: int,
+    t: np.ndarray,
+    y: np.ndarray,
+    tau0: Any,
+    callback: Optional[Callable[[CalibrationTrace], None]],
+) -> Any:
+    """Minimize the OLS error function of curve_type over the taus like
+    `calibrate_ns_ols` and `calibrate_nss_ols`, recording a
+    `CalibrationTrace` passed to callback and registered hooks.
+    The error function and its gradient are evaluated together.
+    """
+    from scipy.optimize import minimize
+
+    start_time = perf_counter()
+    tau0 = np.atleast_1d(np.asarray(tau0, dtype=float))
+    trace = CalibrationTrace(function, np.size(t), tau0.tolist(), [tau0.tolist()])
+    # condition numbers of the factor matrices by taus evaluated
+    conditions: Dict[Tuple[float, ...], float] = {}
+
+    def objective(tau: np.ndarray) -> Tuple[float, np.ndarray]:
+        factors_start = perf_counter()
+        curve = curve_type(*([0.0] * n_beta + tau.tolist()))
+        factors = np.asarray(curve.factor_matrix(t))
+        dfactors = curve.factor_matrix_derivatives(t)
+        lstsq_start = perf_counter()
+        beta, _, _, singular_values = lstsq(factors, y, rcond=None)
+        end_time = perf_counter()
+        trace.seconds_factors += lstsq_start - factors_start
+        trace.seconds_lstsq += end_time - lstsq_start
+        trace.nfev += 1
+        with np.errstate(divide="ignore"):
+            condition = singular_values[0] / singular_values[-1]
+        conditions[tuple(tau.tolist())] = float(condition)
+        residuals = factors @ beta - y
+        return residuals @ residuals, 2 * (dfactors @ beta) @ residuals
+
+    opt_res = minimize(
+        objective,
+        x0=tau0,
+        jac=True,
+        callback=lambda tau: trace.tau_path.append(tau.tolist()),
+    )
+    trace.nit = int(opt_res.nit)
+    trace.success = bool(opt_res.success)
+    final_tau = tuple(opt_res.x.tolist())
+    if final_tau not in conditions:
+        curve = curve_type(*([0.0] * n_beta + list(final_tau)))
+        conditions[final_tau] = float(np.linalg.cond(curve.factor_matrix(t)))
+    trace.condition_number = conditions[final_tau]
+    trace.max_condition_number = max(conditions.values())
+    trace.seconds = perf_counter() - start_time
+    trace.seconds_optimizer = (
+        trace.seconds - trace.seconds_factors - trace.seconds_lstsq
+    )
+    opt_res.trace = trace
+    _report(trace, callback)
+    return opt_res
+
+
 def calibrate_ns_ols(
-    t: np.ndarray, y: np.ndarray, tau0: float = 2.0
+    t: np.ndarray,
+    y: np.ndarray,
+    tau0: float = 2.0,
+    callback: Optional[Callable[[CalibrationTrace], None]] = None,
 ) -> Tuple[NelsonSiegelCurve, Any]:
     """Calibrate a Nelson-Siegel curve to time-value pairs
     t and y, by optimizing tau and chosing all betas
-    using ordinary least squares.
+    using ordinary least squares. The optimizer is supplied
+    with the analytic gradient `gradient_ns_ols`.
+    If callback is given or hooks are registered, the calibration is
+    instrumented and its `CalibrationTrace` is passed to them (and stored
+    as `trace` of the returned `OptimizeResult`).
     """
+    from scipy.optimize import minimize
+
     _assert_same_shape(t, y)
-    opt_res = minimize(errorfn_ns_ols, x0=tau0, args=(t, y))
+    if _instrumented(callback):
+        opt_res = _calibrate_ols_instrumented(
+            "calibrate_ns_ols", NelsonSiegelCurve, 3, t, y, tau0, callback
+        )
+        curve, lstsq_res = betas_ns_ols(opt_res.x[0], t, y)
+        return curve, opt_res
+    opt_res = minimize(errorfn_ns_ols, x0=tau0, args=(t, y), jac=gradient_ns_ols)
     curve, lstsq_res = betas_ns_ols(opt_res.x[0], t, y)
     return curve, opt_res
 
@@ -61,7 +218,59 @@ def empirical_factors(
     y_3m: float, y_2y: float, y_10y: float
 ) -> Tuple[float, float, float]:
     """Calculate the empirical factors according to
-    Diebold and Li (2006)."""
+    Diebold and Li (2006). Also works elementwise on arrays of yields,
+    see `empirical_factors_panel` for whole yield matrices.
+    """
+    return y_10y, y_10y - y_3m, 2 * y_2y - y_3m - y_10y
+
+
+def empirical_factors_panel(
+    t: np.ndarray,
+    Y: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+    maturities: Tuple[float, float, float] = (0.25, 2.0, 10.0),
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate the empirical factors (level, slope and curvature)
+    according to Diebold and Li (2006) for every row of the yield matrix
+    Y (e.g. dates x maturities) given common maturities t. Missing points
+    are marked by True in mask (or by non-finite values in Y). The yields
+    at maturities (3 months, 2 and 10 years) are interpolated linearly
+    between the valid points of each row (constant beyond the shortest
+    and longest valid maturity). The neighbouring valid points of all rows
+    are found at once by cumulative maxima and minima of their indices, so
+    that no row is handled separately. Rows without valid points yield NaN.
+    """
+    t = np.asarray(t, dtype=float)
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    assert (
+        t.ndim == 1 and Y.shape[1:] == t.shape
+    ), "Mismatching shapes of time and values"
+    order = np.argsort(t)
+    t, Y = t[order], Y[:, order]
+    valid = np.isfinite(Y)
+    if mask is not None:
+        valid &= ~np.asarray(mask, dtype=bool)[:, order]
+    n = t.size
+    index = np.arange(n)
+    # last valid index at or before each column, first at or after
+    last = np.maximum.accumulate(np.where(valid, index, -1), axis=1)
+    after = np.hstack([np.where(valid, index, n), np.full((Y.shape[0], 1), n)])
+    after = np.minimum.accumulate(after[:, ::-1], axis=1)[:, ::-1]
+    points = np.asarray(maturities, dtype=float)
+    k = np.searchsorted(t, points, side="right") - 1
+    left = np.where(k >= 0, last[:, np.maximum(k, 0)], -1)
+    right = after[:, k + 1]
+    # constant beyond the shortest and longest valid maturity
+    left = np.where(left < 0, right, left)
+    right = np.where(right >= n, left, right)
+    found = (left >= 0) & (left < n)
+    left, right = np.where(found, left, 0), np.where(found, right, 0)
+    y_left = np.take_along_axis(Y, left, axis=1)
+    y_right = np.take_along_axis(Y, right, axis=1)
+    span = t[right] - t[left]
+    weight = np.where(span > 0, (points - t[left]) / np.where(span > 0, span, 1.0), 0.0)
+    key_yields = np.where(found, y_left + weight * (y_right - y_left), np.nan)
+    y_3m, y_2y, y_10y = key_yields.T
     return y_10y, y_10y - y_3m, 2 * y_2y - y_3m - y_10y
 
 
@@ -94,15 +303,1428 @@ def errorfn_nss_ols(tau: Tuple[float, float], t: np.ndarray, y: np.ndarray) -> f
     return np.sum((curve(t) - y) ** 2)
 
 
+def residuals_nss_ols(tau: Any, t: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Residuals of a Nelson-Siegel-Svensson model for time-value pairs
+    t and y. All betas are obtained by ordinary least squares given tau
+    (= array of tau1 and tau2).
+    """
+    _assert_same_shape(t, y)
+    curve, lstsq_res = betas_nss_ols((tau[0], tau[1]), t, y)
+    return curve(t) - y
+
+
+def gradient_nss_ols(tau: Any, t: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Gradient (array of length 2) of `errorfn_nss_ols` with respect to
+    tau1 and tau2. As the betas are optimal given tau, only the
+    derivatives of the factor loadings contribute (variable projection).
+    """
+    _assert_same_shape(t, y)
+    curve, lstsq_res = betas_nss_ols((tau[0], tau[1]), t, y)
+    dfactor1, dfactor2, dfactor3 = curve.factor_derivatives(t)
+    residuals = curve(t) - y
+    return 2 * np.array(
+        [
+            np.sum(residuals * (curve.beta1 * dfactor1 + curve.beta2 * dfactor2)),
+            np.sum(residuals * curve.beta3 * dfactor3),
+        ]
+    )
+
+
+def jacobian_nss_ols(tau: Any, t: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Jacobian (of shape (len(t), 2)) of `residuals_nss_ols` with respect
+    to tau1 and tau2, taking into account the dependence of the optimal
+    betas on tau (variable projection).
+    """
+    _assert_same_shape(t, y)
+    curve = NelsonSiegelSvenssonCurve(0, 0, 0, 0, tau[0], tau[1])
+    factors = np.asarray(curve.factor_matrix(t))
+    dfactors = curve.factor_matrix_derivatives(t)
+    return _jacobian_ols(factors, pinv(factors), dfactors, y)
+
+
 def calibrate_nss_ols(
-    t: np.ndarray, y: np.ndarray, tau0: Tuple[float, float] = (2.0, 5.0)
+    t: np.ndarray,
+    y: np.ndarray,
+    tau0: Tuple[float, float] = (2.0, 5.0),
+    callback: Optional[Callable[[CalibrationTrace], None]] = None,
 ) -> Tuple[NelsonSiegelSvenssonCurve, Any]:
     """Calibrate a Nelson-Siegel-Svensson curve to time-value
     pairs t and y, by optimizing tau1 and tau2 and chosing
-    all betas using ordinary least squares. This method does
-    not work well regarding the recovery of true parameters.
+    all betas using ordinary least squares. The optimizer is
+    supplied with the analytic gradient `gradient_nss_ols`.
+    This method does not work well regarding the recovery of
+    true parameters, see `calibrate_nss_ols_grid` for an
+    alternative.
+    If callback is given or hooks are registered, the calibration is
+    instrumented and its `CalibrationTrace` is passed to them (and stored
+    as `trace` of the returned `OptimizeResult`).
     """
+    from scipy.optimize import minimize
+
     _assert_same_shape(t, y)
-    opt_res = minimize(errorfn_nss_ols, x0=np.array(tau0), args=(t, y))
+    if _instrumented(callback):
+        opt_res = _calibrate_ols_instrumented(
+            "calibrate_nss_ols", NelsonSiegelSvenssonCurve, 4, t, y, tau0, callback
+        )
+        curve, lstsq_res = betas_nss_ols(opt_res.x, t, y)
+        return curve, opt_res
+    opt_res = minimize(
+        errorfn_nss_ols, x0=np.array(tau0), args=(t, y), jac=gradient_nss_ols
+    )
     curve, lstsq_res = betas_nss_ols(opt_res.x, t, y)
     return curve, opt_res
+
+
+def _factor_matrices_ns(tau: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Nelson-Siegel factor matrices of shape (len(tau), len(t), 3)
+    for an array of tau values of shape (len(tau), 1).
+    """
+    zero = np.zeros(tau.shape[0])
+    return NelsonSiegelCurveSet(zero, zero, zero, tau[:, 0]).factor_matrix(t)
+
+
+def _factor_matrices_nss(tau: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Nelson-Siegel-Svensson factor matrices of shape (len(tau), len(t), 4)
+    for an array of (tau1, tau2) pairs of shape (len(tau), 2).
+    """
+    zero = np.zeros(tau.shape[0])
+    curves = NelsonSiegelSvenssonCurveSet(zero, zero, zero, zero, tau[:, 0], tau[:, 1])
+    return curves.factor_matrix(t)
+
+
+def _chunks(rows: np.ndarray, chunk: int) -> List[np.ndarray]:
+    """Split an array of row indices into chunks of at most chunk rows."""
+    return np.array_split(rows, np.arange(chunk, rows.size, chunk))
+
+
+def _batched_ols(F: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Least squares solutions for stacked factor matrices F of shape
+    (..., n, k) and values y of shape (..., n, r), obtained from batched
+    normal equations with a negligible ridge term keeping degenerate
+    factor matrices (e.g. tau1 == tau2) solvable.
+    """
+    Ft = np.swapaxes(F, -1, -2)
+    A = Ft @ F
+    ridge = np.finfo(float).eps * (np.trace(A, axis1=-2, axis2=-1) + 1.0)
+    A += ridge[..., None, None] * np.eye(F.shape[-1])
+    return np.linalg.solve(A, Ft @ y)
+
+
+def _tau_values(tau_grid: Optional[np.ndarray]) -> np.ndarray:
+    """Sorted unique values of tau_grid, defaulting to 30 log-spaced
+    values between 0.1 and 30.
+    """
+    if tau_grid is None:
+        tau_grid = np.geomspace(0.1, 30.0, 30)
+    return np.unique(np.asarray(tau_grid, dtype=float))
+
+
+def _tau_combinations(
+    tau_values: np.ndarray, n_tau: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """All combinations of n_tau values (rows) from tau_values and flags
+    marking degenerate combinations containing the same value twice.
+    """
+    grid = np.stack(np.meshgrid(*[tau_values] * n_tau, indexing="ij"), axis=-1)
+    grid = grid.reshape(-1, n_tau)
+    degenerate = np.any(np.diff(np.sort(grid, axis=1), axis=1) == 0, axis=1)
+    return grid, degenerate
+
+
+def _grid_local_minima(
+    sse: np.ndarray, n_values: int, n_tau: int, n_starts: int
+) -> np.ndarray:
+    """Indices (rows, n_starts) of the n_starts best local minima of sums
+    of squared errors sse of shape (grid points, rows) on the grid of all
+    combinations of n_values values of n_tau taus (as returned by
+    `_tau_combinations`, with inf for excluded points). Local minima are
+    not larger than any of their neighbours; if there are fewer than
+    n_starts, the best one is repeated.
+    """
+    grid_shape = (n_values,) * n_tau
+    neighbours = np.stack(np.meshgrid(*[[-1, 0, 1]] * n_tau), axis=-1)
+    neighbours = neighbours.reshape(-1, n_tau)
+    neighbours = neighbours[np.any(neighbours != 0, axis=1)]
+    padded = np.pad(
+        sse.reshape(grid_shape + (-1,)),
+        [(1, 1)] * n_tau + [(0, 0)],
+        constant_values=np.inf,
+    )
+    local_min = np.ones(sse.shape, dtype=bool)
+    for offset in neighbours:
+        shifted = padded[tuple(slice(1 + o, 1 + o + n_values) for o in offset)]
+        local_min &= sse <= shifted.reshape(sse.shape)
+    score = np.where(local_min, sse, np.inf)
+    best = np.argsort(score, axis=0)[:n_starts].T
+    best_score = np.take_along_axis(score.T, best, axis=1)
+    # fall back to the best local minimum if there are fewer minima
+    return np.where(np.isfinite(best_score), best, best[:, :1])
+
+
+def _panel_grid_search(
+    factor_matrices: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    tau_grid: np.ndarray,
+    n_tau: int,
+    n_starts: int,
+    t: np.ndarray,
+    Y: np.ndarray,
+    valid: np.ndarray,
+) -> np.ndarray:
+    """Starting values of shape (rows, n_starts, n_tau) for every row of Y,
+    chosen as the best local minima of the sum of squared errors on the
+    grid of all combinations of values in tau_grid. Factor matrices and
+    their normal equations are built once per grid point and pattern of
+    valid points and shared by all rows with that pattern.
+    """
+    grid, degenerate = _tau_combinations(tau_grid, n_tau)
+    starts = np.zeros((Y.shape[0], n_starts), dtype=int)
+    F = factor_matrices(grid, t)
+    n_grid, n_factors = F.shape[0], F.shape[2]
+    patterns, pattern_idx = np.unique(valid, axis=0, return_inverse=True)
+    pattern_idx = pattern_idx.ravel()
+    for p, pattern in enumerate(patterns):
+        if pattern.sum() < n_factors:
+            continue
+        F_p = F[:, pattern, :]
+        chunk = max(1, _PANEL_CHUNK_ELEMENTS // (n_grid * F_p.shape[1]))
+        for rows in _chunks(np.flatnonzero(pattern_idx == p), chunk):
+            y = Y[rows][:, pattern].T
+            sse = np.sum((F_p @ _batched_ols(F_p, y) - y) ** 2, axis=1)
+            sse[degenerate] = np.inf
+            starts[rows] = _grid_local_minima(sse, tau_grid.size, n_tau, n_starts)
+    return grid[starts]
+
+
+def _panel_residuals_ols(
+    factor_matrices: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    tau: np.ndarray,
+    t: np.ndarray,
+    Y: np.ndarray,
+    w: np.ndarray,
+    exact: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Best-fitting betas and residuals for one tau (row of tau) per row
+    of Y, where missing values are excluded by zero weights in w. All
+    least squares problems are solved in one batch, using normal equations
+    or, if exact is set, pseudo-inverses.
+    """
+    F = factor_matrices(tau, t) * w[:, :, None]
+    y = (Y * w)[:, :, None]
+    beta = pinv(F) @ y if exact else _batched_ols(F, y)
+    return beta[:, :, 0], (F @ beta - y)[:, :, 0]
+
+
+def _panel_levenberg_marquardt(
+    factor_matrices: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    x: np.ndarray,
+    t: np.ndarray,
+    Y: np.ndarray,
+    w: np.ndarray,
+    x_bounds: Tuple[np.ndarray, np.ndarray],
+    xtol: float,
+    ftol: float,
+    maxiter: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Batched Levenberg-Marquardt iterations in x = log(tau) (one row of
+    x per row of Y) on the residuals of the OLS fit of the betas (variable
+    projection), keeping x within x_bounds. Jacobians are obtained by
+    forward differences. Returns optimized x, number of iterations,
+    convergence flags and stall flags per row (rows stopped as their
+    damping exceeded 1e10 before reaching xtol or ftol).
+    """
+    x = x.copy()
+    n_rows, n_tau = x.shape
+    h = np.sqrt(np.finfo(float).eps)
+    _, res = _panel_residuals_ols(factor_matrices, np.exp(x), t, Y, w)
+    sse = np.sum(res**2, axis=1)
+    damping = np.full(n_rows, 1e-3)
+    nit = np.zeros(n_rows, dtype=int)
+    active = np.ones(n_rows, dtype=bool)
+    converged = np.zeros(n_rows, dtype=bool)
+    stalled = np.zeros(n_rows, dtype=bool)
+    for _ in range(maxiter):
+        a = np.flatnonzero(active)
+        if a.size == 0:
+            break
+        nit[a] += 1
+        jac = np.empty((a.size, t.size, n_tau))
+        for j in range(n_tau):
+            x_h = x[a].copy()
+            x_h[:, j] += h
+            _, res_h = _panel_residuals_ols(factor_matrices, np.exp(x_h), t, Y[a], w[a])
+            jac[:, :, j] = (res_h - res[a]) / h
+        jtj = np.swapaxes(jac, 1, 2) @ jac
+        grad = (np.swapaxes(jac, 1, 2) @ res[a][:, :, None])[:, :, 0]
+        mu = damping[a] * (np.trace(jtj, axis1=1, axis2=2) + np.finfo(float).tiny)
+        lhs = jtj + mu[:, None, None] * np.eye(n_tau)
+        step = -np.linalg.solve(lhs, grad[:, :, None])[:, :, 0]
+        x_trial = np.clip(x[a] + np.clip(step, -1.0, 1.0), *x_bounds)
+        step_size = np.max(np.abs(x_trial - x[a]), axis=1)
+        _, res_trial = _panel_residuals_ols(
+            factor_matrices, np.exp(x_trial), t, Y[a], w[a]
+        )
+        sse_trial = np.sum(res_trial**2, axis=1)
+        sse_old = sse[a]
+        improved = sse_trial < sse_old
+        i = a[improved]
+        x[i] = x_trial[improved]
+        res[i], sse[i] = res_trial[improved], sse_trial[improved]
+        damping[i] /= 3.0
+        damping[a[~improved]] *= 4.0
+        done = step_size < xtol
+        done[improved] |= sse_old[improved] - sse_trial[improved] <= (
+            ftol * sse_old[improved]
+        )
+        stuck = ~done & (damping[a] > 1e10)
+        converged[a[done]] = True
+        stalled[a[stuck]] = True
+        active[a[done | stuck]] = False
+    return x, nit, converged, stalled
+
+
+def _calibrate_ols_panel(
+    factor_matrices: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    n_tau: int,
+    tau_grid: Optional[np.ndarray],
+    t: np.ndarray,
+    Y: np.ndarray,
+    mask: Optional[np.ndarray],
+    n_starts: int,
+    xtol: float,
+    ftol: float,
+    maxiter: int,
+    tau0: Optional[Any] = None,
+) -> Tuple[np.ndarray, np.ndarray, Any]:
+    """Calibrate all rows of Y by a shared grid search over tau followed
+    by batched Levenberg-Marquardt iterations from the n_starts best local
+    minima on the grid, keeping tau within the range of the grid.
+    If tau0 is given, rows with finite tau0 skip the grid search and start
+    from tau0 only, the others from their best local minimum on the grid.
+    Returns taus, betas and an `OptimizeResult` summarizing the fit, with
+    NaN taus and betas for rows with fewer valid points than factors.
+    """
+    from scipy.optimize import OptimizeResult
+
+    t = np.asarray(t, dtype=float)
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    assert (
+        t.ndim == 1 and Y.shape[1:] == t.shape
+    ), "Mismatching shapes of time and values"
+    tau_grid = _tau_values(tau_grid)
+    valid = np.isfinite(Y)
+    if mask is not None:
+        valid &= ~np.asarray(mask, dtype=bool)
+    w = valid.astype(float)
+    Y = np.where(valid, Y, 0.0)
+    n_rows, n_factors = Y.shape[0], n_tau + 2
+    fittable = valid.sum(axis=1) >= n_factors
+
+    if tau0 is None:
+        starts = _panel_grid_search(
+            factor_matrices, tau_grid, n_tau, n_starts, t, Y, valid
+        )
+    else:
+        n_starts = 1
+        starts = np.array(
+            np.broadcast_to(
+                np.asarray(tau0, dtype=float).reshape(-1, n_tau), (n_rows, n_tau)
+            )
+        )
+        cold = np.flatnonzero(~np.all(np.isfinite(starts), axis=1) & fittable)
+        if cold.size > 0:
+            starts[cold] = _panel_grid_search(
+                factor_matrices, tau_grid, n_tau, 1, t, Y[cold], valid[cold]
+            )[:, 0, :]
+        starts = np.clip(starts, tau_grid[0], tau_grid[-1])[:, None, :]
+    x_bounds = np.log(tau_grid[0]), np.log(tau_grid[-1])
+    x = np.log(starts[:, 0, :])
+    beta = np.full((n_rows, n_factors), np.nan)
+    sse = np.full(n_rows, np.nan)
+    nit = np.zeros(n_rows, dtype=int)
+    converged = np.zeros(n_rows, dtype=bool)
+    stalled = np.zeros(n_rows, dtype=bool)
+    chunk = max(
+        1,
+        _PANEL_CHUNK_ELEMENTS // (n_starts * (n_tau + 1) * t.size * n_factors),
+    )
+    for rows in _chunks(np.flatnonzero(fittable), chunk):
+        Y_r, w_r = np.repeat(Y[rows], n_starts, 0), np.repeat(w[rows], n_starts, 0)
+        x_r, nit_r, converged_r, stalled_r = _panel_levenberg_marquardt(
+            factor_matrices,
+            np.log(starts[rows].reshape(-1, n_tau)),
+            t,
+            Y_r,
+            w_r,
+            x_bounds,
+            xtol,
+            ftol,
+            maxiter,
+        )
+        beta_r, res = _panel_residuals_ols(
+            factor_matrices, np.exp(x_r), t, Y_r, w_r, exact=True
+        )
+        sse_r = np.sum(res**2, axis=1).reshape(-1, n_starts)
+        best = np.argmin(sse_r, axis=1) + n_starts * np.arange(rows.size)
+        x[rows], beta[rows], sse[rows] = x_r[best], beta_r[best], sse_r.ravel()[best]
+        nit[rows], converged[rows] = nit_r[best], converged_r[best]
+        stalled[rows] = stalled_r[best]
+
+    x[~fittable] = np.nan
+    success = fittable & converged
+    opt_res = OptimizeResult(
+        x=np.exp(x),
+        fun=sse,
+        success=success,
+        stalled=stalled,
+        nit=nit,
+        message="{} of {} curves converged, {} stalled".format(
+            success.sum(), n_rows, stalled.sum()
+        ),
+    )
+    return np.exp(x), beta, opt_res
+
+
+def calibrate_ns_ols_panel(
+    t: np.ndarray,
+    Y: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+    tau_grid: Optional[np.ndarray] = None,
+    n_starts: int = 2,
+    xtol: float = 1e-8,
+    ftol: float = 1e-8,
+    maxiter: int = 100,
+    tau0: Optional[Any] = None,
+) -> Tuple[NelsonSiegelCurveSet, Any]:
+    """Calibrate one Nelson-Siegel curve per row of the yield matrix Y
+    (e.g. dates x maturities) given common maturities t. Missing points
+    are marked by True in mask (or by non-finite values in Y) and are
+    excluded from the respective fit.
+
+    All rows are calibrated together: tau is first searched on
+    `tau_grid` (sharing factor matrices between rows). Starting from the
+    n_starts best local minima on the grid, tau is then refined by batched
+    Levenberg-Marquardt iterations in log(tau) (within the range of
+    `tau_grid`) until the step size drops below xtol or the relative
+    reduction of the sum of squared errors drops below ftol. Betas are
+    chosen using ordinary least squares.
+    Warm starts (e.g. the taus of a previous calibration of the history,
+    shifted by a date) can be given as tau0, either one value or one per
+    row: rows with finite tau0 skip the grid search and are refined from
+    tau0 only.
+    Returns a curve set with one curve per row (NaN for rows with too
+    few valid points) and an `OptimizeResult` with taus, sums of squared
+    errors, iteration counts, success flags and stall flags per row (rows
+    whose damping blew up before converging, not successful).
+    """
+    tau, beta, opt_res = _calibrate_ols_panel(
+        _factor_matrices_ns,
+        1,
+        tau_grid,
+        t,
+        Y,
+        mask,
+        n_starts,
+        xtol,
+        ftol,
+        maxiter,
+        tau0,
+    )
+    curves = NelsonSiegelCurveSet(beta[:, 0], beta[:, 1], beta[:, 2], tau[:, 0])
+    return curves, opt_res
+
+
+def calibrate_nss_ols_panel(
+    t: np.ndarray,
+    Y: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+    tau_grid: Optional[np.ndarray] = None,
+    n_starts: int = 3,
+    xtol: float = 1e-8,
+    ftol: float = 1e-8,
+    maxiter: int = 100,
+    tau0: Optional[Any] = None,
+) -> Tuple[NelsonSiegelSvenssonCurveSet, Any]:
+    """Calibrate one Nelson-Siegel-Svensson curve per row of the yield
+    matrix Y (e.g. dates x maturities) given common maturities t. Missing
+    points are marked by True in mask (or by non-finite values in Y) and
+    are excluded from the respective fit.
+
+    All rows are calibrated together: (tau1, tau2) is first searched on
+    all pairs of distinct values of `tau_grid` (sharing factor matrices
+    between rows). Starting from the n_starts best local minima on the
+    grid, (tau1, tau2) is then refined by batched Levenberg-Marquardt
+    iterations in log(tau1), log(tau2) (within the range of `tau_grid`)
+    until the step size drops below xtol or the relative reduction of the
+    sum of squared errors drops below ftol. Betas are chosen using ordinary
+    least squares.
+    Warm starts can be given as tau0, either one (tau1, tau2) pair or one
+    pair per row (e.g. the taus of a previous calibration): rows with finite
+    tau0 skip the grid search and are refined from tau0 only.
+    Returns a curve set with one curve per row (NaN for rows with too
+    few valid points) and an `OptimizeResult` with taus, sums of squared
+    errors, iteration counts, success flags and stall flags per row (rows
+    whose damping blew up before converging, not successful).
+    """
+    tau, beta, opt_res = _calibrate_ols_panel(
+        _factor_matrices_nss,
+        2,
+        tau_grid,
+        t,
+        Y,
+        mask,
+        n_starts,
+        xtol,
+        ftol,
+        maxiter,
+        tau0,
+    )
+    curves = NelsonSiegelSvenssonCurveSet(
+        beta[:, 0], beta[:, 1], beta[:, 2], beta[:, 3], tau[:, 0], tau[:, 1]
+    )
+    return curves, opt_res
+
+
+def _refine_ols(
+    residuals: Callable[..., np.ndarray],
+    jacobian: Callable[..., np.ndarray],
+    tau0: np.ndarray,
+    args: Tuple[Any, ...],
+    bounds: Tuple[float, float],
+) -> Any:
+    """Bounded local least squares optimization of tau starting at tau0
+    using the analytic jacobian of the residuals.
+    """
+    from scipy.optimize import least_squares
+
+    return least_squares(
+        residuals,
+        x0=tau0,
+        jac=jacobian,
+        args=args,
+        bounds=bounds,
+        method="trf",
+        x_scale=tau0,
+        xtol=1e-10,
+        ftol=1e-12,
+        gtol=1e-10,
+    )
+
+
+def _calibrate_ols_grid(
+    factor_matrices: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    residuals: Callable[..., np.ndarray],
+    jacobian: Callable[..., np.ndarray],
+    n_tau: int,
+    t: np.ndarray,
+    y: np.ndarray,
+    tau_grid: Optional[np.ndarray],
+    n_starts: int,
+) -> Tuple[np.ndarray, Any]:
+    """Optimize tau by a vectorized grid search followed by bounded local
+    optimizations from the n_starts best local minima on the grid.
+    Returns the best tau and the `OptimizeResult` of its local
+    optimization, extended by timings (seconds) and iteration counts.
+    """
+    _assert_same_shape(t, y)
+    start_time = perf_counter()
+    tau_values = _tau_values(tau_grid)
+    t = np.asarray(t, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = np.ones((1, t.size), dtype=bool)
+    starts = _panel_grid_search(
+        factor_matrices, tau_values, n_tau, n_starts, t, y[None, :], valid
+    )[0]
+    starts = np.unique(starts, axis=0)
+    grid_time = perf_counter()
+    bounds = (tau_values[0], tau_values[-1])
+    results = [
+        _refine_ols(residuals, jacobian, tau0, (t, y), bounds) for tau0 in starts
+    ]
+    end_time = perf_counter()
+    opt_res = min(results, key=lambda res: res.cost)
+    opt_res.starts = starts
+    opt_res.grid_nfev = tau_values.size**n_tau
+    opt_res.local_nfev = [res.nfev for res in results]
+    opt_res.local_njev = [res.njev for res in results]
+    opt_res.timing = {
+        "grid": grid_time - start_time,
+        "refine": end_time - grid_time,
+        "total": end_time - start_time,
+    }
+    return opt_res.x, opt_res
+
+
+def calibrate_ns_ols_grid(
+    t: np.ndarray,
+    y: np.ndarray,
+    tau_grid: Optional[np.ndarray] = None,
+    n_starts: int = 1,
+) -> Tuple[NelsonSiegelCurve, Any]:
+    """Calibrate a Nelson-Siegel curve to time-value pairs t and y by
+    a vectorized search of tau on `tau_grid` (defaulting to 30 log-spaced
+    values between 0.1 and 30) followed by bounded local least squares
+    optimizations of tau (within the range of the grid) starting from the
+    n_starts best local minima on the grid. All betas are chosen using
+    ordinary least squares.
+    Returns the calibrated curve and the `OptimizeResult` of
+    `scipy.optimize.least_squares` for the best start (residuals in
+    `fun`, half the sum of squared errors in `cost`), extended by
+    `starts`, `grid_nfev`, `local_nfev`, `local_njev` and a `timing`
+    breakdown in seconds.
+    """
+    tau, opt_res = _calibrate_ols_grid(
+        _factor_matrices_ns,
+        residuals_ns_ols,
+        jacobian_ns_ols,
+        1,
+        t,
+        y,
+        tau_grid,
+        n_starts,
+    )
+    curve, lstsq_res = betas_ns_ols(tau[0], t, y)
+    return curve, opt_res
+
+
+def calibrate_nss_ols_grid(
+    t: np.ndarray,
+    y: np.ndarray,
+    tau_grid: Optional[np.ndarray] = None,
+    n_starts: int = 3,
+) -> Tuple[NelsonSiegelSvenssonCurve, Any]:
+    """Calibrate a Nelson-Siegel-Svensson curve to time-value pairs t and
+    y by a vectorized search of (tau1, tau2) on all pairs of distinct
+    values of `tau_grid` (defaulting to 30 log-spaced values between 0.1
+    and 30) followed by bounded local least squares optimizations of tau1
+    and tau2 (within the range of the grid) starting from the n_starts
+    best local minima on the grid. All betas are chosen using ordinary
+    least squares. In contrast to `calibrate_nss_ols`, this does not
+    depend on a single starting value.
+    Returns the calibrated curve and the `OptimizeResult` of
+    `scipy.optimize.least_squares` for the best start (residuals in
+    `fun`, half the sum of squared errors in `cost`), extended by
+    `starts`, `grid_nfev`, `local_nfev`, `local_njev` and a `timing`
+    breakdown in seconds.
+    """
+    tau, opt_res = _calibrate_ols_grid(
+        _factor_matrices_nss,
+        residuals_nss_ols,
+        jacobian_nss_ols,
+        2,
+        t,
+        y,
+        tau_grid,
+        n_starts,
+    )
+    curve, lstsq_res = betas_nss_ols((tau[0], tau[1]), t, y)
+    return curve, opt_res
+
+
+class _DegenerateFit(Exception):
+    """Raised to stop an optimization at taus with a degenerate factor
+    matrix."""
+
+    def __init__(self, tau: np.ndarray, condition: float) -> None:
+        super().__init__(tau, condition)
+        self.tau = tau
+        self.condition = condition
+
+
+def _log_tau_transform(
+    x: np.ndarray, bounds: Tuple[float, float], min_ratio: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Taus and their Jacobian with respect to the unconstrained
+    parameters x of `_calibrate_ols_bounded`: log(tau) for a single tau
+    and, for two taus, log(tau1) and the position s (between 0 and 1) of
+    log(tau2) between log(min_ratio * tau1) and log of the upper bound.
+    """
+    if x.size == 1:
+        tau = np.exp(x)
+        return tau, np.diag(tau)
+    log_tau1, s = x
+    width = np.log(bounds[1] / min_ratio) - log_tau1
+    log_tau2 = log_tau1 + np.log(min_ratio) + s * width
+    tau = np.exp([log_tau1, log_tau2])
+    dtau = np.array([[tau[0], 0.0], [tau[1] * (1 - s), tau[1] * width]])
+    return tau, dtau
+
+
+def _log_tau_inverse(
+    tau: np.ndarray, bounds: Tuple[float, float], min_ratio: float
+) -> np.ndarray:
+    """Unconstrained parameters (see `_log_tau_transform`) of taus moved
+    into the feasible region (ordered, within bounds and separated by
+    min_ratio).
+    """
+    if tau.size == 1:
+        return np.log(np.clip(tau, *bounds))
+    tau1, tau2 = np.sort(tau)
+    tau1 = np.clip(tau1, bounds[0], bounds[1] / min_ratio)
+    tau2 = np.clip(tau2, tau1 * min_ratio, bounds[1])
+    width = np.log(bounds[1] / min_ratio / tau1)
+    s = np.log(tau2 / tau1 / min_ratio) / width if width > 0 else 0.0
+    return np.array([np.log(tau1), s])
+
+
+def _calibrate_ols_bounded(
+    curve_type: type,
+    n_beta: int,
+    t: np.ndarray,
+    y: np.ndarray,
+    tau0: Any,
+    bounds: Tuple[float, float],
+    min_ratio: float,
+    max_condition: float,
+    max_nfev: int,
+) -> Tuple[np.ndarray, Any]:
+    """Optimize the taus of a curve of type curve_type (with n_beta betas)
+    by bounded least squares of the OLS residuals in the
+    reparameterization of `_log_tau_transform`, stopping early at factor
+    matrices with condition numbers above max_condition.
+    Returns the optimal taus and the `OptimizeResult` of the optimization.
+    """
+    from scipy.optimize import OptimizeResult, least_squares
+
+    _assert_same_shape(t, y)
+    assert min_ratio >= 1, "min_ratio must not be less than 1"
+    assert 0 < bounds[0] * min_ratio < bounds[1], "Bounds too narrow for min_ratio"
+    tau0 = np.atleast_1d(np.asarray(tau0, dtype=float))
+    x0 = _log_tau_inverse(tau0, bounds, min_ratio)
+    if x0.size == 1:
+        lower, upper = np.log(bounds[:1]), np.log(bounds[1:])
+    else:
+        lower = np.array([np.log(bounds[0]), 0.0])
+        upper = np.array([np.log(bounds[1] / min_ratio), 1.0])
+
+    # factor matrix and its pseudo-inverse (from a single SVD) at the
+    # latest parameters, shared by residuals and Jacobian
+    cache: Dict[str, Any] = {"x": None}
+    nfev = [0]
+
+    def evaluate(x: np.ndarray) -> Dict[str, Any]:
+        if cache["x"] is None or not np.array_equal(cache["x"], x):
+            nfev[0] += 1
+            tau, dtau = _log_tau_transform(x, bounds, min_ratio)
+            curve = curve_type(*([0.0] * n_beta + tau.tolist()))
+            factors = np.asarray(curve.factor_matrix(t))
+            u, singular_values, vt = np.linalg.svd(factors, full_matrices=False)
+            if not singular_values[0] <= max_condition * singular_values[-1]:
+                with np.errstate(divide="ignore"):
+                    condition = singular_values[0] / singular_values[-1]
+                raise _DegenerateFit(tau, condition)
+            cache.update(x=x.copy(), tau=tau, dtau=dtau, curve=curve)
+            cache.update(factors=factors, pinv=(vt.T / singular_values) @ u.T)
+        return cache
+
+    def residuals(x: np.ndarray) -> np.ndarray:
+        state = evaluate(x)
+        return state["factors"] @ (state["pinv"] @ y) - y
+
+    def jacobian(x: np.ndarray) -> np.ndarray:
+        state = evaluate(x)
+        dfactors = state["curve"].factor_matrix_derivatives(t)
+        jac = _jacobian_ols(state["factors"], state["pinv"], dfactors, y)
+        return jac @ state["dtau"]
+
+    try:
+        opt_res = least_squares(
+            residuals,
+            x0,
+            jac=jacobian,
+            bounds=(lower, upper),
+            method="trf",
+            xtol=1e-8,
+            ftol=1e-10,
+            gtol=1e-10,
+            max_nfev=max_nfev,
+        )
+    except _DegenerateFit as e:
+        factors = curve_type(*([0.0] * n_beta + e.tau.tolist())).factor_matrix(t)
+        fun = factors @ lstsq(factors, y, rcond=None)[0] - y
+        opt_res = OptimizeResult(
+            x=e.tau,
+            fun=fun,
+            cost=fun @ fun / 2,
+            nfev=nfev[0],
+            success=False,
+            status=-2,
+            message="Factor matrix degenerate (condition number {:.3g})".format(
+                e.condition
+            ),
+            condition_number=e.condition,
+        )
+        return e.tau, opt_res
+    opt_res.x, _ = _log_tau_transform(opt_res.x, bounds, min_ratio)
+    return opt_res.x, opt_res
+
+
+def calibrate_ns_ols_bounded(
+    t: np.ndarray,
+    y: np.ndarray,
+    tau0: float = 2.0,
+    bounds: Tuple[float, float] = (0.1, 30.0),
+    max_condition: float = 1e8,
+    max_nfev: int = 100,
+) -> Tuple[NelsonSiegelCurve, Any]:
+    """Calibrate a Nelson-Siegel curve to time-value pairs t and y by
+    optimizing log(tau) within bounds by bounded least squares (starting
+    at tau0 moved into bounds), choosing all betas using ordinary least
+    squares. The optimization stops after max_nfev evaluations or, as
+    failure, at a factor matrix with condition number above max_condition.
+    Returns the calibrated curve and the `OptimizeResult` of
+    `scipy.optimize.least_squares` with tau in `x` (or an unsuccessful
+    result with `status` -2 if stopped at a degenerate factor matrix).
+    """
+    tau, opt_res = _calibrate_ols_bounded(
+        NelsonSiegelCurve,
+        3,
+        t,
+        y,
+        tau0,
+        bounds,
+        1.0,
+        max_condition,
+        max_nfev,
+    )
+    curve, lstsq_res = betas_ns_ols(tau[0], t, y)
+    return curve, opt_res
+
+
+def calibrate_nss_ols_bounded(
+    t: np.ndarray,
+    y: np.ndarray,
+    tau0: Tuple[float, float] = (2.0, 5.0),
+    bounds: Tuple[float, float] = (0.1, 30.0),
+    min_ratio: float = 1.5,
+    max_condition: float = 1e8,
+    max_nfev: int = 100,
+) -> Tuple[NelsonSiegelSvenssonCurve, Any]:
+    """Calibrate a Nelson-Siegel-Svensson curve to time-value pairs t and
+    y by bounded least squares optimization of tau1 and tau2, choosing
+    all betas using ordinary least squares. In contrast to
+    `calibrate_nss_ols`, the taus cannot become negative, huge or
+    (near-)equal: they are kept within bounds with tau2 at least
+    min_ratio times tau1 (the model being symmetric in the two pairs of
+    beta and tau, this does not restrict the curves apart from the
+    separation). Both are optimized in logarithmic scale: log(tau1) and
+    the position of log(tau2) between log(min_ratio * tau1) and log of the
+    upper bound, starting at tau0 moved into this region. The optimization
+    stops after max_nfev evaluations or, as failure, at a factor matrix
+    with condition number above max_condition.
+    Returns the calibrated curve and the `OptimizeResult` of
+    `scipy.optimize.least_squares` with tau1 and tau2 in `x` (or an
+    unsuccessful result with `status` -2 if stopped at a degenerate factor
+    matrix).
+    """
+    tau, opt_res = _calibrate_ols_bounded(
+        NelsonSiegelSvenssonCurve,
+        4,
+        t,
+        y,
+        tau0,
+        bounds,
+        min_ratio,
+        max_condition,
+        max_nfev,
+    )
+    curve, lstsq_res = betas_nss_ols((tau[0], tau[1]), t, y)
+    return curve, opt_res
+
+
+# tuning constants (in units of the scale) of the robust losses, giving
+# 95% efficiency for normally distributed errors
+_ROBUST_TUNING = {"huber": 1.345, "bisquare": 4.685}
+
+
+@dataclass
+class IRLSResult:
+    """Result of a robust fit of betas by iteratively reweighted least
+    squares: robust `weights` of the time-value pairs (in [0, 1], to be
+    multiplied by any given weights), the `scale` of the residuals they
+    are based on, the number of iterations `nit` and whether the betas
+    `converged`.
+    """
+
+    weights: np.ndarray
+    scale: float
+    nit: int
+    converged: bool
+
+
+def _check_weights(weights: Optional[np.ndarray], y: np.ndarray) -> np.ndarray:
+    """Weights (ones if None) as float array of the shape of y."""
+    if weights is None:
+        return np.ones(np.shape(y))
+    weights = np.asarray(weights, dtype=float)
+    assert weights.shape == np.shape(y), "Mismatching shapes of values and weights"
+    assert np.all(weights >= 0), "Weights must not be negative"
+    return weights
+
+
+def _wls(
+    factors: np.ndarray, y: np.ndarray, weights: np.ndarray
+) -> Tuple[np.ndarray, ...]:
+    """Weighted least squares solution of factors and y, returned like
+    `numpy.linalg.lstsq` (with residuals and singular values of the
+    weighted problem).
+    """
+    sqrt_weights = np.sqrt(weights)
+    return lstsq(factors * sqrt_weights[:, None], y * sqrt_weights, rcond=None)
+
+
+def _robust_weights(scaled_residuals: np.ndarray, loss: str, c: float) -> np.ndarray:
+    """IRLS weights psi(u) / u of residuals u in units of the scale."""
+    u = np.abs(scaled_residuals)
+    if loss == "huber":
+        with np.errstate(divide="ignore"):
+            return np.minimum(1.0, c / u)
+    return np.where(u < c, (1 - (u / c) ** 2) ** 2, 0.0)
+
+
+def _mad_scale(residuals: np.ndarray, weights: np.ndarray, y: np.ndarray) -> float:
+    """Robust scale of residuals (of positive weight): the median absolute
+    deviation from the median, consistent with the standard deviation of
+    normally distributed errors. Kept positive for (near-)exact fits.
+    """
+    residuals = residuals[weights > 0]
+    if residuals.size == 0:
+        return 1.0
+    mad = np.median(np.abs(residuals - np.median(residuals))) / 0.6744897501960817
+    return float(max(mad, 1e-12 * np.max(np.abs(y)))) or 1.0
+
+
+def _irls(
+    factors: np.ndarray,
+    y: np.ndarray,
+    weights: np.ndarray,
+    loss: str,
+    c: float,
+    scale: Optional[float],
+    max_iter: int,
+    tol: float,
+    robust_weights: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, IRLSResult]:
+    """Robust betas of factor matrix factors and values y with weights
+    by iteratively reweighted least squares, starting from robust_weights
+    (ones if None). The factor matrix is only reweighted, never
+    recomputed. If scale is None, it is re-estimated from the residuals
+    of each iteration by `_mad_scale`.
+    Returns the betas (weighted least squares with the final robust
+    weights) and an `IRLSResult`.
+    """
+    if robust_weights is None:
+        robust_weights = np.ones(y.shape)
+    beta = _wls(factors, y, weights * robust_weights)[0]
+    current_scale = np.nan if scale is None else scale
+    converged = False
+    nit = 0
+    while nit < max_iter and not converged:
+        nit += 1
+        residuals = factors @ beta - y
+        if scale is None:
+            current_scale = _mad_scale(residuals, weights, y)
+        robust_weights = _robust_weights(residuals / current_scale, loss, c)
+        new_beta = _wls(factors, y, weights * robust_weights)[0]
+        change = np.max(np.abs(new_beta - beta))
+        converged = bool(change <= tol * (1 + np.max(np.abs(new_beta))))
+        beta = new_beta
+    return beta, IRLSResult(robust_weights, float(current_scale), nit, converged)
+
+
+def _robust_tuning(loss: str, c: Optional[float]) -> float:
+    """Tuning constant c of loss (its default if None)."""
+    assert loss in _ROBUST_TUNING, "loss must be 'huber' or 'bisquare'"
+    return _ROBUST_TUNING[loss] if c is None else c
+
+
+def betas_ns_wls(
+    tau: float, t: np.ndarray, y: np.ndarray, weights: np.ndarray
+) -> Tuple[NelsonSiegelCurve, Any]:
+    """Calculate the beta-values minimizing the weighted sum of squared
+    errors given tau for time-value pairs t and y with (non-negative)
+    weights and return a corresponding Nelson-Siegel curve instance
+    (and the result of `numpy.linalg.lstsq` of the weighted problem).
+    """
+    _assert_same_shape(t, y)
+    weights = _check_weights(weights, y)
+    factors = np.asarray(NelsonSiegelCurve(0, 0, 0, tau).factor_matrix(t))
+    lstsq_res = _wls(factors, y, weights)
+    beta = lstsq_res[0]
+    return NelsonSiegelCurve(beta[0], beta[1], beta[2], tau), lstsq_res
+
+
+def betas_nss_wls(
+    tau: Tuple[float, float], t: np.ndarray, y: np.ndarray, weights: np.ndarray
+) -> Tuple[NelsonSiegelSvenssonCurve, Any]:
+    """Calculate the beta-values minimizing the weighted sum of squared
+    errors given tau (= array of tau1 and tau2) for time-value pairs t and
+    y with (non-negative) weights and return a corresponding
+    Nelson-Siegel-Svensson curve instance (and the result of
+    `numpy.linalg.lstsq` of the weighted problem).
+    """
+    _assert_same_shape(t, y)
+    weights = _check_weights(weights, y)
+    factors = np.asarray(
+        NelsonSiegelSvenssonCurve(0, 0, 0, 0, tau[0], tau[1]).factor_matrix(t)
+    )
+    lstsq_res = _wls(factors, y, weights)
+    beta = lstsq_res[0]
+    return (
+        NelsonSiegelSvenssonCurve(beta[0], beta[1], beta[2], beta[3], tau[0], tau[1]),
+        lstsq_res,
+    )
+
+
+def betas_ns_robust(
+    tau: float,
+    t: np.ndarray,
+    y: np.ndarray,
+    loss: str = "huber",
+    weights: Optional[np.ndarray] = None,
+    c: Optional[float] = None,
+    scale: Optional[float] = None,
+    max_iter: int = 50,
+    tol: float = 1e-10,
+) -> Tuple[NelsonSiegelCurve, IRLSResult]:
+    """Calculate robust beta-values given tau for time-value pairs t and
+    y (with optional weights) by iteratively reweighted least squares
+    (IRLS) of the Huber (loss "huber") or Tukey bisquare ("bisquare")
+    loss with tuning constant c (defaulting to 1.345 and 4.685), starting
+    from the (weighted) least squares fit. Residuals are measured in units
+    of scale, by default re-estimated in each iteration by the median
+    absolute deviation. The factor matrix is computed once and only
+    reweighted in the at most max_iter iterations (stopping when the
+    betas change by less than tol relative to their size).
+    Returns a corresponding Nelson-Siegel curve instance and the
+    `IRLSResult` holding the robust weights.
+    """
+    _assert_same_shape(t, y)
+    c = _robust_tuning(loss, c)
+    weights = _check_weights(weights, y)
+    factors = np.asarray(NelsonSiegelCurve(0, 0, 0, tau).factor_matrix(t))
+    beta, irls_res = _irls(factors, y, weights, loss, c, scale, max_iter, tol)
+    return NelsonSiegelCurve(beta[0], beta[1], beta[2], tau), irls_res
+
+
+def betas_nss_robust(
+    tau: Tuple[float, float],
+    t: np.ndarray,
+    y: np.ndarray,
+    loss: str = "huber",
+    weights: Optional[np.ndarray] = None,
+    c: Optional[float] = None,
+    scale: Optional[float] = None,
+    max_iter: int = 50,
+    tol: float = 1e-10,
+) -> Tuple[NelsonSiegelSvenssonCurve, IRLSResult]:
+    """Calculate robust beta-values given tau (= array of tau1 and tau2)
+    for time-value pairs t and y (with optional weights) by iteratively
+    reweighted least squares, see `betas_ns_robust`.
+    Returns a corresponding Nelson-Siegel-Svensson curve instance and the
+    `IRLSResult` holding the robust weights.
+    """
+    _assert_same_shape(t, y)
+    c = _robust_tuning(loss, c)
+    weights = _check_weights(weights, y)
+    factors = np.asarray(
+        NelsonSiegelSvenssonCurve(0, 0, 0, 0, tau[0], tau[1]).factor_matrix(t)
+    )
+    beta, irls_res = _irls(factors, y, weights, loss, c, scale, max_iter, tol)
+    return (
+        NelsonSiegelSvenssonCurve(beta[0], beta[1], beta[2], beta[3], tau[0], tau[1]),
+        irls_res,
+    )
+
+
+def _calibrate_irls(
+    curve_type: type,
+    n_beta: int,
+    t: np.ndarray,
+    y: np.ndarray,
+    weights: Optional[np.ndarray],
+    loss: Optional[str],
+    c: Optional[float],
+    scale: Optional[float],
+    tau0: Any,
+    bounds: Tuple[float, float],
+    max_iter: int,
+) -> Tuple[Any, Any]:
+    """Optimize the taus of a curve of type curve_type (with n_beta betas)
+    by bounded least squares of the weighted residuals of the betas fitted
+    by weighted least squares (loss None) or by IRLS of a robust loss.
+    For robust losses, the IRLS at each tau starts from the robust weights
+    of the previous tau, with the scale kept fixed during an optimization.
+    Unless given, the scale is estimated at tau0 and, as long as it
+    shrinks to less than half at the optimum (the fit at tau0 being
+    poor), re-estimated there followed by another optimization.
+    The Jacobian is that of the weighted problem with the current weights
+    (variable projection), whose stationary points are those of the robust
+    loss.
+    Returns the calibrated curve and the `OptimizeResult` of the (last)
+    optimization with the total `nfev`, extended by the robust `weights`,
+    `scale` and the total number of IRLS iterations `irls_nit` for robust
+    losses.
+    """
+    _assert_same_shape(t, y)
+    weights = _check_weights(weights, y)
+    tuning = 0.0 if loss is None else _robust_tuning(loss, c)
+    tau0 = np.clip(np.atleast_1d(np.asarray(tau0, dtype=float)), *bounds)
+    state: Dict[str, Any] = {"tau": None, "robust_weights": None, "irls_nit": 0}
+
+    def evaluate(tau: np.ndarray) -> Dict[str, Any]:
+        if state["tau"] is None or not np.array_equal(state["tau"], tau):
+            curve = curve_type(*([0.0] * n_beta + tau.tolist()))
+            factors = np.asarray(curve.factor_matrix(t))
+            if loss is None:
+                sqrt_weights = np.sqrt(weights)
+                weighted_factors = factors * sqrt_weights[:, None]
+                # pseudo-inverse of the weighted factor matrix (from a single
+                # SVD), shared by residuals and Jacobian
+                weighted_pinv = pinv(weighted_factors)
+                beta = weighted_pinv @ (sqrt_weights * y)
+            else:
+                beta, irls_res = _irls(
+                    factors,
+                    y,
+                    weights,
+                    loss,
+                    tuning,
+                    state.get("scale", scale),
+                    max_iter,
+                    1e-8,
+                    state["robust_weights"],
+                )
+                state.setdefault("scale", irls_res.scale)
+                state["robust_weights"] = irls_res.weights
+                state["irls_nit"] += irls_res.nit
+                sqrt_weights = np.sqrt(weights * irls_res.weights)
+                weighted_factors = factors * sqrt_weights[:, None]
+                # computed by the first Jacobian at tau
+                weighted_pinv = None
+            state.update(tau=tau.copy(), curve=curve, factors=factors, beta=beta)
+            state.update(sqrt_weights=sqrt_weights, weighted_factors=weighted_factors)
+            state["weighted_pinv"] = weighted_pinv
+        return state
+
+    def residuals(tau: np.ndarray) -> np.ndarray:
+        current = evaluate(tau)
+        return current["sqrt_weights"] * (current["factors"] @ current["beta"] - y)
+
+    def jacobian(tau: np.ndarray) -> np.ndarray:
+        current = evaluate(tau)
+        if current["weighted_pinv"] is None:
+            current["weighted_pinv"] = pinv(current["weighted_factors"])
+        sqrt_weights = current["sqrt_weights"]
+        dfactors = current["curve"].factor_matrix_derivatives(t)
+        dfactors = dfactors * sqrt_weights[:, None]
+        return _jacobian_ols(
+            current["weighted_factors"],
+            current["weighted_pinv"],
+            dfactors,
+            sqrt_weights * y,
+        )
+
+    evaluate(tau0)
+    opt_res = _refine_ols(residuals, jacobian, tau0, (), bounds)
+    current = evaluate(opt_res.x)
+    nfev = opt_res.nfev
+    while loss is not None and scale is None:
+        fitted_scale = _mad_scale(current["factors"] @ current["beta"] - y, weights, y)
+        if fitted_scale > 0.5 * current["scale"]:
+            break
+        state.update(tau=None, scale=fitted_scale)
+        opt_res = _refine_ols(residuals, jacobian, opt_res.x, (), bounds)
+        current = evaluate(opt_res.x)
+        nfev += opt_res.nfev
+    opt_res.nfev = nfev
+    if loss is not None:
+        opt_res.weights = current["robust_weights"]
+        opt_res.scale = current["scale"]
+        opt_res.irls_nit = current["irls_nit"]
+    return curve_type(*(current["beta"].tolist() + opt_res.x.tolist())), opt_res
+
+
+def calibrate_ns_wls(
+    t: np.ndarray,
+    y: np.ndarray,
+    weights: np.ndarray,
+    tau0: float = 2.0,
+    bounds: Tuple[float, float] = (0.1, 30.0),
+) -> Tuple[NelsonSiegelCurve, Any]:
+    """Calibrate a Nelson-Siegel curve to time-value pairs t and y with
+    (non-negative) weights, e.g. reflecting liquidity, minimizing the
+    weighted sum of squared errors. tau is optimized by bounded least
+    squares within bounds starting at tau0 (moved into bounds), all betas
+    are chosen using weighted least squares.
+    Returns the calibrated curve and the `OptimizeResult` of
+    `scipy.optimize.least_squares` (weighted residuals in `fun`, half the
+    weighted sum of squared errors in `cost`).
+    """
+    return _calibrate_irls(
+        NelsonSiegelCurve, 3, t, y, weights, None, None, None, tau0, bounds, 0
+    )
+
+
+def calibrate_nss_wls(
+    t: np.ndarray,
+    y: np.ndarray,
+    weights: np.ndarray,
+    tau0: Tuple[float, float] = (2.0, 5.0),
+    bounds: Tuple[float, float] = (0.1, 30.0),
+) -> Tuple[NelsonSiegelSvenssonCurve, Any]:
+    """Calibrate a Nelson-Siegel-Svensson curve to time-value pairs t and
+    y with (non-negative) weights, minimizing the weighted sum of squared
+    errors, see `calibrate_ns_wls`.
+    """
+    return _calibrate_irls(
+        NelsonSiegelSvenssonCurve, 4, t, y, weights, None, None, None, tau0, bounds, 0
+    )
+
+
+def calibrate_ns_robust(
+    t: np.ndarray,
+    y: np.ndarray,
+    loss: str = "huber",
+    weights: Optional[np.ndarray] = None,
+    tau0: float = 2.0,
+    bounds: Tuple[float, float] = (0.1, 30.0),
+    c: Optional[float] = None,
+    scale: Optional[float] = None,
+    max_iter: int = 50,
+) -> Tuple[NelsonSiegelCurve, Any]:
+    """Calibrate a Nelson-Siegel curve robustly to time-value pairs t and
+    y (with optional weights), limiting the influence of outliers such as
+    stale quotes. tau is optimized by bounded least squares within bounds
+    starting at tau0 (moved into bounds), the betas are chosen by
+    iteratively reweighted least squares of the Huber (loss "huber") or
+    Tukey bisquare ("bisquare") loss as in `betas_ns_robust`. Unless
+    given, the scale of the residuals is estimated by the median absolute
+    deviation at tau0 and again at the optimum, reoptimizing if it shrank
+    substantially. Each evaluation computes the factor matrix once and
+    reweights it in the (typically few) IRLS iterations warm-started from
+    the previous weights.
+    Returns the calibrated curve and the `OptimizeResult` of
+    `scipy.optimize.least_squares` (robustly weighted residuals in
+    `fun`), extended by the robust `weights` of the time-value pairs
+    (zero or small for outliers), the `scale` and the total number of
+    IRLS iterations `irls_nit`.
+    """
+    return _calibrate_irls(
+        NelsonSiegelCurve, 3, t, y, weights, loss, c, scale, tau0, bounds, max_iter
+    )
+
+
+def calibrate_nss_robust(
+    t: np.ndarray,
+    y: np.ndarray,
+    loss: str = "huber",
+    weights: Optional[np.ndarray] = None,
+    tau0: Tuple[float, float] = (2.0, 5.0),
+    bounds: Tuple[float, float] = (0.1, 30.0),
+    c: Optional[float] = None,
+    scale: Optional[float] = None,
+    max_iter: int = 50,
+) -> Tuple[NelsonSiegelSvenssonCurve, Any]:
+    """Calibrate a Nelson-Siegel-Svensson curve robustly to time-value
+    pairs t and y (with optional weights), optimizing tau1 and tau2 and
+    choosing the betas by iteratively reweighted least squares, see
+    `calibrate_ns_robust`.
+    """
+    return _calibrate_irls(
+        NelsonSiegelSvenssonCurve,
+        4,
+        t,
+        y,
+        weights,
+        loss,
+        c,
+        scale,
+        tau0,
+        bounds,
+        max_iter,
+    )
+
+
+class CalibrationContext:
+    """Reusable calibration context for a fixed vector of maturities t.
+
+    Factor matrices only depend on tau for given maturities. The context
+    therefore precomputes factor matrices and their pseudo-inverses once
+    for all points of a tau grid (all pairs of distinct values of
+    `tau_grid` for Nelson-Siegel-Svensson) and keeps those of further
+    taus (e.g. visited by local optimization) in a cache bounded to
+    `maxsize` entries with least recently used eviction. For given taus,
+    betas are then obtained in closed form by a matrix-vector product,
+    so repeated calibrations on the same maturities skip exponentials
+    and matrix decompositions.
+    """
+
+    def __init__(
+        self,
+        t: np.ndarray,
+        curve_type: type = NelsonSiegelSvenssonCurve,
+        tau_grid: Optional[np.ndarray] = None,
+        maxsize: int = 4096,
+    ) -> None:
+        if curve_type is NelsonSiegelCurve:
+            self._n_tau = 1
+            self._factor_matrices = _factor_matrices_ns
+        elif curve_type is NelsonSiegelSvenssonCurve:
+            self._n_tau = 2
+            self._factor_matrices = _factor_matrices_nss
+        else:
+            raise ValueError(f"Unsupported curve type {curve_type}")
+        self.t = np.array(t, dtype=float)
+        self.curve_type = curve_type
+        self.tau_values = _tau_values(tau_grid)
+        grid, degenerate = _tau_combinations(self.tau_values, self._n_tau)
+        self.tau_grid = grid[~degenerate]
+        self._grid_index = np.flatnonzero(~degenerate)
+        self._grid_size = grid.shape[0]
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[Tuple[float, ...], _CacheEntry]"
+        self._cache = OrderedDict()
+        self._grid_factors: Optional[np.ndarray] = None
+        self._grid_pinv: Optional[np.ndarray] = None
+
+    def grid_decomposition(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Factor matrices and their pseudo-inverses for all points of
+        the tau grid, stacked along the first axis.
+        """
+        if self._grid_factors is None or self._grid_pinv is None:
+            self._grid_factors = self._factor_matrices(self.tau_grid, self.t)
+            self._grid_pinv = pinv(self._grid_factors)
+        return self._grid_factors, self._grid_pinv
+
+    def _entry(self, tau: Any) -> _CacheEntry:
+        """Cached factor matrix, pseudo-inverse and factor matrix
+        derivatives for tau.
+        """
+        key = tuple(np.asarray(tau, dtype=float).ravel().tolist())
+        assert len(key) == self._n_tau, "Mismatching number of tau values"
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            curve = self.curve_type(*[0.0] * (self._n_tau + 2), *key)
+            factors = np.asarray(curve.factor_matrix(self.t))
+            entry = factors, pinv(factors), curve.factor_matrix_derivatives(self.t)
+            self._cache[key] = entry
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        return entry
+
+    def decomposition(self, tau: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Factor matrix and its pseudo-inverse for tau (a float for
+        Nelson-Siegel or tau1 and tau2 for Nelson-Siegel-Svensson).
+        """
+        factors, factors_pinv, _ = self._entry(tau)
+        return factors, factors_pinv
+
+    def clear(self) -> None:
+        """Remove all cached factor matrices and reset cache statistics."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def curve(self, tau: Any, beta: np.ndarray) -> Any:
+        """Curve instance of this context's curve type for tau and betas."""
+        tau = np.asarray(tau, dtype=float).ravel()
+        return self.curve_type(*beta.tolist(), *tau.tolist())
+
+    def betas(self, tau: Any, y: np.ndarray) -> Any:
+        """Best-fitting curve given tau for values y at this context's
+        maturities, with betas chosen using ordinary least squares.
+        """
+        _assert_same_shape(self.t, y)
+        _, factors_pinv = self.decomposition(tau)
+        return self.curve(tau, factors_pinv @ y)
+
+    def residuals(self, tau: Any, y: np.ndarray) -> np.ndarray:
+        """Residuals given tau for values y at this context's maturities.
+        All betas are obtained by ordinary least squares given tau.
+        """
+        factors, factors_pinv = self.decomposition(tau)
+        return factors @ (factors_pinv @ y) - y
+
+    def errorfn(self, tau: Any, y: np.ndarray) -> float:
+        """Sum of squares error function given tau for values y at this
+        context's maturities. All betas are obtained by ordinary least
+        squares given tau.
+        """
+        residuals = self.residuals(tau, y)
+        return float(residuals @ residuals)
+
+    def jacobian(self, tau: Any, y: np.ndarray) -> np.ndarray:
+        """Jacobian of `residuals` with respect to tau, of shape
+        (len(t), number of tau values), see `jacobian_nss_ols`.
+        """
+        return _jacobian_ols(*self._entry(tau), y)
+
+    def _grid_sse(self, y: np.ndarray) -> np.ndarray:
+        """Sums of squared errors for values y at all points of the tau
+        grid."""
+        _assert_same_shape(self.t, y)
+        factors, factors_pinv = self.grid_decomposition()
+        residuals = np.einsum("gmk,gk->gm", factors, factors_pinv @ y) - y
+        return np.sum(residuals**2, axis=1)
+
+    def grid_search(self, y: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Best point of the tau grid for values y at this context's
+        maturities and the corresponding sum of squared errors.
+        """
+        sse = self._grid_sse(y)
+        best = int(np.argmin(sse))
+        return self.tau_grid[best], float(sse[best])
+
+    def grid_starts(self, y: np.ndarray, n_starts: int) -> np.ndarray:
+        """The (unique) n_starts best local minima of the sum of squared
+        errors on the tau grid for values y at this context's maturities,
+        best first, as rows of taus.
+        """
+        sse = np.full(self._grid_size, np.inf)
+        sse[self._grid_index] = self._grid_sse(y)
+        best = _grid_local_minima(
+            sse[:, None], self.tau_values.size, self._n_tau, n_starts
+        )[0]
+        grid, _ = _tau_combinations(self.tau_values, self._n_tau)
+        _, first = np.unique(best, return_index=True)
+        return grid[best[np.sort(first)]]
+
+    def calibrate(
+        self, y: np.ndarray, refine: bool = True, n_starts: Optional[int] = None
+    ) -> Tuple[Any, Any]:
+        """Calibrate a curve to values y at this context's maturities by
+        a search on the tau grid and, if refine is set, bounded local
+        least squares optimizations of tau (within the range of the grid)
+        starting at the n_starts best local minima on the grid (by default
+        1 for Nelson-Siegel and 3 for Nelson-Siegel-Svensson, as in
+        `calibrate_ns_ols_grid` and `calibrate_nss_ols_grid`), keeping
+        the best. All betas are chosen using ordinary least squares.
+        Returns the curve and an `OptimizeResult` (with half the sum of
+        squared errors in `cost`).
+        """
+        _assert_same_shape(self.t, y)
+        if refine:
+            if n_starts is None:
+                n_starts = 1 if self._n_tau == 1 else 3
+            starts = self.grid_starts(y, n_starts)
+            bounds = (self.tau_values[0], self.tau_values[-1])
+            results = [
+                _refine_ols(self.residuals, self.jacobian, tau0, (y,), bounds)
+                for tau0 in starts
+            ]
+            opt_res = min(results, key=lambda res: res.cost)
+            opt_res.starts = starts
+        else:
+            from scipy.optimize import OptimizeResult
+
+            tau, sse = self.grid_search(y)
+            opt_res = OptimizeResult(
+                x=tau, cost=sse / 2, success=True, nfev=self.tau_grid.shape[0]
+            )
+        return self.betas(opt_res.x, y), opt_res
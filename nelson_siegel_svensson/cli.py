@@ -1,16 +1,36 @@
 # -*- coding: utf-8 -*-
 
-"""Console script for nelson_siegel_svensson."""
+"""Console script for nelson_siegel_svensson.
+Matplotlib is imported by the plot command only and SciPy by the
+calibration commands only, keeping the startup of the other commands fast.
+"""
 import sys
 import click
+import csv
 import json
+import struct
+from collections import deque
+from dataclasses import asdict
+from itertools import islice
 
 import numpy as np
-from matplotlib import pyplot as plt
 
 from .ns import NelsonSiegelCurve
-from .nss import NelsonSiegelSvenssonCurve
-from .calibrate import calibrate_ns_ols, calibrate_nss_ols
+from .nss import NelsonSiegelSvenssonCurve, NelsonSiegelSvenssonCurveSet
+from .calibrate import (
+    calibrate_ns_ols,
+    calibrate_ns_ols_bounded,
+    calibrate_ns_ols_grid,
+    calibrate_nss_ols,
+    calibrate_nss_ols_bounded,
+    calibrate_nss_ols_grid,
+)
+from .parallel import calibrate_iter, calibrate_many
+
+
+# total length of .npy headers written by the evaluate command, leaving
+# room to rewrite the number of rows once all curves are evaluated
+_NPY_HEADER_LENGTH = 128
 
 
 class Curve(click.ParamType):
@@ -51,15 +71,76 @@ def cli_main(args=None):
     return 0
 
 
+def _read_jsonl_tasks(lines, times):
+    """Calibration tasks (id, times, values) from JSON Lines with objects
+    holding "values" and optionally "times" (defaulting to times) and
+    "id"."""
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            task = json.loads(line)
+            t = np.array(task["times"] if "times" in task else times, dtype=float)
+            y = np.array(task["values"], dtype=float)
+            if t.ndim != 1 or t.shape != y.shape:
+                raise ValueError("mismatching times and values")
+        except Exception as e:
+            raise click.ClickException(
+                "invalid task in line {}: {}".format(number, e)
+            ) from e
+        yield task.get("id"), t, y
+
+
+def _read_csv_tasks(lines):
+    """Calibration tasks (id, times, values) from CSV with time points in
+    the header row, optionally preceded by an id column, and values of
+    one task per row. Empty cells are treated as missing values."""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if not header:
+        return
+    try:
+        float(header[0])
+        has_id = False
+    except ValueError:
+        has_id = True
+    try:
+        t = np.array(header[has_id:], dtype=float)
+    except ValueError as e:
+        raise click.ClickException("invalid time points in CSV header: {}".format(e))
+    for row in reader:
+        if not row:
+            continue
+        try:
+            y = np.array([v if v.strip() else "nan" for v in row[has_id:]], dtype=float)
+            if y.shape != t.shape:
+                raise ValueError("expected {} values".format(t.size))
+        except ValueError as e:
+            raise click.ClickException(
+                "invalid task in line {}: {}".format(reader.line_num, e)
+            ) from e
+        valid = np.isfinite(y)
+        yield row[0] if has_id else None, t[valid], y[valid]
+
+
+def _status_dict(curve, status):
+    """Curve parameters and optimizer status as JSON-serializable dict."""
+    result = asdict(curve)
+    result.update(
+        success=status.success,
+        nfev=status.nfev,
+        sse=status.sse,
+        seconds=status.seconds,
+    )
+    return result
+
+
 @click.command(name="calibrate")
-@click.option(
-    "-t", "--times", type=FloatArray(), required=True, help="time points as JSON array."
-)
+@click.option("-t", "--times", type=FloatArray(), help="time points as JSON array.")
 @click.option(
     "-y",
     "--values",
     type=FloatArray(),
-    required=True,
     help="values corresponding to time points as JSON array.",
 )
 @click.option(
@@ -83,14 +164,266 @@ def cli_main(args=None):
     show_default=True,
     help="Initial value of tau2 (ignored by Nelson-Siegel) " + "for optimization.",
 )
-def cli_calibrate(times, values, nelson_siegel_svensson, initial_tau1, initial_tau2):
-    """Calibrate a curve to the given data points."""
-    if nelson_siegel_svensson:
-        curve, status = calibrate_nss_ols(times, values, (initial_tau1, initial_tau2))
+@click.option(
+    "-b",
+    "--batch",
+    type=click.File("r"),
+    default=None,
+    help="Batch mode: file ('-' for stdin) of calibration tasks in JSON Lines"
+    + ' (objects with "values" and optional "times" and "id") or CSV format'
+    + " (time points as header, optionally preceded by an id column).",
+)
+@click.option(
+    "--format",
+    "batch_format",
+    type=click.Choice(["jsonl", "csv"]),
+    default=None,
+    help="Format of the batch file, by default inferred from its extension"
+    + " (JSON Lines unless .csv).",
+)
+@click.option(
+    "--method",
+    type=click.Choice(["ols", "grid", "bounded"]),
+    default="ols",
+    show_default=True,
+    help="Calibration by optimization from initial taus, by grid search"
+    + " (ignoring initial taus) or by bounded optimization from initial taus.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Batch mode: number of worker processes.",
+)
+def cli_calibrate(
+    times,
+    values,
+    nelson_siegel_svensson,
+    initial_tau1,
+    initial_tau2,
+    batch,
+    batch_format,
+    method,
+    jobs,
+):
+    """Calibrate a curve to the given data points.
+
+    In batch mode, many tasks are read from a file or stdin and one JSON
+    line of curve parameters and optimizer status is written per task (in
+    the order of the input) as soon as it is calibrated."""
+    tau0 = (initial_tau1, initial_tau2) if nelson_siegel_svensson else initial_tau1
+    if batch is None:
+        if times is None or values is None:
+            raise click.UsageError("--times and --values are required without --batch")
+        if method == "grid":
+            calibrate_grid = (
+                calibrate_nss_ols_grid
+                if nelson_siegel_svensson
+                else calibrate_ns_ols_grid
+            )
+            curve, status = calibrate_grid(times, values)
+        else:
+            if method == "bounded":
+                calibrate = (
+                    calibrate_nss_ols_bounded
+                    if nelson_siegel_svensson
+                    else calibrate_ns_ols_bounded
+                )
+            else:
+                calibrate = (
+                    calibrate_nss_ols if nelson_siegel_svensson else calibrate_ns_ols
+                )
+            curve, status = calibrate(times, values, tau0)
+        if not status.success:
+            raise click.ClickException(f"Calibration failed: {status.message}")
+        click.echo(json.dumps(asdict(curve)))
+        return
+    if batch_format is None:
+        batch_format = "csv" if batch.name.lower().endswith(".csv") else "jsonl"
+    if batch_format == "csv":
+        tasks = _read_csv_tasks(batch)
+    else:
+        tasks = _read_jsonl_tasks(batch, times)
+    ids = deque()
+
+    def jobs_of_tasks():
+        for task_id, t, y in tasks:
+            ids.append(task_id)
+            yield t, y
+
+    results = calibrate_iter(
+        jobs_of_tasks(),
+        nelson_siegel_svensson=nelson_siegel_svensson,
+        method=method,
+        tau0=tau0 if method in ("ols", "bounded") else None,
+        executor="serial" if jobs == 1 else "process",
+        max_workers=jobs,
+        chunksize=1 if jobs == 1 else 16,
+    )
+    for curve, status in results:
+        task_id = ids.popleft()
+        result = {} if task_id is None else {"id": task_id}
+        result.update(_status_dict(curve, status))
+        click.echo(json.dumps(result))
+
+
+@click.command(name="calibrate-many")
+@click.option(
+    "-i",
+    "--input",
+    "input_file",
+    type=click.File("r"),
+    default="-",
+    show_default=True,
+    help="JSON Lines file of calibration jobs, one object with"
+    + ' "times" and "values" arrays per line.',
+)
+@click.option(
+    "--nelson-siegel-svensson/--nelson-siegel",
+    default=True,
+    help="whether to calibrate Nelson-Siegel-Svensson (4 factor)"
+    + " or Nelson-Siegel (3 factor) curves. Defaults to"
+    + " the former.",
+)
+@click.option(
+    "--method",
+    type=click.Choice(["ols", "grid", "bounded"]),
+    default="ols",
+    show_default=True,
+    help="Calibration by optimization from initial taus, by grid search or"
+    + " by bounded optimization.",
+)
+@click.option(
+    "--executor",
+    type=click.Choice(["process", "thread", "serial"]),
+    default="process",
+    show_default=True,
+    help="Pool executing the calibration jobs.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of workers, defaults to the number of processors.",
+)
+def cli_calibrate_many(input_file, nelson_siegel_svensson, method, executor, jobs):
+    """Calibrate many curves in parallel.
+
+    Writes one JSON line of curve parameters and optimizer status per job
+    in the order of the input."""
+    times, values = [], []
+    for line in input_file:
+        if line.strip():
+            job = json.loads(line)
+            times.append(np.array(job["times"], dtype=float))
+            values.append(np.array(job["values"], dtype=float))
+    results = calibrate_many(
+        times,
+        values,
+        nelson_siegel_svensson=nelson_siegel_svensson,
+        method=method,
+        executor=executor,
+        max_workers=jobs,
+    )
+    for curve, status in results:
+        click.echo(json.dumps(_status_dict(curve, status)))
+
+
+def _curve_params(decoded):
+    """Parameters of a Nelson-Siegel-Svensson curve (beta0, ..., beta3,
+    tau1, tau2) from a mapping of curve parameters. Nelson-Siegel curves
+    are represented exactly by beta3 = 0 and tau1 = tau2 = tau."""
+    if "beta3" in decoded:
+        names = ["beta0", "beta1", "beta2", "beta3", "tau1", "tau2"]
+        return [float(decoded[n]) for n in names]
+    beta0, beta1, beta2, tau = [
+        float(decoded[n]) for n in ["beta0", "beta1", "beta2", "tau"]
+    ]
+    return [beta0, beta1, beta2, 0.0, tau, tau]
+
+
+def _read_curves(lines, batch_format):
+    """Curves (id, parameters) from JSON Lines (one curve object per
+    line) or CSV (one curve per row, columns named by the curve
+    parameters) with optional "id"."""
+    if batch_format == "csv":
+        reader = csv.DictReader(lines)
+        records = ((reader.line_num, row) for row in reader)
     else:
-        curve, status = calibrate_ns_ols(times, values, initial_tau1)
-    assert status.success
-    click.echo(json.dumps(vars(curve)))
+        records = (
+            (number, line) for number, line in enumerate(lines, start=1) if line.strip()
+        )
+    for number, record in records:
+        try:
+            decoded = record if batch_format == "csv" else json.loads(record)
+            params = _curve_params(decoded)
+        except Exception as e:
+            raise click.ClickException(
+                "invalid curve in line {}: {!r}".format(number, e)
+            ) from e
+        yield decoded.get("id"), params
+
+
+def _npy_header(shape):
+    """Header of a .npy file (format version 1.0) of little-endian
+    doubles of the given shape, padded to `_NPY_HEADER_LENGTH` bytes."""
+    header = "{{'descr': '<f8', 'fortran_order': False, 'shape': {!r}, }}".format(
+        tuple(shape)
+    )
+    header = header.ljust(_NPY_HEADER_LENGTH - 11) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode()
+
+
+def _csv_field(value):
+    """Value as (quoted if necessary) CSV field, empty for None."""
+    text = "" if value is None else str(value)
+    if any(c in text for c in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _write_evaluations(output, output_format, times, chunks):
+    """Write chunks of curve ids and evaluations (one row per curve) to
+    the binary stream output as CSV, NPY or JSON Lines."""
+    n_rows = 0
+    has_id = None
+    if output_format == "npy":
+        if not output.seekable():
+            raise click.UsageError("NPY output requires a seekable output file")
+        start = output.tell()
+        output.write(_npy_header((0, times.size)))
+    for ids, values in chunks:
+        if output_format == "npy":
+            output.write(values.astype("<f8").tobytes())
+        elif output_format == "csv":
+            if has_id is None:
+                has_id = ids[0] is not None
+                labels = ["id"] if has_id else []
+                labels += [repr(t) for t in times.tolist()]
+                output.write((",".join(labels) + "\n").encode())
+            prefixes = [_csv_field(i) + "," for i in ids] if has_id else [""] * len(ids)
+            output.writelines(
+                (prefix + ",".join(map(repr, row.tolist())) + "\n").encode()
+                for prefix, row in zip(prefixes, values)
+            )
+        else:
+            records = (
+                {"values": row.tolist()}
+                if i is None
+                else {"id": i, "values": row.tolist()}
+                for i, row in zip(ids, values)
+            )
+            output.writelines((json.dumps(r) + "\n").encode() for r in records)
+        n_rows += len(ids)
+    if output_format == "npy":
+        end = output.tell()
+        output.seek(start)
+        output.write(_npy_header((n_rows, times.size)))
+        output.seek(end)
+    output.flush()
 
 
 @click.command(name="evaluate")
@@ -98,7 +431,6 @@ def cli_calibrate(times, values, nelson_siegel_svensson, initial_tau1, initial_t
     "-c",
     "--curve",
     type=Curve(),
-    required=True,
     help="Parameters for curve as JSON object.",
 )
 @click.option(
@@ -108,9 +440,76 @@ def cli_calibrate(times, values, nelson_siegel_svensson, initial_tau1, initial_t
     required=True,
     help="Evaluation times as JSON array.",
 )
-def cli_evaluate(curve, times):
-    """Evaluate a curve at given points."""
-    click.echo(json.dumps(curve(times).tolist()))
+@click.option(
+    "-b",
+    "--batch",
+    type=click.File("r"),
+    default=None,
+    help="Batch mode: file ('-' for stdin) of curves in JSON Lines (one curve"
+    + " object per line) or CSV format (one curve per row with columns named"
+    + ' by the parameters), each with an optional "id".',
+)
+@click.option(
+    "--format",
+    "batch_format",
+    type=click.Choice(["jsonl", "csv"]),
+    default=None,
+    help="Format of the batch file, by default inferred from its extension"
+    + " (JSON Lines unless .csv).",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("wb"),
+    default="-",
+    help="Batch mode: output file ('-' for stdout).",
+)
+@click.option(
+    "--output-format",
+    type=click.Choice(["csv", "npy", "jsonl"]),
+    default=None,
+    help="Batch mode: format of the output with one row per curve, by default"
+    + " inferred from the extension of the output file (CSV unless .npy or"
+    + " .jsonl). NPY output requires a seekable file.",
+)
+@click.option(
+    "--chunksize",
+    type=click.IntRange(min=1),
+    default=4096,
+    show_default=True,
+    help="Batch mode: number of curves evaluated at once.",
+)
+def cli_evaluate(curve, times, batch, batch_format, output, output_format, chunksize):
+    """Evaluate a curve at given points.
+
+    In batch mode, curves are streamed from a file or stdin and evaluated
+    in vectorized chunks on the shared evaluation times, writing one row
+    per curve."""
+    if batch is None:
+        if curve is None:
+            raise click.UsageError("--curve is required without --batch")
+        click.echo(json.dumps(curve(times).tolist()))
+        return
+    if batch_format is None:
+        batch_format = "csv" if batch.name.lower().endswith(".csv") else "jsonl"
+    if output_format is None:
+        name = getattr(output, "name", "")
+        name = name.lower() if isinstance(name, str) else ""
+        output_format = next(
+            (f for f in ["npy", "jsonl"] if name.endswith("." + f)), "csv"
+        )
+    curves = _read_curves(batch, batch_format)
+
+    def chunks():
+        while True:
+            chunk = list(islice(curves, chunksize))
+            if not chunk:
+                return
+            ids, params = zip(*chunk)
+            curve_set = NelsonSiegelSvenssonCurveSet(*np.array(params).T)
+            yield ids, curve_set(times)
+
+    _write_evaluations(output, output_format, times, chunks())
 
 
 @click.command(name="plot")
@@ -147,6 +546,8 @@ def cli_evaluate(curve, times):
 )
 def cli_plot(curves, output, from_time, to_time):
     """Plot a curve at given points."""
+    from matplotlib import pyplot as plt
+
     fig, ax = plt.subplots(nrows=1, ncols=1)
     t = np.linspace(from_time, to_time, num=100)
     for curve in curves:
@@ -157,6 +558,7 @@ def cli_plot(curves, output, from_time, to_time):
 
 
 cli_main.add_command(cli_calibrate)
+cli_main.add_command(cli_calibrate_many)
 cli_main.add_command(cli_evaluate)
 cli_main.add_command(cli_plot)
 
@@ -0,0 +1,421 @@
+# -*- coding: utf-8 -*-
+
+"""Dynamic Nelson-Siegel model of Diebold and Li (2006) in the state-space
+form of Diebold, Rudebusch and Aruoba (2006): the factors (beta0, beta1,
+beta2) of a panel of yield curves follow a VAR(1) observed through the
+Nelson-Siegel loadings with independent measurement errors per maturity.
+See `DynamicNelsonSiegel` for filtering, smoothing and forecasting and
+`calibrate_dynamic_ns` for estimating the model from a yield panel.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+from .ns import NelsonSiegelCurve, NelsonSiegelCurveSet
+
+# relative change of predicted state covariances below which the
+# covariance recursion of the Kalman filter is considered in steady state
+_STEADY_STATE_TOL = 1e-12
+
+
+def _loadings(t: np.ndarray, tau: float) -> np.ndarray:
+    """Nelson-Siegel factor loadings of shape (len(t), 3)."""
+    return np.asarray(NelsonSiegelCurve(0.0, 0.0, 0.0, tau).factor_matrix(t))
+
+
+@dataclass
+class KalmanResult:
+    """Filtered or smoothed factors of a panel of yield curves: `means`
+    and `covariances` of the factors (beta0, beta1, beta2) at each date,
+    the one-step-ahead `predicted_means` and `predicted_covariances` of
+    the filter and the Gaussian `loglikelihood` of the panel, for the
+    decay parameter `tau`.
+    """
+
+    tau: float
+    means: np.ndarray
+    covariances: np.ndarray
+    predicted_means: np.ndarray
+    predicted_covariances: np.ndarray
+    loglikelihood: float
+
+    def curves(self) -> NelsonSiegelCurveSet:
+        """Curve set of the Nelson-Siegel curves of the factor means."""
+        means = self.means.T
+        tau = np.full(len(self.means), self.tau)
+        return NelsonSiegelCurveSet(means[0], means[1], means[2], tau)
+
+
+@dataclass
+class DynamicNelsonSiegel:
+    """Dynamic Nelson-Siegel model of yields at maturities t: the factors
+    f = (beta0, beta1, beta2) follow the VAR(1)
+    f[i] - mean = transition @ (f[i - 1] - mean) + eta[i]
+    with eta[i] ~ N(0, state_covariance), and the yields at date i are
+    loadings @ f[i] + epsilon[i] with the Nelson-Siegel loadings of decay
+    parameter tau and independent epsilon[i] ~ N(0, observation_variances)
+    per maturity.
+
+    Panels of yields are matrices of one row per date and one column per
+    maturity, missing quotes are NaN. Filtering and smoothing run a single
+    pass over the dates with memory linear in their number. With diagonal
+    measurement errors, the Kalman update only inverts 3 x 3 matrices
+    (information form), and the covariance recursion, which does not
+    depend on the yields, is skipped once in steady state (as long as the
+    same maturities are quoted), leaving three-dimensional updates of the
+    factor means per date. Residuals and likelihood terms are vectorized
+    over all dates.
+    """
+
+    t: np.ndarray
+    tau: float
+    mean: np.ndarray
+    transition: np.ndarray
+    state_covariance: np.ndarray
+    observation_variances: np.ndarray
+
+    def __post_init__(self) -> None:
+        self.t = np.array(self.t, dtype=float)
+        self.mean = np.array(self.mean, dtype=float)
+        self.transition = np.array(self.transition, dtype=float)
+        self.state_covariance = np.array(self.state_covariance, dtype=float)
+        self.observation_variances = np.array(self.observation_variances, dtype=float)
+        if self.t.ndim != 1 or self.observation_variances.shape != self.t.shape:
+            raise ValueError("Mismatching shapes of maturities and variances")
+        if self.mean.shape != (3,):
+            raise ValueError("mean must be of shape (3,)")
+        if self.transition.shape != (3, 3) or self.state_covariance.shape != (3, 3):
+            raise ValueError("transition and state_covariance must be 3 x 3")
+
+    def loadings(self) -> np.ndarray:
+        """Factor loadings of shape (len(t), 3)."""
+        return _loadings(self.t, self.tau)
+
+    def initial_covariance(self) -> np.ndarray:
+        """Covariance of the factors before the first date: the
+        unconditional covariance of a stationary VAR(1), otherwise a
+        (nearly) diffuse one.
+        """
+        A, Q = self.transition, self.state_covariance
+        if np.max(np.abs(np.linalg.eigvals(A))) < 1:
+            vec = np.linalg.solve(np.eye(9) - np.kron(A, A), Q.ravel())
+            covariance = vec.reshape(3, 3)
+            return (covariance + covariance.T) / 2
+        return np.eye(3) * 1e4 * max(np.trace(Q), 1e-12)
+
+    def _check_panel(self, Y: np.ndarray) -> np.ndarray:
+        Y = np.asarray(Y, dtype=float)
+        if Y.ndim != 2 or Y.shape[1] != self.t.size:
+            raise ValueError("Panel must have one column per maturity")
+        return Y
+
+    def filter(self, Y: np.ndarray) -> KalmanResult:
+        """Kalman filter of the factors of the yield panel Y (one row per
+        date, NaN for missing quotes).
+        Returns the filtered factors in a `KalmanResult`.
+        """
+        Y = self._check_panel(Y)
+        n_dates = Y.shape[0]
+        L = self.loadings()
+        A, Q, mu = self.transition, self.state_covariance, self.mean
+        inv_h = 1 / self.observation_variances
+        observed = np.isfinite(Y)
+        Y0 = np.where(observed, Y, 0.0)
+        # loadings weighted by inverse variances applied to the yields
+        # (zero for missing quotes), for all dates at once
+        weighted_y = (Y0 * inv_h) @ L
+
+        predicted_means = np.empty((n_dates, 3))
+        predicted_covariances = np.empty((n_dates, 3, 3))
+        means = np.empty((n_dates, 3))
+        covariances = np.empty((n_dates, 3, 3))
+        log_det_f = np.zeros(n_dates)
+        x = mu.copy()
+        P = self.initial_covariance()
+        pattern: Optional[np.ndarray] = None
+        steady = False
+        for i in range(n_dates):
+            if i > 0:
+                x = mu + A @ (means[i - 1] - mu)
+            obs = observed[i]
+            same_pattern = pattern is not None and np.array_equal(pattern, obs)
+            if not (steady and same_pattern):
+                if i > 0:
+                    P_prev = P
+                    P = A @ covariances[i - 1] @ A.T + Q
+                    steady = same_pattern and bool(
+                        np.max(np.abs(P - P_prev))
+                        <= _STEADY_STATE_TOL * np.max(np.abs(P))
+                    )
+                pattern = obs
+                L_obs = L[obs]
+                information = L_obs.T @ (L_obs * inv_h[obs, None])
+                P_inv = np.linalg.inv(P)
+                P_post = np.linalg.inv(P_inv + information)
+                P_post = (P_post + P_post.T) / 2
+                log_det = (
+                    np.linalg.slogdet(P)[1] + np.linalg.slogdet(P_inv + information)[1]
+                )
+                log_det -= np.sum(np.log(inv_h[obs]))
+            predicted_means[i] = x
+            predicted_covariances[i] = P
+            # x + P L' F^-1 (y - L x) = P_post (P^-1 x + L' H^-1 y)
+            means[i] = P_post @ (P_inv @ x + weighted_y[i])
+            covariances[i] = P_post
+            log_det_f[i] = log_det
+
+        # prediction errors v and v' F^-1 v = v' H^-1 v - u' P_post u with
+        # u = L' H^-1 v (Woodbury), vectorized over dates
+        v = np.where(observed, Y0 - predicted_means @ L.T, 0.0)
+        u = (v * inv_h) @ L
+        post_u = np.einsum("ijk,ik->ij", covariances, u)
+        quadratic = np.sum(v**2 * inv_h, axis=1) - np.sum(u * post_u, axis=1)
+        n_obs = np.sum(observed, axis=1)
+        loglikelihood = -0.5 * float(
+            np.sum(n_obs * np.log(2 * np.pi) + log_det_f + quadratic)
+        )
+        return KalmanResult(
+            self.tau,
+            means,
+            covariances,
+            predicted_means,
+            predicted_covariances,
+            loglikelihood,
+        )
+
+    def _smooth(self, filtered: KalmanResult) -> Tuple[KalmanResult, np.ndarray]:
+        """Rauch-Tung-Striebel smoother of filtered factors. Returns the
+        smoothed factors and the smoothed covariances of consecutive
+        factors (cov(f[i], f[i - 1]) at i, zero at 0).
+        """
+        A = self.transition
+        n_dates = filtered.means.shape[0]
+        means = filtered.means.copy()
+        covariances = filtered.covariances.copy()
+        lag_covariances = np.zeros_like(covariances)
+        gain = np.empty((3, 3))
+        for i in range(n_dates - 2, -1, -1):
+            # gains are constant while the filter is in steady state
+            if i == n_dates - 2 or not (
+                np.array_equal(
+                    filtered.predicted_covariances[i + 1],
+                    filtered.predicted_covariances[i + 2],
+                )
+                and np.array_equal(filtered.covariances[i], filtered.covariances[i + 1])
+            ):
+                gain = np.linalg.solve(
+                    filtered.predicted_covariances[i + 1],
+                    A @ filtered.covariances[i],
+                ).T
+            means[i] += gain @ (means[i + 1] - filtered.predicted_means[i + 1])
+            covariances[i] += (
+                gain
+                @ (covariances[i + 1] - filtered.predicted_covariances[i + 1])
+                @ gain.T
+            )
+            lag_covariances[i + 1] = covariances[i + 1] @ gain.T
+        smoothed = KalmanResult(
+            filtered.tau,
+            means,
+            covariances,
+            filtered.predicted_means,
+            filtered.predicted_covariances,
+            filtered.loglikelihood,
+        )
+        return smoothed, lag_covariances
+
+    def smooth(self, Y: np.ndarray) -> KalmanResult:
+        """Kalman smoother of the factors of the yield panel Y (one row per
+        date, NaN for missing quotes), i.e. their distribution given all
+        dates. Returns the smoothed factors in a `KalmanResult` (holding
+        the predictions and log-likelihood of the filter).
+        """
+        return self._smooth(self.filter(Y))[0]
+
+    def loglikelihood(self, Y: np.ndarray) -> float:
+        """Gaussian log-likelihood of the yield panel Y."""
+        return self.filter(Y).loglikelihood
+
+    def forecast(
+        self, Y: np.ndarray, horizon: int = 1
+    ) -> Tuple[NelsonSiegelCurveSet, np.ndarray]:
+        """Forecast the curves of the next horizon dates after the yield
+        panel Y (one row per date, NaN for missing quotes).
+        Returns the curve set of the expected curves (one per date ahead)
+        and the covariances of the factors (of shape (horizon, 3, 3)).
+        """
+        filtered = self.filter(Y)
+        A, Q, mu = self.transition, self.state_covariance, self.mean
+        x = filtered.means[-1] if len(filtered.means) else mu
+        P = filtered.covariances[-1] if len(filtered.means) else None
+        means = np.empty((horizon, 3))
+        covariances = np.empty((horizon, 3, 3))
+        for h in range(horizon):
+            x = mu + A @ (x - mu)
+            P = self.initial_covariance() if P is None else A @ P @ A.T + Q
+            means[h], covariances[h] = x, P
+        tau = np.full(horizon, self.tau)
+        curves = NelsonSiegelCurveSet(means[:, 0], means[:, 1], means[:, 2], tau)
+        return curves, covariances
+
+
+def _panel_betas(L: np.ndarray, Y: np.ndarray) -> np.ndarray:
+    """OLS factors of each date of the yield panel Y given loadings L
+    (NaN for dates with fewer than three quotes).
+    """
+    observed = np.isfinite(Y)
+    complete = observed.all(axis=1)
+    betas = np.full((Y.shape[0], 3), np.nan)
+    betas[complete] = Y[complete] @ np.linalg.pinv(L).T
+    for i in np.flatnonzero(~complete & (observed.sum(axis=1) >= 3)):
+        obs = observed[i]
+        betas[i] = np.linalg.lstsq(L[obs], Y[i, obs], rcond=None)[0]
+    return betas
+
+
+def _variance_floor(variances: np.ndarray) -> np.ndarray:
+    """Variances kept positive (for exactly fitted maturities)."""
+    floor = 1e-8 * np.mean(variances) if np.mean(variances) > 0 else 1e-16
+    return np.maximum(variances, floor)
+
+
+def _two_step(t: np.ndarray, Y: np.ndarray, tau: float) -> DynamicNelsonSiegel:
+    """Two-step estimates of Diebold and Li (2006): OLS factors per date
+    and a VAR(1) fitted to them, with measurement variances of the OLS
+    residuals per maturity.
+    """
+    L = _loadings(t, tau)
+    betas = _panel_betas(L, Y)
+    pairs = np.isfinite(betas[1:]).all(axis=1) & np.isfinite(betas[:-1]).all(axis=1)
+    if pairs.sum() < 5:
+        raise ValueError("Too few dates with at least three quotes")
+    regressors = np.column_stack([np.ones(pairs.sum()), betas[:-1][pairs]])
+    coefficients = np.linalg.lstsq(regressors, betas[1:][pairs], rcond=None)[0]
+    intercept, transition = coefficients[0], coefficients[1:].T
+    innovations = betas[1:][pairs] - regressors @ coefficients
+    state_covariance = innovations.T @ innovations / pairs.sum()
+    mean = np.linalg.lstsq(np.eye(3) - transition, intercept, rcond=None)[0]
+    residuals = Y - betas @ L.T
+    variances = np.nanmean(residuals**2, axis=0)
+    return DynamicNelsonSiegel(
+        t,
+        tau,
+        mean,
+        transition,
+        state_covariance + 1e-12 * np.eye(3) * np.trace(state_covariance),
+        _variance_floor(np.nan_to_num(variances, nan=float(np.nanmean(variances)))),
+    )
+
+
+def _em_step(
+    model: DynamicNelsonSiegel, Y: np.ndarray
+) -> Tuple[DynamicNelsonSiegel, float]:
+    """One expectation-maximization step of the parameters of model (at
+    fixed tau). Returns the new model and the log-likelihood of the old.
+    """
+    L = model.loadings()
+    smoothed, lag_covariances = model._smooth(model.filter(Y))
+    s, P = smoothed.means, smoothed.covariances
+    second = P + s[:, :, None] * s[:, None, :]
+    n = s.shape[0] - 1
+    s1, s0 = s[1:].sum(axis=0), s[:-1].sum(axis=0)
+    cross = lag_covariances[1:].sum(axis=0) + s[1:].T @ s[:-1]
+    moments = np.empty((4, 4))
+    moments[0, 0], moments[0, 1:], moments[1:, 0] = n, s0, s0
+    moments[1:, 1:] = second[:-1].sum(axis=0)
+    rhs = np.column_stack([s1, cross])
+    coefficients = np.linalg.solve(moments, rhs.T).T
+    intercept, transition = coefficients[:, 0], coefficients[:, 1:]
+    state_covariance = (second[1:].sum(axis=0) - coefficients @ rhs.T) / n
+    state_covariance = (state_covariance + state_covariance.T) / 2
+    mean = np.linalg.lstsq(np.eye(3) - transition, intercept, rcond=None)[0]
+    observed = np.isfinite(Y)
+    residuals = np.where(observed, Y - s @ L.T, 0.0)
+    uncertainty = np.einsum("mj,ijk,mk->im", L, P, L)
+    variances = np.sum(
+        np.where(observed, residuals**2 + uncertainty, 0.0), axis=0
+    ) / np.maximum(observed.sum(axis=0), 1)
+    new_model = DynamicNelsonSiegel(
+        model.t,
+        model.tau,
+        mean,
+        transition,
+        state_covariance,
+        _variance_floor(variances),
+    )
+    return new_model, smoothed.loglikelihood
+
+
+def calibrate_dynamic_ns(
+    t: np.ndarray,
+    Y: np.ndarray,
+    tau: Optional[float] = None,
+    tau_bounds: Tuple[float, float] = (0.1, 30.0),
+    max_iter: int = 200,
+    tol: float = 1e-8,
+) -> Tuple[DynamicNelsonSiegel, Any]:
+    """Estimate a `DynamicNelsonSiegel` model of the yield panel Y (one
+    row per date, one column per maturity t, NaN for missing quotes) by
+    maximum likelihood.
+
+    Starting from the two-step estimates of Diebold and Li (2006) (OLS
+    factors per date and a VAR(1) fitted to them), the parameters are
+    improved by at most max_iter expectation-maximization steps (each a
+    Kalman filter and smoother pass) until the log-likelihood increases
+    by less than tol relative to its magnitude. tau is kept fixed if
+    given, otherwise chosen within tau_bounds to maximize the likelihood
+    of the two-step estimates by bounded scalar optimization.
+    Returns the model and an `OptimizeResult` holding tau in `x`, the
+    `loglikelihood`, the number of EM steps `nit`, `success` (converged)
+    and the number of likelihood evaluations of the search of tau
+    `tau_nfev`.
+    """
+    from scipy.optimize import OptimizeResult, minimize_scalar
+
+    t = np.asarray(t, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    assert (
+        t.ndim == 1 and Y.ndim == 2 and Y.shape[1] == t.size
+    ), "Mismatching shapes of maturities and panel"
+    tau_nfev = 0
+    if tau is None:
+
+        def negative_loglikelihood(log_tau: float) -> float:
+            try:
+                model = _two_step(t, Y, float(np.exp(log_tau)))
+                return -model.loglikelihood(Y)
+            except np.linalg.LinAlgError:
+                return np.inf
+
+        tau_res = minimize_scalar(
+            negative_loglikelihood,
+            bounds=np.log(tau_bounds),
+            method="bounded",
+            options={"xatol": 1e-4},
+        )
+        tau = float(np.exp(tau_res.x))
+        tau_nfev = int(tau_res.nfev)
+    model = _two_step(t, Y, tau)
+    loglikelihood = -np.inf
+    converged = False
+    nit = 0
+    while nit < max_iter:
+        new_model, current = _em_step(model, Y)
+        if current - loglikelihood <= tol * abs(current):
+            # model holds the parameters of likelihood current
+            loglikelihood, converged = current, True
+            break
+        model, loglikelihood = new_model, current
+        nit += 1
+    else:
+        loglikelihood = model.loglikelihood(Y)
+    opt_res = OptimizeResult(
+        x=np.array([tau]),
+        loglikelihood=loglikelihood,
+        nit=nit,
+        success=converged,
+        tau_nfev=tau_nfev,
+    )
+    return model, opt_res
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+"""Incremental recalibration of a single curve to streaming quote updates.
+See `IncrementalCalibrator` for details.
+"""
+
+from typing import Any, Optional, Tuple, Union
+
+import numpy as np
+from numpy.linalg import lstsq
+
+from .calibrate import CalibrationContext
+from .nss import NelsonSiegelSvenssonCurve
+
+
+class IncrementalCalibrator:
+    """Stateful calibrator keeping a curve fitted to a set of quotes
+    (maturities t and values y) up to date while individual quotes change.
+
+    The initial fit searches the whole tau grid and refines from its best
+    local minima (see `CalibrationContext.calibrate`), as does
+    `recalibrate`.
+    On every update, the previous taus serve as warm start: if a
+    Gauss-Newton step in tau (using the analytic Jacobian of the OLS
+    residuals) is smaller than xtol relative to tau or is predicted to
+    reduce the sum of squared errors by less than the fraction ftol, the
+    taus are still optimal within tolerance and only the betas are
+    re-solved. Otherwise,
+    damped Gauss-Newton iterations (at most maxiter, within the range of
+    the tau grid) continue from the previous taus. Factor matrices and
+    their pseudo-inverses are cached by the underlying context, which is
+    rebuilt only when new maturities are added.
+    """
+
+    def __init__(
+        self,
+        t: np.ndarray,
+        y: np.ndarray,
+        curve_type: type = NelsonSiegelSvenssonCurve,
+        tau_grid: Optional[np.ndarray] = None,
+        xtol: float = 1e-6,
+        ftol: float = 1e-4,
+        maxiter: int = 20,
+        maxsize: int = 256,
+    ) -> None:
+        t = np.array(t, dtype=float)
+        y = np.array(y, dtype=float)
+        assert (
+            t.ndim == 1 and t.shape == y.shape
+        ), "Mismatching shapes of time and values"
+        self.curve_type = curve_type
+        self.tau_grid = tau_grid
+        self.xtol = xtol
+        self.ftol = ftol
+        self.maxiter = maxiter
+        self.maxsize = maxsize
+        self.t = t
+        self.y = y
+        self._context = self._new_context()
+        self.curve, self.opt_res = self.recalibrate()
+
+    def _new_context(self) -> CalibrationContext:
+        return CalibrationContext(
+            self.t, self.curve_type, tau_grid=self.tau_grid, maxsize=self.maxsize
+        )
+
+    @property
+    def tau(self) -> np.ndarray:
+        """Taus of the currently fitted curve."""
+        return np.asarray(self.opt_res.x, dtype=float)
+
+    def recalibrate(self) -> Tuple[Any, Any]:
+        """Calibrate from scratch (grid search and local refinement) to the
+        current quotes, discarding the warm start.
+        Returns the curve and an `OptimizeResult`.
+        """
+        self.curve, self.opt_res = self._context.calibrate(self.y)
+        self.opt_res.warm_start = False
+        self.opt_res.betas_only = False
+        return self.curve, self.opt_res
+
+    def update(
+        self, t: Union[float, np.ndarray], y: Union[float, np.ndarray]
+    ) -> Tuple[Any, Any]:
+        """Set the value(s) y at maturity (maturities) t, adding maturities
+        not quoted so far, and refit the curve starting from the previous
+        taus. Returns the curve and an `OptimizeResult` (with half the sum
+        of squared errors in `cost` and flags `warm_start` and `betas_only`).
+        """
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        assert t.shape == y.shape, "Mismatching shapes of time and values"
+        added = False
+        for t_i, y_i in zip(t.tolist(), y.tolist()):
+            idx = np.flatnonzero(self.t == t_i)
+            if idx.size > 0:
+                self.y[idx] = y_i
+            else:
+                self.t = np.append(self.t, t_i)
+                self.y = np.append(self.y, y_i)
+                added = True
+        if added:
+            self._context = self._new_context()
+        return self._resolve()
+
+    def _resolve(self) -> Tuple[Any, Any]:
+        """Damped Gauss-Newton iterations in tau starting at the previous
+        taus, keeping betas optimal by ordinary least squares.
+        """
+        from scipy.optimize import OptimizeResult
+
+        context, y = self._context, self.y
+        lower, upper = context.tau_values[0], context.tau_values[-1]
+        tau = self.tau.ravel()
+        residuals = context.residuals(tau, y)
+        sse = float(residuals @ residuals)
+        nfev, nit, converged = 1, 0, False
+        while nit < self.maxiter:
+            jac = context.jacobian(tau, y)
+            step = lstsq(jac, -residuals, rcond=None)[0]
+            predicted = residuals + jac @ step
+            reduction = sse - float(predicted @ predicted)
+            if np.max(np.abs(step) / tau) <= self.xtol or reduction <= self.ftol * sse:
+                converged = True
+                break
+            nit += 1
+            improved = False
+            for _ in range(10):
+                tau_trial = np.clip(tau + step, lower, upper)
+                residuals_trial = context.residuals(tau_trial, y)
+                sse_trial = float(residuals_trial @ residuals_trial)
+                nfev += 1
+                if sse_trial < sse:
+                    improved = True
+                    break
+                step /= 2
+            if not improved:
+                # no descent along the Gauss-Newton direction (e.g. at a bound)
+                converged = True
+                break
+            tau, residuals, sse = tau_trial, residuals_trial, sse_trial
+        self.curve = context.betas(tau, y)
+        self.opt_res = OptimizeResult(
+            x=tau,
+            cost=sse / 2,
+            success=converged,
+            nit=nit,
+            nfev=nfev,
+            warm_start=True,
+            betas_only=nit == 0,
+        )
+        return self.curve, self.opt_res
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""Opt-in instrumentation of calibrations. Calibrations by
+`calibrate.calibrate_ns_ols` and `calibrate.calibrate_nss_ols` report a
+`CalibrationTrace` (timings, evaluation counts, the path of the taus and
+condition numbers of the factor matrix) to the callback passed to them and
+to all hooks registered by `add_calibration_hook`. `StatsCollector`
+aggregates traces of many calibrations into statistics that can be dumped
+as JSON. Without callback and hooks, calibrations are not instrumented.
+"""
+
+import json
+import math
+from dataclasses import asdict, dataclass, field
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+_HOOKS: List[Callable[["CalibrationTrace"], None]] = []
+
+# timings of traces aggregated by StatsCollector
+_TIMINGS = ("seconds", "seconds_factors", "seconds_lstsq", "seconds_optimizer")
+
+
+@dataclass
+class CalibrationTrace:
+    """Record of a single instrumented calibration by function (the name
+    of the calibration function) of n_points time-value pairs.
+    Timings are in seconds: `seconds_factors` is spent constructing
+    factor matrices (and their derivatives), `seconds_lstsq` solving for
+    the betas and `seconds_optimizer` in the optimizer itself (the rest
+    of the total `seconds`). `nfev` counts evaluations of the objective
+    (each including its gradient) and `tau_path` holds the taus after each
+    of the `nit` iterations, starting with `tau0`. `condition_number` is
+    the (2-norm) condition number of the factor matrix at the final taus,
+    `max_condition_number` the largest of all evaluations.
+    """
+
+    function: str
+    n_points: int
+    tau0: List[float]
+    tau_path: List[List[float]] = field(default_factory=list)
+    nfev: int = 0
+    nit: int = 0
+    success: bool = False
+    seconds: float = 0.0
+    seconds_factors: float = 0.0
+    seconds_lstsq: float = 0.0
+    seconds_optimizer: float = 0.0
+    condition_number: float = math.nan
+    max_condition_number: float = math.nan
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Trace as dictionary (e.g. for JSON serialization)."""
+        return asdict(self)
+
+
+def add_calibration_hook(hook: Callable[[CalibrationTrace], None]) -> None:
+    """Register hook to be called with the trace of every calibration
+    (in the calibrating thread) until removed by `remove_calibration_hook`.
+    """
+    _HOOKS.append(hook)
+
+
+def remove_calibration_hook(hook: Callable[[CalibrationTrace], None]) -> None:
+    """Unregister a hook registered by `add_calibration_hook`."""
+    _HOOKS.remove(hook)
+
+
+def _instrumented(callback: Optional[Callable[[CalibrationTrace], None]]) -> bool:
+    """Whether a calibration with callback is to be instrumented."""
+    return callback is not None or bool(_HOOKS)
+
+
+def _report(
+    trace: CalibrationTrace, callback: Optional[Callable[[CalibrationTrace], None]]
+) -> None:
+    """Pass trace to callback (if given) and all registered hooks."""
+    if callback is not None:
+        callback(trace)
+    for hook in list(_HOOKS):
+        hook(trace)
+
+
+class StatsCollector:
+    """Aggregates traces of calibrations (per calibration function) into
+    counts, failures, sums, means and maxima of timings, evaluation and
+    iteration counts and condition numbers, keeping the traces of the
+    n_slowest slowest calibrations. Instances are hooks (callables taking
+    a trace) and can be used as context managers registering themselves
+    by `add_calibration_hook` while active. Thread-safe.
+    """
+
+    def __init__(self, n_slowest: int = 10) -> None:
+        self.n_slowest = n_slowest
+        self._lock = Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._slowest: List[CalibrationTrace] = []
+
+    def __call__(self, trace: CalibrationTrace) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                trace.function,
+                {
+                    "count": 0,
+                    "failures": 0,
+                    "nfev": 0,
+                    "max_nfev": 0,
+                    "nit": 0,
+                    "max_nit": 0,
+                    "max_condition_number": 0.0,
+                    **{name: 0.0 for name in _TIMINGS},
+                    **{f"max_{name}": 0.0 for name in _TIMINGS},
+                },
+            )
+            stats["count"] += 1
+            stats["failures"] += not trace.success
+            for name in ("nfev", "nit") + _TIMINGS:
+                value = getattr(trace, name)
+                stats[name] += value
+                stats[f"max_{name}"] = max(stats[f"max_{name}"], value)
+            if not math.isnan(trace.max_condition_number):
+                stats["max_condition_number"] = max(
+                    stats["max_condition_number"], trace.max_condition_number
+                )
+            if self.n_slowest > 0:
+                self._slowest.append(trace)
+                self._slowest.sort(key=lambda t: t.seconds, reverse=True)
+                if len(self._slowest) > self.n_slowest:
+                    self._slowest.pop()
+
+    def __enter__(self) -> "StatsCollector":
+        add_calibration_hook(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        remove_calibration_hook(self)
+
+    def clear(self) -> None:
+        """Discard all collected statistics."""
+        with self._lock:
+            self._stats.clear()
+            self._slowest.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Statistics per calibration function (including means of the
+        summed values) and the traces of the slowest calibrations.
+        """
+        with self._lock:
+            functions = {}
+            for function, stats in self._stats.items():
+                stats = dict(stats)
+                for name in ("nfev", "nit") + _TIMINGS:
+                    stats[f"mean_{name}"] = stats[name] / stats["count"]
+                functions[function] = stats
+            slowest = [trace.to_dict() for trace in self._slowest]
+        return {"functions": functions, "slowest": slowest}
+
+    def dump(self, fp: TextIO, **kwargs: Any) -> None:
+        """Write the statistics of `to_dict` as JSON to the text file fp,
+        passing kwargs (e.g. indent) to `json.dump`.
+        """
+        json.dump(self.to_dict(), fp, **kwargs)
@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 
 """Implementation of a Nelson-Siegel interest rate curve model.
-See `NelsonSiegelCurve` class for details.
+See `NelsonSiegelCurve` class for details and `NelsonSiegelCurveSet`
+for the vectorized evaluation of many curves at once.
 """
 
+import math
 from numbers import Real
-from dataclasses import dataclass
-from typing import Union, Tuple
+from dataclasses import dataclass, fields
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from numpy import exp
@@ -14,11 +16,196 @@ from numpy import exp
 EPS = np.finfo(float).eps
 
 
+def _reciprocal(tau: Any) -> Optional[float]:
+    """1/tau as float for scalar, non-zero tau, else None (no fast path).
+    Concrete float and int are checked first, being far cheaper than the
+    `numbers.Real` check.
+    """
+    if (isinstance(tau, (float, int)) or isinstance(tau, Real)) and tau != 0:
+        return 1.0 / float(tau)
+    return None
+
+
+def _factors_kernel(
+    T: np.ndarray, tau: Any, factor1: np.ndarray, factor2: np.ndarray
+) -> None:
+    """Nelson-Siegel factor loadings for times T written into the arrays
+    factor1 and factor2 (of the shape of T, or with leading axes for an
+    array of tau broadcast against T) without modifying T. The output
+    arrays double as workspace, so no temporary arrays are allocated unless
+    T contains times T <= 0 (for which the loadings are those at 0).
+    """
+    np.divide(T, tau, out=factor1)  # T / tau
+    has_zeros = T.size > 0 and T.min() <= 0
+    if has_zeros:
+        zero_idx = T <= 0
+        np.copyto(factor1, EPS, where=zero_idx)  # avoid warnings in calculations
+    np.negative(factor1, out=factor2)
+    np.expm1(factor2, out=factor2)
+    np.negative(factor2, out=factor2)  # 1 - exp(-T / tau)
+    np.divide(factor2, factor1, out=factor1)
+    np.add(factor2, factor1, out=factor2)
+    np.subtract(factor2, 1.0, out=factor2)  # factor1 - exp(-T / tau)
+    if has_zeros:
+        np.copyto(factor1, 1.0, where=zero_idx)
+        np.copyto(factor2, 0.0, where=zero_idx)
+
+
+def _zero_sensitivity_kernel(
+    T: np.ndarray,
+    tau: Any,
+    beta1: Any,
+    beta2: Any,
+    factor1: np.ndarray,
+    factor2: np.ndarray,
+    dtau: np.ndarray,
+) -> None:
+    """Nelson-Siegel zero rate loadings for times T written into factor1
+    and factor2 and the derivative of beta1 * factor1 + beta2 * factor2
+    with respect to tau into dtau (all of the shape of T broadcast against
+    tau and the betas). All values are obtained from a single exponential
+    in the output arrays without temporaries of that size but one
+    (loadings of times T <= 0 are those at 0).
+    """
+    np.divide(T, tau, out=dtau)  # T / tau
+    has_zeros = T.size > 0 and T.min() <= 0
+    if has_zeros:
+        zero_idx = T <= 0
+        np.copyto(dtau, EPS, where=zero_idx)  # avoid warnings in calculations
+    np.negative(dtau, out=factor2)
+    np.expm1(factor2, out=factor2)  # exp(-T / tau) - 1
+    np.divide(factor2, dtau, out=factor1)
+    np.negative(factor1, out=factor1)
+    factor2 += 1.0  # exp(-T / tau)
+    # d/dtau: ((beta1 + beta2) * factor2 - beta2 * T / tau * exp(-T / tau)) / tau
+    dtau *= factor2
+    np.multiply(dtau, -beta2, out=dtau)
+    np.subtract(factor1, factor2, out=factor2)
+    dtau += (beta1 + beta2) * factor2
+    dtau /= tau
+    if has_zeros:
+        np.copyto(factor1, 1.0, where=zero_idx)
+        np.copyto(factor2, 0.0, where=zero_idx)
+        np.copyto(dtau, 0.0, where=zero_idx)
+
+
+def _forward_sensitivity_kernel(
+    T: np.ndarray,
+    tau: Any,
+    beta1: Any,
+    beta2: Any,
+    factor1: np.ndarray,
+    factor2: np.ndarray,
+    dtau: np.ndarray,
+) -> None:
+    """Nelson-Siegel forward rate loadings exp(-T / tau) and
+    T / tau * exp(-T / tau) for times T written into factor1 and factor2
+    and the derivative of beta1 * factor1 + beta2 * factor2 with respect
+    to tau into dtau, all obtained from a single exponential in the output
+    arrays.
+    """
+    np.divide(T, tau, out=dtau)  # T / tau
+    np.negative(dtau, out=factor1)
+    np.exp(factor1, out=factor1)
+    np.multiply(dtau, factor1, out=factor2)
+    # d/dtau: factor2 / tau * (beta1 + beta2 * (T / tau - 1))
+    np.multiply(dtau, beta2, out=dtau)
+    dtau += beta1 - beta2
+    dtau *= factor2
+    dtau /= tau
+
+
+def _forward_integral_kernel(
+    T1: np.ndarray, T2: np.ndarray, tau: Any
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Integrals of the forward rate loadings exp(-s / tau) and
+    s / tau * exp(-s / tau) over s from T1 to T2 (broadcast against tau).
+    Differences of exponentials are expressed by exp(-T1 / tau) and expm1
+    of the interval length, so that short intervals lose no precision.
+    """
+    length = T2 - T1
+    exp_t1 = exp(-T1 / tau)
+    decay = -np.expm1(-length / tau)  # 1 - exp(-(T2 - T1) / tau)
+    return tau * exp_t1 * decay, exp_t1 * ((tau + T2) * decay - length)
+
+
+def _average_forward(
+    integral: np.ndarray,
+    T1: np.ndarray,
+    T2: np.ndarray,
+    forward: Callable[[np.ndarray], Any],
+    compounding: str,
+) -> np.ndarray:
+    """Forward rates between T1 and T2 (continuously or simply compounded)
+    from the integrals of the instantaneous forward rate over [T1, T2],
+    i.e. the instantaneous forward rate at T1 for intervals of length 0.
+    """
+    assert compounding in (
+        "continuous",
+        "simple",
+    ), "compounding must be 'continuous' or 'simple'"
+    length = T2 - T1
+    empty = length == 0
+    safe_length = np.where(empty, 1.0, length)
+    if compounding == "continuous":
+        rate = integral / safe_length
+    else:
+        rate = np.expm1(integral) / safe_length
+    if np.any(empty):
+        rate = np.where(empty, forward(T1), rate)
+    return rate
+
+
+def _payment_schedule(
+    T: Union[float, np.ndarray], frequency: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Payment times and accrual fractions of instruments maturing at
+    time(s) T with frequency payments per year, stacked along a new last
+    axis (latest payment first). Schedules are rolled back from maturity,
+    so the first period is a short stub unless T is a multiple of the
+    period. Shorter schedules are padded with times <= 0 of accrual 0.
+    """
+    assert frequency > 0, "Payment frequency must be positive"
+    T = np.asarray(T, dtype=float)
+    period = 1.0 / frequency
+    n = int(np.ceil(T.max() * frequency - 1e-9)) if T.size > 0 else 0
+    times = T[..., None] - period * np.arange(max(n, 1))
+    return times, np.clip(times, 0.0, period)
+
+
+def _annuity_par_rate(
+    zero: Callable[[np.ndarray], Any], T: Union[float, np.ndarray], frequency: float
+) -> Tuple[Any, Any]:
+    """Annuity factor(s) and par rate(s) for maturities T from a single
+    evaluation of the zero curve at all payment times. At maturity 0 the
+    par rate is its limit, the short rate zero(0).
+    """
+    if np.any(np.asarray(T) < 0):
+        raise ValueError("Maturities must be non-negative")
+    times, accruals = _payment_schedule(T, frequency)
+    rates = zero(times)
+    discounts = np.exp(-rates * times)
+    annuity = np.einsum("...i,...i->...", accruals, discounts)
+    # 1 - discount(T) by expm1, precise for short maturities
+    par_rate = np.divide(
+        -np.expm1(-rates[..., 0] * times[..., 0]),
+        annuity,
+        out=rates[..., 0].copy(),
+        where=annuity > 0,
+    )
+    if np.ndim(T) == 0:
+        return float(annuity), float(par_rate)
+    return annuity, par_rate
+
+
 @dataclass
 class NelsonSiegelCurve:
     """Implementation of a Nelson-Siegel interest rate curve model.
     This curve can be interpreted as a factor model with three
     factors (including a constant).
+    Zero rates, forward rates and discount factors for a single (float)
+    time are evaluated by a scalar path using `math` and the reciprocal
+    of tau.
     """
 
     beta0: float
@@ -27,36 +214,99 @@ class NelsonSiegelCurve:
     tau: float
 
     def factors(
-        self, T: Union[float, np.ndarray]
+        self,
+        T: Union[float, np.ndarray],
+        out: Optional[Tuple[np.ndarray, np.ndarray]] = None,
     ) -> Union[Tuple[float, float], Tuple[np.ndarray, np.ndarray]]:
-        """Factor loadings for time(s) T, excluding constant."""
+        """Factor loadings for time(s) T, excluding constant.
+        T is never modified. For array-valued T, the loadings are written
+        into the arrays of out (of the shape of T) if given.
+        """
+        if out is None and not isinstance(T, np.ndarray):
+            if isinstance(T, Real) and T <= 0:
+                return 1, 0
+            exp_tt0 = exp(-T / self.tau)
+            factor1 = (1 - exp_tt0) / (T / self.tau)
+            return factor1, factor1 - exp_tt0
+        T = np.asarray(T, dtype=float)
+        if out is None:
+            out = np.empty_like(T), np.empty_like(T)
+        _factors_kernel(T, self.tau, *out)
+        return out
+
+    def factor_matrix(
+        self, T: Union[float, np.ndarray], out: Optional[np.ndarray] = None
+    ) -> Union[float, np.ndarray]:
+        """Factor loadings for time(s) T as matrix columns,
+        including constant column (=1.0). For array-valued T, the
+        matrix is C-contiguous of shape T.shape + (3,) and is written
+        into out if given.
+        """
+        if out is None and not isinstance(T, np.ndarray):
+            factor1, factor2 = self.factors(T)
+            return np.array([1.0, factor1, factor2])
+        T = np.asarray(T, dtype=float)
+        if out is None:
+            out = np.empty(T.shape + (3,))
+        out[..., 0] = 1.0
+        _factors_kernel(T, self.tau, out[..., 1], out[..., 2])
+        return out
+
+    def factor_derivatives(
+        self, T: Union[float, np.ndarray]
+    ) -> Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
+        """Derivatives of the factor loadings for time(s) T with respect
+        to tau, excluding constant.
+        """
         tau = self.tau
-        if isinstance(T, Real) and T <= 0:
-            return 1, 0
-        elif isinstance(T, np.ndarray):
-            zero_idx = T <= 0
-            T[zero_idx] = EPS  # avoid warnings in calculations
-        exp_tt0 = exp(-T / tau)
-        factor1 = (1 - exp_tt0) / (T / tau)
-        factor2 = factor1 - exp_tt0
         if isinstance(T, np.ndarray):
-            T[zero_idx] = 0
-            factor1[zero_idx] = 1
-            factor2[zero_idx] = 0
-        return factor1, factor2
+            factor1 = np.empty(T.shape)
+            factor2 = np.empty(T.shape)
+            _factors_kernel(T, tau, factor1, factor2)
+            T_tau = np.maximum(T, 0.0) / tau
+            dfactor2 = factor2 - T_tau * exp(-T_tau)
+            return np.divide(factor2, tau, out=factor1), np.divide(
+                dfactor2, tau, out=dfactor2
+            )
+        if isinstance(T, Real) and T <= 0:
+            return 0, 0
+        _, f2 = self.factors(T)
+        x = T / tau
+        return f2 / tau, (f2 - x * exp(-x)) / tau
 
-    def factor_matrix(self, T: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
-        """Factor loadings for time(s) T as matrix columns,
-        including constant column (=1.0).
+    def factor_matrix_derivatives(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Derivatives of the factor matrix for time(s) T with respect
+        to tau, stacked along the first axis (of length 1).
         """
-        factor1, factor2 = self.factors(T)
-        constant: Union[float, np.ndarray] = (
-            np.ones(T.size) if isinstance(T, np.ndarray) else 1
+        dfactor1, dfactor2 = self.factor_derivatives(T)
+        zero = np.zeros_like(dfactor1, dtype=float)
+        return np.stack([zero, dfactor1, dfactor2], axis=-1)[None]
+
+    def _zero_scalar(self, T: float, inv_tau: float) -> float:
+        """Zero rate at a single time T given 1/tau."""
+        if T <= 0:
+            return self.beta0 + self.beta1
+        T_tau = T * inv_tau
+        # 1 - exp(-T / tau) by expm1 as in `_factors_kernel`
+        one_minus_exp = -math.expm1(-T_tau)
+        factor1 = one_minus_exp / T_tau
+        return (
+            self.beta0
+            + self.beta1 * factor1
+            + self.beta2 * (one_minus_exp + factor1 - 1.0)
         )
-        return np.stack([constant, factor1, factor2]).transpose()
+
+    def _forward_scalar(self, T: float, inv_tau: float) -> float:
+        """Instantaneous forward rate at a single time T given 1/tau."""
+        T_tau = T * inv_tau
+        return self.beta0 + (self.beta1 + self.beta2 * T_tau) * math.exp(-T_tau)
 
     def zero(self, T: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """Zero rate(s) of this curve at time(s) T."""
+        if isinstance(T, (float, int)):
+            inv_tau = _reciprocal(self.tau)
+            if inv_tau is not None:
+                return self._zero_scalar(T, inv_tau)
         factor1, factor2 = self.factors(T)
         return self.beta0 + self.beta1 * factor1 + self.beta2 * factor2
 
@@ -66,5 +316,296 @@ class NelsonSiegelCurve:
 
     def forward(self, T: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """Instantaneous forward rate(s) of this curve at time(s) T."""
+        if isinstance(T, (float, int)):
+            inv_tau = _reciprocal(self.tau)
+            if inv_tau is not None:
+                return self._forward_scalar(T, inv_tau)
         exp_tt0 = exp(-T / self.tau)
         return self.beta0 + self.beta1 * exp_tt0 + self.beta2 * exp_tt0 * T / self.tau
+
+    def _jacobian(
+        self, kernel: Callable[..., None], T: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """Jacobian of rates at time(s) T with loadings and their tau
+        derivatives written into its columns by kernel.
+        """
+        T = np.asarray(T, dtype=float)
+        jacobian = np.empty(T.shape + (4,))
+        jacobian[..., 0] = 1.0
+        kernel(
+            T,
+            self.tau,
+            self.beta1,
+            self.beta2,
+            jacobian[..., 1],
+            jacobian[..., 2],
+            jacobian[..., 3],
+        )
+        return jacobian
+
+    def zero_jacobian(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Jacobian of the zero rate(s) at time(s) T with respect to the
+        parameters (beta0, beta1, beta2, tau), of shape T.shape + (4,).
+        Evaluated analytically in a single pass.
+        """
+        return self._jacobian(_zero_sensitivity_kernel, T)
+
+    def forward_jacobian(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Jacobian of the instantaneous forward rate(s) at time(s) T with
+        respect to the parameters (beta0, beta1, beta2, tau), of shape
+        T.shape + (4,). Evaluated analytically in a single pass.
+        """
+        return self._jacobian(_forward_sensitivity_kernel, T)
+
+    def forward_integral(
+        self, T1: Union[float, np.ndarray], T2: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """Integral(s) of the instantaneous forward rate of this curve
+        from T1 to T2 (broadcast against each other), i.e.
+        zero(T2) * T2 - zero(T1) * T1, evaluated in closed form.
+        """
+        T1, T2 = np.broadcast_arrays(
+            np.asarray(T1, dtype=float), np.asarray(T2, dtype=float)
+        )
+        integral1, integral2 = _forward_integral_kernel(T1, T2, self.tau)
+        return self.beta0 * (T2 - T1) + self.beta1 * integral1 + self.beta2 * integral2
+
+    def forward_rate(
+        self,
+        T1: Union[float, np.ndarray],
+        T2: Union[float, np.ndarray],
+        compounding: str = "continuous",
+    ) -> np.ndarray:
+        """Forward rate(s) of this curve between T1 and T2 (broadcast
+        against each other), continuously compounded (the average of the
+        instantaneous forward rate over [T1, T2]) or simply compounded
+        ((discount(T1) / discount(T2) - 1) / (T2 - T1)). Intervals of
+        length 0 yield the instantaneous forward rate.
+        """
+        T1, T2 = np.broadcast_arrays(
+            np.asarray(T1, dtype=float), np.asarray(T2, dtype=float)
+        )
+        integral = self.forward_integral(T1, T2)
+        return _average_forward(integral, T1, T2, self.forward, compounding)
+
+    def discount(self, T: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """Discount factor(s) of this curve for time(s) T, i.e.
+        exp(-zero(T) * T) with continuously compounded zero rates.
+        """
+        if isinstance(T, (float, int)):
+            inv_tau = _reciprocal(self.tau)
+            if inv_tau is not None:
+                return math.exp(-self._zero_scalar(T, inv_tau) * T)
+        if not isinstance(T, np.ndarray):
+            return exp(-self.zero(T) * T)
+        discount = self.zero(T)
+        discount *= -T
+        return np.exp(discount, out=discount)
+
+    def annuity(
+        self, T: Union[float, np.ndarray], frequency: float = 1
+    ) -> Union[float, np.ndarray]:
+        """Annuity factor(s) for maturities T, i.e. the accrual-weighted
+        sum of discount factors over all payment dates of an instrument
+        paying frequency times per year (with a short first period if T is
+        not a multiple of the period). The discount factors for all payment
+        dates of all maturities are evaluated in a single vectorized call.
+        """
+        return _annuity_par_rate(self.zero, T, frequency)[0]
+
+    def par_rate(
+        self, T: Union[float, np.ndarray], frequency: float = 1
+    ) -> Union[float, np.ndarray]:
+        """Par rate(s) for maturities T, i.e. the coupon rate(s) paid
+        frequency times per year for which a bond is priced at par:
+        (1 - discount(T)) / annuity(T, frequency). At T = 0 this is the
+        limit, the short rate beta0 + beta1; negative maturities raise a
+        ValueError.
+        """
+        return _annuity_par_rate(self.zero, T, frequency)[1]
+
+
+@dataclass(eq=False)
+class NelsonSiegelCurveSet:
+    """Collection of Nelson-Siegel curves with parameters stored as
+    contiguous arrays (one element per curve). All curves are evaluated
+    on common time(s) T in a single vectorized pass, results are of shape
+    (number of curves,) + shape of T.
+    """
+
+    beta0: np.ndarray
+    beta1: np.ndarray
+    beta2: np.ndarray
+    tau: np.ndarray
+
+    def __post_init__(self) -> None:
+        names = [f.name for f in fields(self)]
+        params = np.broadcast_arrays(
+            *[np.atleast_1d(np.asarray(getattr(self, n), dtype=float)) for n in names]
+        )
+        for name, param in zip(names, params):
+            if param.ndim != 1:
+                raise ValueError(f"{name} must be one-dimensional")
+            setattr(self, name, np.array(param, dtype=float, order="C"))
+
+    @classmethod
+    def from_curves(cls, curves: Sequence[NelsonSiegelCurve]) -> "NelsonSiegelCurveSet":
+        """Create a curve set from a sequence of Nelson-Siegel curves."""
+        return cls(
+            np.array([c.beta0 for c in curves], dtype=float),
+            np.array([c.beta1 for c in curves], dtype=float),
+            np.array([c.beta2 for c in curves], dtype=float),
+            np.array([c.tau for c in curves], dtype=float),
+        )
+
+    def to_curves(self) -> List[NelsonSiegelCurve]:
+        """List of the Nelson-Siegel curves contained in this set."""
+        return [
+            NelsonSiegelCurve(*params)
+            for params in zip(
+                self.beta0.tolist(),
+                self.beta1.tolist(),
+                self.beta2.tolist(),
+                self.tau.tolist(),
+            )
+        ]
+
+    def __len__(self) -> int:
+        return self.tau.size
+
+    def __getitem__(self, i: int) -> NelsonSiegelCurve:
+        """Nelson-Siegel curve at position i of this set."""
+        return NelsonSiegelCurve(
+            float(self.beta0[i]),
+            float(self.beta1[i]),
+            float(self.beta2[i]),
+            float(self.tau[i]),
+        )
+
+    def _expand(self, param: np.ndarray, T: np.ndarray) -> np.ndarray:
+        """Reshape a parameter array for broadcasting against T."""
+        return param.reshape(param.shape + (1,) * T.ndim)
+
+    def factors(self, T: Union[float, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Factor loadings of all curves for time(s) T, excluding constant."""
+        T = np.asarray(T, dtype=float)
+        factor1 = np.empty(self.tau.shape + T.shape)
+        factor2 = np.empty(self.tau.shape + T.shape)
+        _factors_kernel(T, self._expand(self.tau, T), factor1, factor2)
+        return factor1, factor2
+
+    def factor_matrix(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Factor loadings of all curves for time(s) T, including constant
+        (=1.0), stacked along the last axis.
+        """
+        T = np.asarray(T, dtype=float)
+        matrix = np.empty(self.tau.shape + T.shape + (3,))
+        matrix[..., 0] = 1.0
+        _factors_kernel(T, self._expand(self.tau, T), matrix[..., 1], matrix[..., 2])
+        return matrix
+
+    def factor_derivatives(
+        self, T: Union[float, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Derivatives of the factor loadings of all curves for time(s) T
+        with respect to tau, excluding constant.
+        """
+        T = np.asarray(T, dtype=float)
+        tau = self._expand(self.tau, T)
+        factor1, factor2 = self.factors(T)
+        T_tau = np.maximum(T, 0.0) / tau
+        return factor2 / tau, (factor2 - T_tau * exp(-T_tau)) / tau
+
+    def zero(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Zero rate(s) of all curves at time(s) T."""
+        T = np.asarray(T, dtype=float)
+        factor1, factor2 = self.factors(T)
+        return (
+            self._expand(self.beta0, T)
+            + self._expand(self.beta1, T) * factor1
+            + self._expand(self.beta2, T) * factor2
+        )
+
+    def __call__(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Zero rate(s) of all curves at time(s) T."""
+        return self.zero(T)
+
+    def forward(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Instantaneous forward rate(s) of all curves at time(s) T."""
+        T = np.asarray(T, dtype=float)
+        T_tau = T / self._expand(self.tau, T)
+        exp_tt0 = exp(-T_tau)
+        return (
+            self._expand(self.beta0, T)
+            + self._expand(self.beta1, T) * exp_tt0
+            + self._expand(self.beta2, T) * exp_tt0 * T_tau
+        )
+
+    def _jacobian(
+        self, kernel: Callable[..., None], T: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """Jacobians of rates of all curves at time(s) T with loadings and
+        their tau derivatives written into their columns by kernel.
+        """
+        T = np.asarray(T, dtype=float)
+        jacobian = np.empty(self.tau.shape + T.shape + (4,))
+        jacobian[..., 0] = 1.0
+        kernel(
+            T,
+            self._expand(self.tau, T),
+            self._expand(self.beta1, T),
+            self._expand(self.beta2, T),
+            jacobian[..., 1],
+            jacobian[..., 2],
+            jacobian[..., 3],
+        )
+        return jacobian
+
+    def zero_jacobian(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Jacobians of the zero rate(s) of all curves at time(s) T with
+        respect to their parameters (beta0, beta1, beta2, tau), of shape
+        (number of curves,) + T.shape + (4,).
+        """
+        return self._jacobian(_zero_sensitivity_kernel, T)
+
+    def forward_jacobian(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Jacobians of the instantaneous forward rate(s) of all curves at
+        time(s) T with respect to their parameters (beta0, beta1, beta2,
+        tau), of shape (number of curves,) + T.shape + (4,).
+        """
+        return self._jacobian(_forward_sensitivity_kernel, T)
+
+    def forward_integral(
+        self, T1: Union[float, np.ndarray], T2: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """Integral(s) of the instantaneous forward rates of all curves
+        from T1 to T2 (broadcast against each other), evaluated in closed
+        form, see `NelsonSiegelCurve.forward_integral`.
+        """
+        T1, T2 = np.broadcast_arrays(
+            np.asarray(T1, dtype=float), np.asarray(T2, dtype=float)
+        )
+        integral1, integral2 = _forward_integral_kernel(
+            T1, T2, self._expand(self.tau, T1)
+        )
+        return (
+            self._expand(self.beta0, T1) * (T2 - T1)
+            + self._expand(self.beta1, T1) * integral1
+            + self._expand(self.beta2, T1) * integral2
+        )
+
+    def forward_rate(
+        self,
+        T1: Union[float, np.ndarray],
+        T2: Union[float, np.ndarray],
+        compounding: str = "continuous",
+    ) -> np.ndarray:
+        """Forward rate(s) of all curves between T1 and T2 (broadcast
+        against each other), continuously or simply compounded, see
+        `NelsonSiegelCurve.forward_rate`.
+        """
+        T1, T2 = np.broadcast_arrays(
+            np.asarray(T1, dtype=float), np.asarray(T2, dtype=float)
+        )
+        integral = self.forward_integral(T1, T2)
+        return _average_forward(integral, T1, T2, self.forward, compounding)
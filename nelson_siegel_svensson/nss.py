@@ -1,16 +1,29 @@
 # -*- coding: utf-8 -*-
 
 """Implementation of a Nelson-Siegel-Svensson interest rate curve model.
-See `NelsonSiegelSvenssonCurve` class for details.
+See `NelsonSiegelSvenssonCurve` class for details and
+`NelsonSiegelSvenssonCurveSet` for the vectorized evaluation of many
+curves at once.
 """
 
+import math
 from numbers import Real
-from dataclasses import dataclass
-from typing import Union, Tuple
+from dataclasses import dataclass, fields
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from numpy import exp
 
+from .ns import (
+    _annuity_par_rate,
+    _average_forward,
+    _factors_kernel,
+    _forward_integral_kernel,
+    _forward_sensitivity_kernel,
+    _reciprocal,
+    _zero_sensitivity_kernel,
+)
+
 EPS = np.finfo(float).eps
 
 
@@ -19,6 +32,9 @@ class NelsonSiegelSvenssonCurve:
     """Implementation of a Nelson-Siegel-Svensson interest rate curve model.
     This curve can be interpreted as a factor model with four
     factors (including a constant).
+    Zero rates, forward rates and discount factors for a single (float)
+    time are evaluated by a scalar path using `math` and the reciprocals
+    of tau1 and tau2.
     """
 
     beta0: float
@@ -29,40 +45,148 @@ class NelsonSiegelSvenssonCurve:
     tau2: float
 
     def factors(
-        self, T: Union[float, np.ndarray]
+        self,
+        T: Union[float, np.ndarray],
+        out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
     ) -> Union[Tuple[float, float, float], Tuple[np.ndarray, np.ndarray, np.ndarray]]:
-        """Factor loadings for time(s) T, excluding constant."""
+        """Factor loadings for time(s) T, excluding constant.
+        T is never modified. For array-valued T, the loadings are written
+        into the arrays of out (of the shape of T) if given.
+        """
+        if out is None and not isinstance(T, np.ndarray):
+            if isinstance(T, Real) and T <= 0:
+                return 1, 0, 0
+            exp_tt1 = exp(-T / self.tau1)
+            exp_tt2 = exp(-T / self.tau2)
+            factor1 = (1 - exp_tt1) / (T / self.tau1)
+            factor3 = (1 - exp_tt2) / (T / self.tau2) - exp_tt2
+            return factor1, factor1 - exp_tt1, factor3
+        T = np.asarray(T, dtype=float)
+        if out is None:
+            out = np.empty_like(T), np.empty_like(T), np.empty_like(T)
+        self._factors_kernel(T, *out)
+        return out
+
+    def _factors_kernel(
+        self,
+        T: np.ndarray,
+        factor1: np.ndarray,
+        factor2: np.ndarray,
+        factor3: np.ndarray,
+    ) -> None:
+        """Factor loadings for array-valued T written into the arrays
+        factor1, factor2 and factor3 without allocating temporary arrays
+        (unless T contains times T <= 0).
+        """
+        # the third factor equals the second Nelson-Siegel factor for tau2,
+        # factor1 serves as workspace until overwritten for tau1
+        _factors_kernel(T, self.tau2, factor1, factor3)
+        _factors_kernel(T, self.tau1, factor1, factor2)
+
+    def factor_matrix(
+        self, T: Union[float, np.ndarray], out: Optional[np.ndarray] = None
+    ) -> Union[float, np.ndarray]:
+        """Factor loadings for time(s) T as matrix columns,
+        including constant column (=1.0). For array-valued T, the
+        matrix is C-contiguous of shape T.shape + (4,) and is written
+        into out if given.
+        """
+        if out is None and not isinstance(T, np.ndarray):
+            factor1, factor2, factor3 = self.factors(T)
+            return np.array([1.0, factor1, factor2, factor3])
+        T = np.asarray(T, dtype=float)
+        if out is None:
+            out = np.empty(T.shape + (4,))
+        out[..., 0] = 1.0
+        self._factors_kernel(T, out[..., 1], out[..., 2], out[..., 3])
+        return out
+
+    def factor_derivatives(
+        self, T: Union[float, np.ndarray]
+    ) -> Tuple[
+        Union[float, np.ndarray], Union[float, np.ndarray], Union[float, np.ndarray]
+    ]:
+        """Derivatives of the factor loadings for time(s) T with respect
+        to tau1 (first and second factor) and tau2 (third factor),
+        excluding constant.
+        """
         tau1 = self.tau1
         tau2 = self.tau2
-        if isinstance(T, Real) and T <= 0:
-            return 1, 0, 0
-        elif isinstance(T, np.ndarray):
-            zero_idx = T <= 0
-            T[zero_idx] = EPS  # avoid warnings in calculations
-        exp_tt1 = exp(-T / tau1)
-        exp_tt2 = exp(-T / tau2)
-        factor1 = (1 - exp_tt1) / (T / tau1)
-        factor2 = factor1 - exp_tt1
-        factor3 = (1 - exp_tt2) / (T / tau2) - exp_tt2
         if isinstance(T, np.ndarray):
-            T[zero_idx] = 0
-            factor1[zero_idx] = 1
-            factor2[zero_idx] = 0
-            factor3[zero_idx] = 0
-        return factor1, factor2, factor3
+            factor1 = np.empty(T.shape)
+            factor2 = np.empty(T.shape)
+            factor3 = np.empty(T.shape)
+            self._factors_kernel(T, factor1, factor2, factor3)
+            T_pos = np.maximum(T, 0.0)
+            T_tau1 = T_pos / tau1
+            T_tau2 = T_pos / tau2
+            dfactor2 = factor2 - T_tau1 * exp(-T_tau1)
+            dfactor3 = factor3 - T_tau2 * exp(-T_tau2)
+            return (
+                np.divide(factor2, tau1, out=factor1),
+                np.divide(dfactor2, tau1, out=dfactor2),
+                np.divide(dfactor3, tau2, out=dfactor3),
+            )
+        if isinstance(T, Real) and T <= 0:
+            return 0, 0, 0
+        _, f2, f3 = self.factors(T)
+        x1 = T / tau1
+        x2 = T / tau2
+        return (
+            f2 / tau1,
+            (f2 - x1 * exp(-x1)) / tau1,
+            (f3 - x2 * exp(-x2)) / tau2,
+        )
 
-    def factor_matrix(self, T: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
-        """Factor loadings for time(s) T as matrix columns,
-        including constant column (=1.0).
+    def factor_matrix_derivatives(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Derivatives of the factor matrix for time(s) T with respect
+        to tau1 and tau2, stacked along the first axis.
         """
-        factor1, factor2, factor3 = self.factors(T)
-        constant: Union[float, np.ndarray] = (
-            np.ones(T.size) if isinstance(T, np.ndarray) else 1.0
+        dfactor1, dfactor2, dfactor3 = self.factor_derivatives(T)
+        zero = np.zeros_like(dfactor1, dtype=float)
+        return np.stack(
+            [
+                np.stack([zero, dfactor1, dfactor2, zero], axis=-1),
+                np.stack([zero, zero, zero, dfactor3], axis=-1),
+            ]
+        )
+
+    def _zero_scalar(self, T: float, inv_tau1: float, inv_tau2: float) -> float:
+        """Zero rate at a single time T given 1/tau1 and 1/tau2."""
+        if T <= 0:
+            return self.beta0 + self.beta1
+        T_tau1 = T * inv_tau1
+        T_tau2 = T * inv_tau2
+        # 1 - exp(-T / tau) by expm1 as in `_factors_kernel`
+        one_minus_exp1 = -math.expm1(-T_tau1)
+        one_minus_exp2 = -math.expm1(-T_tau2)
+        factor1 = one_minus_exp1 / T_tau1
+        return (
+            self.beta0
+            + self.beta1 * factor1
+            + self.beta2 * (one_minus_exp1 + factor1 - 1.0)
+            + self.beta3 * (one_minus_exp2 + one_minus_exp2 / T_tau2 - 1.0)
+        )
+
+    def _forward_scalar(self, T: float, inv_tau1: float, inv_tau2: float) -> float:
+        """Instantaneous forward rate at a single time T given 1/tau1 and
+        1/tau2.
+        """
+        T_tau1 = T * inv_tau1
+        T_tau2 = T * inv_tau2
+        return (
+            self.beta0
+            + (self.beta1 + self.beta2 * T_tau1) * math.exp(-T_tau1)
+            + self.beta3 * T_tau2 * math.exp(-T_tau2)
         )
-        return np.stack([constant, factor1, factor2, factor3]).transpose()
 
     def zero(self, T: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """Zero rate(s) of this curve at time(s) T."""
+        if isinstance(T, (float, int)):
+            inv_tau1 = _reciprocal(self.tau1)
+            inv_tau2 = _reciprocal(self.tau2)
+            if inv_tau1 is not None and inv_tau2 is not None:
+                return self._zero_scalar(T, inv_tau1, inv_tau2)
         beta0 = self.beta0
         beta1 = self.beta1
         beta2 = self.beta2
@@ -77,6 +201,11 @@ class NelsonSiegelSvenssonCurve:
 
     def forward(self, T: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """Instantaneous forward rate(s) of this curve at time(s) T."""
+        if isinstance(T, (float, int)):
+            inv_tau1 = _reciprocal(self.tau1)
+            inv_tau2 = _reciprocal(self.tau2)
+            if inv_tau1 is not None and inv_tau2 is not None:
+                return self._forward_scalar(T, inv_tau1, inv_tau2)
         exp_tt0 = exp(-T / self.tau1)
         exp_tt1 = exp(-T / self.tau2)
         return (
@@ -85,3 +214,358 @@ class NelsonSiegelSvenssonCurve:
             + self.beta2 * exp_tt0 * T / self.tau1
             + self.beta3 * exp_tt1 * T / self.tau2
         )
+
+    def _jacobian(
+        self, kernel: Callable[..., None], T: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """Jacobian of rates at time(s) T with loadings and their tau
+        derivatives written into its columns by kernel (once per tau).
+        """
+        T = np.asarray(T, dtype=float)
+        jacobian = np.empty(T.shape + (6,))
+        # the constant column serves as workspace for the unused loading
+        kernel(
+            T,
+            self.tau2,
+            0.0,
+            self.beta3,
+            jacobian[..., 0],
+            jacobian[..., 3],
+            jacobian[..., 5],
+        )
+        kernel(
+            T,
+            self.tau1,
+            self.beta1,
+            self.beta2,
+            jacobian[..., 1],
+            jacobian[..., 2],
+            jacobian[..., 4],
+        )
+        jacobian[..., 0] = 1.0
+        return jacobian
+
+    def zero_jacobian(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Jacobian of the zero rate(s) at time(s) T with respect to the
+        parameters (beta0, beta1, beta2, beta3, tau1, tau2), of shape
+        T.shape + (6,). Evaluated analytically in a single pass.
+        """
+        return self._jacobian(_zero_sensitivity_kernel, T)
+
+    def forward_jacobian(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Jacobian of the instantaneous forward rate(s) at time(s) T with
+        respect to the parameters (beta0, beta1, beta2, beta3, tau1, tau2),
+        of shape T.shape + (6,). Evaluated analytically in a single pass.
+        """
+        return self._jacobian(_forward_sensitivity_kernel, T)
+
+    def forward_integral(
+        self, T1: Union[float, np.ndarray], T2: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """Integral(s) of the instantaneous forward rate of this curve
+        from T1 to T2 (broadcast against each other), i.e.
+        zero(T2) * T2 - zero(T1) * T1, evaluated in closed form.
+        """
+        T1, T2 = np.broadcast_arrays(
+            np.asarray(T1, dtype=float), np.asarray(T2, dtype=float)
+        )
+        integral1, integral2 = _forward_integral_kernel(T1, T2, self.tau1)
+        _, integral3 = _forward_integral_kernel(T1, T2, self.tau2)
+        return (
+            self.beta0 * (T2 - T1)
+            + self.beta1 * integral1
+            + self.beta2 * integral2
+            + self.beta3 * integral3
+        )
+
+    def forward_rate(
+        self,
+        T1: Union[float, np.ndarray],
+        T2: Union[float, np.ndarray],
+        compounding: str = "continuous",
+    ) -> np.ndarray:
+        """Forward rate(s) of this curve between T1 and T2 (broadcast
+        against each other), continuously compounded (the average of the
+        instantaneous forward rate over [T1, T2]) or simply compounded
+        ((discount(T1) / discount(T2) - 1) / (T2 - T1)). Intervals of
+        length 0 yield the instantaneous forward rate.
+        """
+        T1, T2 = np.broadcast_arrays(
+            np.asarray(T1, dtype=float), np.asarray(T2, dtype=float)
+        )
+        integral = self.forward_integral(T1, T2)
+        return _average_forward(integral, T1, T2, self.forward, compounding)
+
+    def discount(self, T: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """Discount factor(s) of this curve for time(s) T, i.e.
+        exp(-zero(T) * T) with continuously compounded zero rates.
+        """
+        if isinstance(T, (float, int)):
+            inv_tau1 = _reciprocal(self.tau1)
+            inv_tau2 = _reciprocal(self.tau2)
+            if inv_tau1 is not None and inv_tau2 is not None:
+                return math.exp(-self._zero_scalar(T, inv_tau1, inv_tau2) * T)
+        if not isinstance(T, np.ndarray):
+            return exp(-self.zero(T) * T)
+        discount = self.zero(T)
+        discount *= -T
+        return np.exp(discount, out=discount)
+
+    def annuity(
+        self, T: Union[float, np.ndarray], frequency: float = 1
+    ) -> Union[float, np.ndarray]:
+        """Annuity factor(s) for maturities T, i.e. the accrual-weighted
+        sum of discount factors over all payment dates of an instrument
+        paying frequency times per year (with a short first period if T is
+        not a multiple of the period). The discount factors for all payment
+        dates of all maturities are evaluated in a single vectorized call.
+        """
+        return _annuity_par_rate(self.zero, T, frequency)[0]
+
+    def par_rate(
+        self, T: Union[float, np.ndarray], frequency: float = 1
+    ) -> Union[float, np.ndarray]:
+        """Par rate(s) for maturities T, i.e. the coupon rate(s) paid
+        frequency times per year for which a bond is priced at par:
+        (1 - discount(T)) / annuity(T, frequency). At T = 0 this is the
+        limit, the short rate beta0 + beta1; negative maturities raise a
+        ValueError.
+        """
+        return _annuity_par_rate(self.zero, T, frequency)[1]
+
+
+@dataclass(eq=False)
+class NelsonSiegelSvenssonCurveSet:
+    """Collection of Nelson-Siegel-Svensson curves with parameters stored
+    as contiguous arrays (one element per curve). All curves are evaluated
+    on common time(s) T in a single vectorized pass, results are of shape
+    (number of curves,) + shape of T.
+    """
+
+    beta0: np.ndarray
+    beta1: np.ndarray
+    beta2: np.ndarray
+    beta3: np.ndarray
+    tau1: np.ndarray
+    tau2: np.ndarray
+
+    def __post_init__(self) -> None:
+        names = [f.name for f in fields(self)]
+        params = np.broadcast_arrays(
+            *[np.atleast_1d(np.asarray(getattr(self, n), dtype=float)) for n in names]
+        )
+        for name, param in zip(names, params):
+            if param.ndim != 1:
+                raise ValueError(f"{name} must be one-dimensional")
+            setattr(self, name, np.array(param, dtype=float, order="C"))
+
+    @classmethod
+    def from_curves(
+        cls, curves: Sequence[NelsonSiegelSvenssonCurve]
+    ) -> "NelsonSiegelSvenssonCurveSet":
+        """Create a curve set from a sequence of Nelson-Siegel-Svensson curves."""
+        return cls(
+            np.array([c.beta0 for c in curves], dtype=float),
+            np.array([c.beta1 for c in curves], dtype=float),
+            np.array([c.beta2 for c in curves], dtype=float),
+            np.array([c.beta3 for c in curves], dtype=float),
+            np.array([c.tau1 for c in curves], dtype=float),
+            np.array([c.tau2 for c in curves], dtype=float),
+        )
+
+    def to_curves(self) -> List[NelsonSiegelSvenssonCurve]:
+        """List of the Nelson-Siegel-Svensson curves contained in this set."""
+        return [
+            NelsonSiegelSvenssonCurve(*params)
+            for params in zip(
+                self.beta0.tolist(),
+                self.beta1.tolist(),
+                self.beta2.tolist(),
+                self.beta3.tolist(),
+                self.tau1.tolist(),
+                self.tau2.tolist(),
+            )
+        ]
+
+    def __len__(self) -> int:
+        return self.tau1.size
+
+    def __getitem__(self, i: int) -> NelsonSiegelSvenssonCurve:
+        """Nelson-Siegel-Svensson curve at position i of this set."""
+        return NelsonSiegelSvenssonCurve(
+            float(self.beta0[i]),
+            float(self.beta1[i]),
+            float(self.beta2[i]),
+            float(self.beta3[i]),
+            float(self.tau1[i]),
+            float(self.tau2[i]),
+        )
+
+    def _expand(self, param: np.ndarray, T: np.ndarray) -> np.ndarray:
+        """Reshape a parameter array for broadcasting against T."""
+        return param.reshape(param.shape + (1,) * T.ndim)
+
+    def factors(
+        self, T: Union[float, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Factor loadings of all curves for time(s) T, excluding constant."""
+        T = np.asarray(T, dtype=float)
+        factor1 = np.empty(self.tau1.shape + T.shape)
+        factor2 = np.empty(self.tau1.shape + T.shape)
+        factor3 = np.empty(self.tau1.shape + T.shape)
+        self._factors_kernel(T, factor1, factor2, factor3)
+        return factor1, factor2, factor3
+
+    def _factors_kernel(
+        self,
+        T: np.ndarray,
+        factor1: np.ndarray,
+        factor2: np.ndarray,
+        factor3: np.ndarray,
+    ) -> None:
+        """Factor loadings of all curves for array-valued T written into the
+        arrays factor1, factor2 and factor3, see
+        `NelsonSiegelSvenssonCurve._factors_kernel`.
+        """
+        _factors_kernel(T, self._expand(self.tau2, T), factor1, factor3)
+        _factors_kernel(T, self._expand(self.tau1, T), factor1, factor2)
+
+    def factor_matrix(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Factor loadings of all curves for time(s) T, including constant
+        (=1.0), stacked along the last axis.
+        """
+        T = np.asarray(T, dtype=float)
+        matrix = np.empty(self.tau1.shape + T.shape + (4,))
+        matrix[..., 0] = 1.0
+        self._factors_kernel(T, matrix[..., 1], matrix[..., 2], matrix[..., 3])
+        return matrix
+
+    def factor_derivatives(
+        self, T: Union[float, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Derivatives of the factor loadings of all curves for time(s) T
+        with respect to tau1 (first and second factor) and tau2 (third
+        factor), excluding constant.
+        """
+        T = np.asarray(T, dtype=float)
+        tau1 = self._expand(self.tau1, T)
+        tau2 = self._expand(self.tau2, T)
+        factor1, factor2, factor3 = self.factors(T)
+        T_pos = np.maximum(T, 0.0)
+        T_tau1 = T_pos / tau1
+        T_tau2 = T_pos / tau2
+        return (
+            factor2 / tau1,
+            (factor2 - T_tau1 * exp(-T_tau1)) / tau1,
+            (factor3 - T_tau2 * exp(-T_tau2)) / tau2,
+        )
+
+    def zero(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Zero rate(s) of all curves at time(s) T."""
+        T = np.asarray(T, dtype=float)
+        factor1, factor2, factor3 = self.factors(T)
+        return (
+            self._expand(self.beta0, T)
+            + self._expand(self.beta1, T) * factor1
+            + self._expand(self.beta2, T) * factor2
+            + self._expand(self.beta3, T) * factor3
+        )
+
+    def __call__(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Zero rate(s) of all curves at time(s) T."""
+        return self.zero(T)
+
+    def forward(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Instantaneous forward rate(s) of all curves at time(s) T."""
+        T = np.asarray(T, dtype=float)
+        T_tau1 = T / self._expand(self.tau1, T)
+        T_tau2 = T / self._expand(self.tau2, T)
+        exp_tt1 = exp(-T_tau1)
+        exp_tt2 = exp(-T_tau2)
+        return (
+            self._expand(self.beta0, T)
+            + self._expand(self.beta1, T) * exp_tt1
+            + self._expand(self.beta2, T) * exp_tt1 * T_tau1
+            + self._expand(self.beta3, T) * exp_tt2 * T_tau2
+        )
+
+    def _jacobian(
+        self, kernel: Callable[..., None], T: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """Jacobians of rates of all curves at time(s) T with loadings and
+        their tau derivatives written into their columns by kernel, see
+        `NelsonSiegelSvenssonCurve._jacobian`.
+        """
+        T = np.asarray(T, dtype=float)
+        jacobian = np.empty(self.tau1.shape + T.shape + (6,))
+        kernel(
+            T,
+            self._expand(self.tau2, T),
+            0.0,
+            self._expand(self.beta3, T),
+            jacobian[..., 0],
+            jacobian[..., 3],
+            jacobian[..., 5],
+        )
+        kernel(
+            T,
+            self._expand(self.tau1, T),
+            self._expand(self.beta1, T),
+            self._expand(self.beta2, T),
+            jacobian[..., 1],
+            jacobian[..., 2],
+            jacobian[..., 4],
+        )
+        jacobian[..., 0] = 1.0
+        return jacobian
+
+    def zero_jacobian(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Jacobians of the zero rate(s) of all curves at time(s) T with
+        respect to their parameters (beta0, beta1, beta2, beta3, tau1,
+        tau2), of shape (number of curves,) + T.shape + (6,).
+        """
+        return self._jacobian(_zero_sensitivity_kernel, T)
+
+    def forward_jacobian(self, T: Union[float, np.ndarray]) -> np.ndarray:
+        """Jacobians of the instantaneous forward rate(s) of all curves at
+        time(s) T with respect to their parameters (beta0, beta1, beta2,
+        beta3, tau1, tau2), of shape (number of curves,) + T.shape + (6,).
+        """
+        return self._jacobian(_forward_sensitivity_kernel, T)
+
+    def forward_integral(
+        self, T1: Union[float, np.ndarray], T2: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """Integral(s) of the instantaneous forward rates of all curves
+        from T1 to T2 (broadcast against each other), evaluated in closed
+        form, see `NelsonSiegelSvenssonCurve.forward_integral`.
+        """
+        T1, T2 = np.broadcast_arrays(
+            np.asarray(T1, dtype=float), np.asarray(T2, dtype=float)
+        )
+        integral1, integral2 = _forward_integral_kernel(
+            T1, T2, self._expand(self.tau1, T1)
+        )
+        _, integral3 = _forward_integral_kernel(T1, T2, self._expand(self.tau2, T1))
+        return (
+            self._expand(self.beta0, T1) * (T2 - T1)
+            + self._expand(self.beta1, T1) * integral1
+            + self._expand(self.beta2, T1) * integral2
+            + self._expand(self.beta3, T1) * integral3
+        )
+
+    def forward_rate(
+        self,
+        T1: Union[float, np.ndarray],
+        T2: Union[float, np.ndarray],
+        compounding: str = "continuous",
+    ) -> np.ndarray:
+        """Forward rate(s) of all curves between T1 and T2 (broadcast
+        against each other), continuously or simply compounded, see
+        `NelsonSiegelSvenssonCurve.forward_rate`.
+        """
+        T1, T2 = np.broadcast_arrays(
+            np.asarray(T1, dtype=float), np.asarray(T2, dtype=float)
+        )
+        integral = self.forward_integral(T1, T2)
+        return _average_forward(integral, T1, T2, self.forward, compounding)
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+"""Parallel calibration of many independent curves (e.g. markets,
+issuers or dates) on a process or thread pool.
+See `calibrate_many` for details and `calibrate_iter` for streaming
+calibration of (possibly unbounded) iterables of jobs.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import fields
+from time import perf_counter
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from .calibrate import (
+    calibrate_ns_ols,
+    calibrate_ns_ols_bounded,
+    calibrate_ns_ols_grid,
+    calibrate_nss_ols,
+    calibrate_nss_ols_bounded,
+    calibrate_nss_ols_grid,
+)
+from .ns import NelsonSiegelCurve
+from .nss import NelsonSiegelSvenssonCurve
+
+# columns of the result rows following the curve parameters
+_STATUS_COLUMNS = ("success", "status", "nfev", "sse", "seconds")
+
+_CALIBRATORS: Dict[Tuple[bool, str], Callable[..., Tuple[Any, Any]]] = {
+    (True, "ols"): calibrate_nss_ols,
+    (True, "grid"): calibrate_nss_ols_grid,
+    (True, "bounded"): calibrate_nss_ols_bounded,
+    (False, "ols"): calibrate_ns_ols,
+    (False, "grid"): calibrate_ns_ols_grid,
+    (False, "bounded"): calibrate_ns_ols_bounded,
+}
+
+
+def _check_method(method: str, tau0: Optional[Any]) -> None:
+    """Check the calibration method and its combination with tau0 before
+    any job is dispatched to the workers.
+    """
+    assert method in (
+        "ols",
+        "grid",
+        "bounded",
+    ), "method must be 'ols', 'grid' or 'bounded'"
+    if method == "grid" and tau0 is not None:
+        raise ValueError("tau0 is not supported by method 'grid'")
+
+
+def _pack(
+    times: Union[np.ndarray, Sequence[np.ndarray]],
+    values: Union[np.ndarray, Sequence[np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenate the times and values of all jobs into two flat arrays
+    with offsets of the jobs (of length number of jobs + 1).
+    """
+    values_list = [np.asarray(y, dtype=float).ravel() for y in values]
+    if len(times) > 0 and np.ndim(times[0]) == 0:
+        times_list = [np.asarray(times, dtype=float)] * len(values_list)
+    else:
+        times_list = [np.asarray(t, dtype=float).ravel() for t in times]
+    assert len(times_list) == len(values_list), "Mismatching number of jobs"
+    sizes = [t.size for t in times_list]
+    assert sizes == [y.size for y in values_list], "Mismatching shapes of jobs"
+    offsets = np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+    if not sizes:
+        return np.empty(0), np.empty(0), offsets
+    return np.concatenate(times_list), np.concatenate(values_list), offsets
+
+
+def _calibrate_chunk(
+    times: np.ndarray,
+    values: np.ndarray,
+    offsets: np.ndarray,
+    nelson_siegel_svensson: bool,
+    method: str,
+    tau0: Optional[Any],
+) -> np.ndarray:
+    """Calibrate all jobs of a chunk given as flat arrays with offsets.
+    Returns one row per job holding the curve parameters followed by
+    `_STATUS_COLUMNS`.
+    """
+    calibrate = _CALIBRATORS[(nelson_siegel_svensson, method)]
+    n_params = 6 if nelson_siegel_svensson else 4
+    rows = np.empty((offsets.size - 1, n_params + len(_STATUS_COLUMNS)))
+    for i, (start, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+        t, y = times[start:end], values[start:end]
+        start_time = perf_counter()
+        if tau0 is None:
+            curve, opt_res = calibrate(t, y)
+        else:
+            curve, opt_res = calibrate(t, y, tau0=tau0)
+        seconds = perf_counter() - start_time
+        sse = 2 * opt_res.cost if "cost" in opt_res else opt_res.fun
+        rows[i, :n_params] = [getattr(curve, f.name) for f in fields(curve)]
+        rows[i, n_params:] = (
+            opt_res.success,
+            opt_res.status,
+            opt_res.nfev,
+            sse,
+            seconds,
+        )
+    return rows
+
+
+def _unpack(rows: np.ndarray, nelson_siegel_svensson: bool) -> List[Tuple[Any, Any]]:
+    """Curves and `OptimizeResult` instances from result rows of
+    `_calibrate_chunk`.
+    """
+    from scipy.optimize import OptimizeResult
+
+    curve_type = (
+        NelsonSiegelSvenssonCurve if nelson_siegel_svensson else NelsonSiegelCurve
+    )
+    n_params = 6 if nelson_siegel_svensson else 4
+    n_tau = 2 if nelson_siegel_svensson else 1
+    results = []
+    for row in rows:
+        params = row[:n_params].tolist()
+        success, status, nfev, sse, seconds = row[n_params:].tolist()
+        opt_res = OptimizeResult(
+            x=row[:n_params][-n_tau:],
+            success=bool(success),
+            status=int(status),
+            nfev=int(nfev),
+            sse=sse,
+            seconds=seconds,
+        )
+        results.append((curve_type(*params), opt_res))
+    return results
+
+
+def _executor(executor: str, max_workers: Optional[int]) -> Optional[Executor]:
+    if executor == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    assert executor == "serial", "executor must be 'process', 'thread' or 'serial'"
+    return None
+
+
+def calibrate_many(
+    times: Union[np.ndarray, Sequence[np.ndarray]],
+    values: Union[np.ndarray, Sequence[np.ndarray]],
+    nelson_siegel_svensson: bool = True,
+    method: str = "ols",
+    tau0: Optional[Any] = None,
+    executor: str = "process",
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> List[Tuple[Any, Any]]:
+    """Calibrate many independent curves, each to its own time-value
+    pairs, in parallel.
+
+    values holds the values of all jobs (a sequence of arrays or a
+    matrix with one row per job), times either the time points shared by
+    all jobs or a sequence of time points per job.
+    Each job is calibrated by `calibrate_nss_ols` (method "ols"),
+    `calibrate_nss_ols_grid` (method "grid") or
+    `calibrate_nss_ols_bounded` (method "bounded"), or their Nelson-Siegel
+    counterparts if nelson_siegel_svensson is False, starting from tau0
+    if given (methods "ols" and "bounded" only; a ValueError is raised for
+    "grid"). Jobs are split into chunks (of chunksize jobs, by default
+    about four per worker) executed by a pool of max_workers processes
+    (executor "process"), threads ("thread") or in the calling thread
+    ("serial"). Chunks are shipped to
+    the workers as flat arrays of times and values with job offsets, and
+    results are returned as one row of parameters and status per job, so
+    no curve objects or optimizer results are pickled.
+    Returns a list of curves and `OptimizeResult` instances (holding
+    `x` with the taus, `success`, `status`, `nfev`, the sum of squared
+    errors `sse` and the wall time `seconds` of the job) in the order of
+    the jobs.
+    """
+    _check_method(method, tau0)
+    flat_times, flat_values, offsets = _pack(times, values)
+    n_jobs = offsets.size - 1
+    pool = _executor(executor, max_workers)
+    if chunksize is None:
+        n_workers = 1 if pool is None else max_workers or os.cpu_count() or 1
+        chunksize = max(1, -(-n_jobs // (4 * n_workers)))
+    chunks = []
+    for first in range(0, n_jobs, chunksize):
+        stop = min(first + chunksize, n_jobs) + 1
+        chunk_offsets = offsets[first:stop]
+        start, end = chunk_offsets[0], chunk_offsets[-1]
+        chunks.append(
+            (
+                flat_times[start:end],
+                flat_values[start:end],
+                chunk_offsets - start,
+                nelson_siegel_svensson,
+                method,
+                tau0,
+            )
+        )
+    if pool is None:
+        rows = [_calibrate_chunk(*chunk) for chunk in chunks]
+    else:
+        with pool:
+            rows = list(pool.map(_calibrate_chunk, *zip(*chunks)))
+    if not rows:
+        return []
+    return _unpack(np.concatenate(rows), nelson_siegel_svensson)
+
+
+def calibrate_iter(
+    jobs: Iterable[Tuple[np.ndarray, np.ndarray]],
+    nelson_siegel_svensson: bool = True,
+    method: str = "ols",
+    tau0: Optional[Any] = None,
+    executor: str = "serial",
+    max_workers: Optional[int] = None,
+    chunksize: int = 1,
+) -> Iterator[Tuple[Any, Any]]:
+    """Calibrate curves to an iterable of jobs (pairs of time points and
+    values), yielding curves and `OptimizeResult` instances in the order
+    of the jobs as soon as they are available.
+
+    Same as `calibrate_many`, but jobs are consumed lazily in chunks of
+    chunksize jobs and at most two chunks per worker are in flight, so
+    memory usage does not depend on the number of jobs.
+    """
+    _check_method(method, tau0)
+    job_iter = iter(jobs)
+
+    def chunks() -> Iterator[Tuple[Any, ...]]:
+        while True:
+            chunk = list(islice(job_iter, chunksize))
+            if not chunk:
+                return
+            times, values = zip(*chunk)
+            yield _pack(times, values) + (nelson_siegel_svensson, method, tau0)
+
+    pool = _executor(executor, max_workers)
+    if pool is None:
+        for chunk in chunks():
+            yield from _unpack(_calibrate_chunk(*chunk), nelson_siegel_svensson)
+        return
+    max_pending = 2 * (max_workers or os.cpu_count() or 1)
+    with pool:
+        pending: Deque[Any] = deque()
+        for chunk in chunks():
+            pending.append(pool.submit(_calibrate_chunk, *chunk))
+            if len(pending) >= max_pending:
+                rows = pending.popleft().result()
+                yield from _unpack(rows, nelson_siegel_svensson)
+        while pending:
+            yield from _unpack(pending.popleft().result(), nelson_siegel_svensson)
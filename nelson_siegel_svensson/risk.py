@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""Key-rate (bucketed) risk of bonds priced off Nelson-Siegel(-Svensson)
+curves calibrated by ordinary least squares to yields at given tenors
+(e.g. by `calibrate.calibrate_nss_ols`). Instead of bumping each input
+yield, recalibrating and repricing, bumps are propagated through the
+calibration analytically: `calibration_jacobian` differentiates the
+optimality conditions of the least squares fit (implicit function
+theorem), `key_rate_risk` combines it with analytic price sensitivities
+of all bonds to the curve parameters. See `KeyRateRisk` for the results.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .bonds import _cash_flow_matrix
+from .ns import NelsonSiegelCurve
+from .nss import NelsonSiegelSvenssonCurve
+
+# per curve type and tau: the betas multiplying its first and second
+# Nelson-Siegel loading (None if there is none)
+_TAU_LOADINGS: Dict[type, List[Tuple[str, Any, Any]]] = {
+    NelsonSiegelCurve: [("tau", "beta1", "beta2")],
+    NelsonSiegelSvenssonCurve: [("tau1", "beta1", "beta2"), ("tau2", None, "beta3")],
+}
+
+
+def _loading_derivatives(
+    t: np.ndarray, tau: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """First and second derivatives of the two Nelson-Siegel zero rate
+    loadings for times t with respect to tau.
+    """
+    dfactor1, dfactor2 = NelsonSiegelCurve(0.0, 0.0, 0.0, tau).factor_derivatives(t)
+    T_tau = np.maximum(t, 0.0) / tau
+    exp_tt = np.exp(-T_tau)
+    return (
+        np.asarray(dfactor1),
+        np.asarray(dfactor2),
+        -T_tau * exp_tt / tau**2,
+        -T_tau * exp_tt * (T_tau - 1.0) / tau**2,
+    )
+
+
+def calibration_jacobian(
+    curve: Any, t: np.ndarray, y: np.ndarray, refit_tau: bool = True
+) -> np.ndarray:
+    """Jacobian of the parameters of curve (in the order of its fields,
+    e.g. beta0, beta1, beta2, tau) calibrated by least squares to the
+    time-value pairs t and y with respect to the values y, of shape
+    (number of parameters, len(t)).
+    If refit_tau is set, the taus are recalibrated as well: the Jacobian
+    follows from differentiating the first-order conditions
+    J' (curve(t) - y) = 0 of the fit (with J the Jacobian of the zero
+    rates with respect to the parameters) by the implicit function
+    theorem, including the second-order terms weighted by the residuals,
+    so that it is exact at any optimum of the fit (curve should thus be
+    calibrated to tight tolerances). Otherwise, the taus are
+    kept fixed and the betas follow the OLS fit of `betas_ns_ols` or
+    `betas_nss_ols` (pseudo-inverse of the factor matrix).
+    """
+    t = np.asarray(t, dtype=float)
+    y = np.asarray(y, dtype=float)
+    assert t.shape == y.shape, "Mismatching shapes of time and values"
+    names = [f.name for f in fields(curve)]
+    n_beta = sum(name.startswith("beta") for name in names)
+    if not refit_tau:
+        factors = np.asarray(curve.factor_matrix(t))
+        jacobian = np.zeros((len(names), t.size))
+        jacobian[:n_beta] = np.linalg.pinv(factors)
+        return jacobian
+    J = curve.zero_jacobian(t)
+    residuals = curve(t) - y
+    hessian = J.T @ J
+    index = {name: i for i, name in enumerate(names)}
+    for tau_name, beta_a, beta_b in _TAU_LOADINGS[type(curve)]:
+        j = index[tau_name]
+        dfactor1, dfactor2, d2factor1, d2factor2 = _loading_derivatives(
+            t, getattr(curve, tau_name)
+        )
+        for beta_name, dfactor, d2factor in (
+            (beta_a, dfactor1, d2factor1),
+            (beta_b, dfactor2, d2factor2),
+        ):
+            if beta_name is None:
+                continue
+            k = index[beta_name]
+            cross = residuals @ dfactor
+            hessian[j, k] += cross
+            hessian[k, j] += cross
+            hessian[j, j] += getattr(curve, beta_name) * (residuals @ d2factor)
+    return np.linalg.solve(hessian, J.T)
+
+
+@dataclass
+class KeyRateRisk:
+    """Key-rate risk of bonds priced off a curve calibrated to yields at
+    `tenors`: model `prices` of the bonds, `sensitivities` of the prices
+    with respect to the calibration input yields (bonds x tenors),
+    `parameter_sensitivities` of the prices with respect to the curve
+    parameters (bonds x parameters) and the `calibration_jacobian` of
+    the parameters with respect to the input yields (parameters x
+    tenors), all for continuously compounded rates in decimals.
+    """
+
+    tenors: np.ndarray
+    prices: np.ndarray
+    sensitivities: np.ndarray
+    parameter_sensitivities: np.ndarray
+    calibration_jacobian: np.ndarray
+
+    def price_changes(self, bump: float = 1e-4) -> np.ndarray:
+        """First-order price changes of all bonds (rows) for bumping each
+        input yield (columns) by bump (by default 1 bp).
+        """
+        return self.sensitivities * bump
+
+    def portfolio(self, positions: np.ndarray, bump: float = 1e-4) -> np.ndarray:
+        """First-order value changes of a portfolio holding positions (one
+        per bond) for bumping each input yield by bump, i.e. its bucketed
+        risk per tenor.
+        """
+        return np.asarray(positions, dtype=float) @ self.sensitivities * bump
+
+
+def key_rate_risk(
+    curve: Any,
+    t: np.ndarray,
+    y: np.ndarray,
+    cash_flows: Any,
+    times: np.ndarray,
+    refit_tau: bool = True,
+) -> KeyRateRisk:
+    """Key-rate risk of bonds with cash-flow matrix cash_flows (bonds x
+    times, dense or sparse) paid at times, priced off curve calibrated by
+    least squares to the yields y at tenors t (see `calibration_jacobian`
+    for refit_tau).
+    Discount factors and the analytic Jacobian of the zero rates of all
+    cash-flow times are evaluated once, so that the sensitivities of all
+    bonds to all tenors are obtained by two matrix products instead of
+    one recalibration and repricing per tenor.
+    """
+    times = np.asarray(times, dtype=float)
+    cash_flows = _cash_flow_matrix(cash_flows, times)
+    discount = np.asarray(curve.discount(times))
+    # derivatives of discount factors exp(-zero(T) * T) by the parameters
+    ddiscount = -(times * discount)[:, None] * curve.zero_jacobian(times)
+    parameter_sensitivities = np.asarray(cash_flows @ ddiscount)
+    jacobian = calibration_jacobian(curve, t, y, refit_tau)
+    return KeyRateRisk(
+        tenors=np.asarray(t, dtype=float),
+        prices=cash_flows @ discount,
+        sensitivities=parameter_sensitivities @ jacobian,
+        parameter_sensitivities=parameter_sensitivities,
+        calibration_jacobian=jacobian,
+    )
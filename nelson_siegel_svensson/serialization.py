@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""Compact binary serialization of collections of Nelson-Siegel(-Svensson)
+curves as NumPy structured arrays in ``.npy`` files.
+Each curve is stored as a fixed-width record holding a curve-type tag, a
+date, an identifier and the Nelson-Siegel-Svensson parameters (Nelson-Siegel
+curves are stored exactly with beta3 = 0 and tau1 = tau2 = tau), in order of
+date. Files are read memory-mapped, so single curves or date ranges are
+pulled without loading the whole file. See `save_curves`, `load_curves`
+and `select_dates` for details.
+"""
+
+from typing import Any, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .ns import NelsonSiegelCurve, NelsonSiegelCurveSet
+from .nss import NelsonSiegelSvenssonCurve, NelsonSiegelSvenssonCurveSet
+
+# values of the curve-type tag "type"
+NS_TYPE = 0
+NSS_TYPE = 1
+
+PARAMETER_NAMES = ("beta0", "beta1", "beta2", "beta3", "tau1", "tau2")
+
+Curves = Union[
+    Sequence[Union[NelsonSiegelCurve, NelsonSiegelSvenssonCurve]],
+    NelsonSiegelCurveSet,
+    NelsonSiegelSvenssonCurveSet,
+]
+
+
+def curve_dtype(id_length: int = 1) -> np.dtype:
+    """Record type of curves with identifiers of up to id_length
+    characters.
+    """
+    return np.dtype(
+        [("type", "u1"), ("date", "datetime64[D]"), ("id", f"U{max(id_length, 1)}")]
+        + [(name, "f8") for name in PARAMETER_NAMES]
+    )
+
+
+def _check_records(records: np.ndarray) -> None:
+    names = records.dtype.names or ()
+    if names != curve_dtype().names:
+        raise ValueError(f"Not an array of curve records: fields {names}")
+
+
+def _bisect(values: Any, value: Any, side: str = "left") -> int:
+    """Index at which value would be inserted into the sorted sequence
+    values (before equal values for side "left", after them for side
+    "right"), with NaN/NaT values sorted last.
+    Unlike `np.searchsorted`, which copies non-contiguous arrays such as
+    fields of memory-mapped records, only O(log n) values are accessed.
+    """
+    lo, hi = 0, len(values)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        current = values[mid]
+        if current < value or (side == "right" and current == value):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def curves_to_records(
+    curves: Curves,
+    dates: Optional[Any] = None,
+    ids: Optional[Sequence[str]] = None,
+) -> np.ndarray:
+    """Structured array of curve records (see `curve_dtype`) of curves,
+    given as a sequence of curves or a curve set, with optional dates
+    (anything convertible to ``datetime64[D]``, NaT if not given) and
+    identifiers (empty if not given), in the order of curves.
+    """
+    if isinstance(curves, NelsonSiegelSvenssonCurveSet):
+        types = np.full(len(curves), NSS_TYPE, dtype="u1")
+        params = [getattr(curves, name) for name in PARAMETER_NAMES]
+    elif isinstance(curves, NelsonSiegelCurveSet):
+        types = np.full(len(curves), NS_TYPE, dtype="u1")
+        zeros = np.zeros(len(curves))
+        params = [curves.beta0, curves.beta1, curves.beta2, zeros]
+        params += [curves.tau, curves.tau]
+    else:
+        types = np.array(
+            [NSS_TYPE if hasattr(c, "beta3") else NS_TYPE for c in curves], dtype="u1"
+        )
+        params = list(
+            np.array(
+                [
+                    (
+                        c.beta0,
+                        c.beta1,
+                        c.beta2,
+                        getattr(c, "beta3", 0.0),
+                        getattr(c, "tau1", getattr(c, "tau", None)),
+                        getattr(c, "tau2", getattr(c, "tau", None)),
+                    )
+                    for c in curves
+                ],
+                dtype=float,
+            )
+            .reshape(-1, len(PARAMETER_NAMES))
+            .T
+        )
+    n_curves = types.size
+    id_array = np.array(ids if ids is not None else [""] * n_curves, dtype=str)
+    id_length = id_array.dtype.itemsize // np.dtype("U1").itemsize
+    if id_array.shape != (n_curves,):
+        raise ValueError("Mismatching number of curves and ids")
+    records = np.empty(n_curves, dtype=curve_dtype(id_length))
+    records["type"] = types
+    records["date"] = np.datetime64("NaT") if dates is None else dates
+    records["id"] = id_array
+    for name, param in zip(PARAMETER_NAMES, params):
+        records[name] = param
+    return records
+
+
+def save_curves(
+    file: Any,
+    curves: Curves,
+    dates: Optional[Any] = None,
+    ids: Optional[Sequence[str]] = None,
+) -> None:
+    """Save curves (a sequence of curves or a curve set) with optional
+    dates and identifiers to file (a path or a binary file object) in
+    ``.npy`` format. Records are stored in order of date (keeping the
+    order of curves of the same date), see `curves_to_records`.
+    """
+    records = curves_to_records(curves, dates, ids)
+    if dates is not None:
+        records = records[np.argsort(records["date"], kind="stable")]
+    np.save(file, records, allow_pickle=False)
+
+
+def load_curves(file: Any, mmap_mode: Any = "r") -> np.ndarray:
+    """Structured array of curve records saved by `save_curves` to file.
+    By default, the file (which must be a path then) is memory-mapped
+    read-only, so only the records accessed are read from disk; pass
+    mmap_mode=None to load all records into memory instead.
+    """
+    records = np.load(file, mmap_mode=mmap_mode, allow_pickle=False)
+    _check_records(records)
+    return records
+
+
+def select_dates(records: np.ndarray, start: Any, end: Optional[Any] = None) -> Any:
+    """Records (a view, memory-mapped for memory-mapped records) with
+    dates from start up to and including end (only date start if end is
+    not given), found by binary search in the date-ordered records.
+    """
+    _check_records(records)
+    start = np.datetime64(start, "D")
+    end = start if end is None else np.datetime64(end, "D")
+    dates = records["date"]
+    first = _bisect(dates, start, side="left")
+    stop = _bisect(dates, end, side="right")
+    return records[first:stop]
+
+
+def record_to_curve(
+    record: np.void,
+) -> Union[NelsonSiegelCurve, NelsonSiegelSvenssonCurve]:
+    """Curve of the type tagged in a single curve record."""
+    beta0, beta1, beta2, beta3, tau1, tau2 = [
+        float(record[name]) for name in PARAMETER_NAMES
+    ]
+    if record["type"] == NS_TYPE:
+        return NelsonSiegelCurve(beta0, beta1, beta2, tau1)
+    return NelsonSiegelSvenssonCurve(beta0, beta1, beta2, beta3, tau1, tau2)
+
+
+def records_to_curves(
+    records: np.ndarray,
+) -> List[Union[NelsonSiegelCurve, NelsonSiegelSvenssonCurve]]:
+    """List of curves (of the tagged types) of curve records."""
+    _check_records(records)
+    types = records["type"].tolist()
+    params = zip(*[records[name].tolist() for name in PARAMETER_NAMES])
+    return [
+        NelsonSiegelCurve(beta0, beta1, beta2, tau1)
+        if curve_type == NS_TYPE
+        else NelsonSiegelSvenssonCurve(beta0, beta1, beta2, beta3, tau1, tau2)
+        for curve_type, (beta0, beta1, beta2, beta3, tau1, tau2) in zip(types, params)
+    ]
+
+
+def records_to_curve_set(records: np.ndarray) -> NelsonSiegelSvenssonCurveSet:
+    """Curve set of all curve records for vectorized evaluation
+    (Nelson-Siegel curves being represented exactly as Nelson-Siegel-Svensson
+    curves).
+    """
+    _check_records(records)
+    return NelsonSiegelSvenssonCurveSet(*[records[name] for name in PARAMETER_NAMES])
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+
+"""Persistent store of historical Nelson-Siegel(-Svensson) curves by date
+and market, kept in memory-mapped fixed-width records on disk.
+See `CurveStore` for details.
+"""
+
+import os
+import struct
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .ns import NelsonSiegelCurve
+from .nss import NelsonSiegelSvenssonCurve, NelsonSiegelSvenssonCurveSet
+from .serialization import (
+    Curves,
+    _bisect,
+    curve_dtype,
+    curves_to_records,
+    record_to_curve,
+    records_to_curve_set,
+    records_to_curves,
+)
+
+# total length of the .npy headers of the store files, leaving room to
+# grow the shape in place on append
+_HEADER_LENGTH = 512
+
+_RECORDS_FILE = "records.npy"
+_INDEX_FILE = "index.npy"
+
+
+def _npy_header(dtype: np.dtype, length: int) -> bytes:
+    """Header of a .npy file (format version 1.0) of a one-dimensional
+    array of dtype and length, padded to `_HEADER_LENGTH` bytes.
+    """
+    descr = np.lib.format.dtype_to_descr(dtype)
+    header = "{{'descr': {!r}, 'fortran_order': False, 'shape': ({},), }}".format(
+        descr, length
+    )
+    header = header.ljust(_HEADER_LENGTH - 11) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode()
+
+
+def _read_header(path: str) -> Tuple[np.dtype, int]:
+    """Dtype and length of the array in a .npy file written by the store."""
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version != (1, 0):
+            raise ValueError(f"Unsupported .npy format version {version} of {path}")
+        shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+        if f.tell() != _HEADER_LENGTH or len(shape) != 1:
+            raise ValueError(f"{path} is not a file of a curve store")
+    return dtype, shape[0]
+
+
+def _append(path: str, dtype: np.dtype, length: int, values: np.ndarray) -> int:
+    """Append values to the array of length in the .npy file at path and
+    update its header in place. Returns the new length.
+    Values are written before the header, so an interrupted append leaves
+    the file at its previous length.
+    """
+    with open(path, "r+b") as f:
+        f.seek(_HEADER_LENGTH + length * dtype.itemsize)
+        f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+        f.truncate()
+        f.flush()
+        f.seek(0)
+        f.write(_npy_header(dtype, length + values.size))
+    return length + values.size
+
+
+def _write(path: str, dtype: np.dtype, values: np.ndarray) -> None:
+    """Atomically (re)write the .npy file at path holding values."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_npy_header(dtype, values.size))
+        f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+    os.replace(tmp_path, path)
+
+
+def _memmap(path: str, dtype: np.dtype, length: int) -> np.ndarray:
+    """Read-only memory map of the array of length in the .npy file."""
+    if length == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(
+        path, dtype=dtype, mode="r", offset=_HEADER_LENGTH, shape=(length,)
+    )
+
+
+class _IndexKeys:
+    """Sequence of the (date, id) keys of records in order of the index,
+    accessing only the records looked up.
+    """
+
+    def __init__(self, records: np.ndarray, index: np.ndarray) -> None:
+        # plain arrays on the memory map, avoiding the overhead of
+        # indexing np.memmap instances
+        self.days = np.asarray(records["date"]).view("i8")
+        self.ids = np.asarray(records["id"])
+        self.index = np.asarray(index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, i: int) -> Tuple[int, str]:
+        position = self.index[i]
+        return int(self.days[position]), str(self.ids[position])
+
+
+def _days(date: Any) -> int:
+    """Days since epoch of a date."""
+    day = np.datetime64(date, "D")
+    if np.isnat(day):
+        raise ValueError("Dates of curves must not be NaT")
+    return int(day.astype("i8"))
+
+
+class CurveStore:
+    """Persistent store of Nelson-Siegel(-Svensson) curves by date and
+    market (identifier of up to id_length characters), kept in the
+    directory path (created if it does not exist).
+
+    Curves are stored as fixed-width records (see
+    `serialization.curve_dtype`) in the order of their appending in the
+    file records.npy, which is only ever appended to. The file index.npy
+    holds the positions of the records sorted by date and identifier.
+    Both files are valid .npy files and are memory-mapped, so that point
+    lookups (`get`) and range scans (`records`, `curves`, `curve_set`) are
+    binary searches touching O(log n) records plus those returned.
+    Appending curves of later dates than all stored ones (such as daily
+    calibrations) appends to both files in place; otherwise the index is
+    rebuilt. If a date and market are stored more than once, only the
+    latest appended curve is returned by lookups and range scans.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], id_length: int = 16) -> None:
+        self.path = os.fspath(path)
+        self._records_path = os.path.join(self.path, _RECORDS_FILE)
+        self._index_path = os.path.join(self.path, _INDEX_FILE)
+        if os.path.exists(self._records_path):
+            self.dtype, self._length = _read_header(self._records_path)
+            _, index_length = _read_header(self._index_path)
+            if self.dtype.names != curve_dtype().names:
+                raise ValueError(f"{self.path} is not a curve store")
+            if index_length != self._length:
+                self._reindex()
+        else:
+            os.makedirs(self.path, exist_ok=True)
+            self.dtype = curve_dtype(id_length)
+            self._length = 0
+            _write(self._records_path, self.dtype, np.empty(0, dtype=self.dtype))
+            _write(self._index_path, np.dtype("<i8"), np.empty(0, dtype="<i8"))
+        self._open()
+
+    def _open(self) -> None:
+        self._records = _memmap(self._records_path, self.dtype, self._length)
+        self._index = _memmap(self._index_path, np.dtype("<i8"), self._length)
+        self._keys = _IndexKeys(self._records, self._index)
+
+    def _reindex(self) -> None:
+        """Rebuild the index from all records."""
+        records = _memmap(self._records_path, self.dtype, self._length)
+        index = np.lexsort((records["id"], records["date"]))
+        _write(self._index_path, np.dtype("<i8"), index)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, curves: Curves, dates: Iterable[Any], ids: Sequence[str]) -> None:
+        """Append curves (a sequence of curves or a curve set) with their
+        dates and market identifiers to the store.
+        """
+        new = curves_to_records(curves, list(dates), ids)
+        if new.dtype["id"].itemsize > self.dtype["id"].itemsize:
+            raise ValueError("Identifiers exceed the identifier length of the store")
+        if np.isnat(new["date"]).any():
+            raise ValueError("Dates of curves must not be NaT")
+        if new.size == 0:
+            return
+        new = new.astype(self.dtype)
+        order = np.lexsort((new["id"], new["date"]))
+        first_new = (int(new["date"][order[0]].astype("i8")), str(new["id"][order[0]]))
+        in_order = self._length == 0 or self._keys[self._length - 1] <= first_new
+        length = _append(self._records_path, self.dtype, self._length, new)
+        if in_order:
+            _append(
+                self._index_path, np.dtype("<i8"), self._length, order + self._length
+            )
+            self._length = length
+        else:
+            self._length = length
+            self._reindex()
+        self._open()
+
+    def _range(self, start: Optional[Any], end: Optional[Any]) -> Tuple[int, int]:
+        """Range of index positions of records with dates from start up to
+        and including end (unbounded if None).
+        """
+        first = 0 if start is None else _bisect(self._keys, (_days(start), ""))
+        if end is None:
+            return first, self._length
+        # ids sort before the key of the following day
+        stop = _bisect(self._keys, (_days(end) + 1, ""))
+        return first, max(first, stop)
+
+    def get(
+        self, date: Any, id: str
+    ) -> Union[NelsonSiegelCurve, NelsonSiegelSvenssonCurve]:
+        """Curve of market id at date, raising `KeyError` if not stored."""
+        key = (_days(date), id)
+        position = _bisect(self._keys, key, side="right") - 1
+        if position < 0 or self._keys[position] != key:
+            raise KeyError(f"No curve of {id!r} at {np.datetime64(date, 'D')}")
+        return record_to_curve(self._records[self._index[position]])
+
+    def records(
+        self,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        ids: Optional[Sequence[str]] = None,
+    ) -> np.ndarray:
+        """Curve records (see `serialization.curve_dtype`) with dates from
+        start up to and including end (unbounded if None), of markets ids
+        (all markets if None), sorted by date and identifier.
+        """
+        first, stop = self._range(start, end)
+        records = self._records[np.asarray(self._index[first:stop])]
+        if records.size > 1:
+            # latest appended of records of the same date and market
+            latest = np.ones(records.size, dtype=bool)
+            dates, market_ids = records["date"], records["id"]
+            latest[:-1] = (dates[1:] != dates[:-1]) | (
+                market_ids[1:] != market_ids[:-1]
+            )
+            records = records[latest]
+        if ids is not None:
+            records = records[np.isin(records["id"], np.asarray(ids, dtype=str))]
+        return records
+
+    def curves(
+        self,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        ids: Optional[Sequence[str]] = None,
+    ) -> List[Union[NelsonSiegelCurve, NelsonSiegelSvenssonCurve]]:
+        """Curves with dates from start up to and including end of markets
+        ids, see `records`.
+        """
+        return records_to_curves(self.records(start, end, ids))
+
+    def curve_set(
+        self,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        ids: Optional[Sequence[str]] = None,
+    ) -> NelsonSiegelSvenssonCurveSet:
+        """Curve set for the vectorized evaluation of the curves with dates
+        from start up to and including end of markets ids, see `records`.
+        """
+        return records_to_curve_set(self.records(start, end, ids))
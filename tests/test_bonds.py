@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from nelson_siegel_svensson import NelsonSiegelCurve, NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.bonds import (
+    _cash_flow_matrix,
+    bond_durations,
+    bond_prices,
+    bond_yields,
+    calibrate_ns_bonds,
+    calibrate_nss_bonds,
+)
+
+
+def coupon_bonds(maturities, coupons, frequency=1):
+    """Cash-flow matrix and cash-flow times of bullet bonds with annual
+    coupon rates paid frequency times per year (monthly time grid).
+    """
+    times = np.arange(1, 12 * int(np.ceil(max(maturities))) + 1) / 12
+    cash_flows = np.zeros((len(maturities), times.size))
+    for i, (maturity, coupon) in enumerate(zip(maturities, coupons)):
+        last = int(round(12 * maturity)) - 1
+        step = 12 // frequency
+        cash_flows[i, last::-step] = coupon / frequency
+        cash_flows[i, last] += 1
+    return csr_matrix(cash_flows), times
+
+
+class TestBonds(unittest.TestCase):
+    """Tests for bond pricing and calibration to bond prices."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.maturities = np.round(rng.uniform(0.5, 30, 40) * 12) / 12
+        self.coupons = rng.uniform(0.0, 0.06, 40)
+        self.cash_flows, self.times = coupon_bonds(self.maturities, self.coupons, 2)
+        self.y_nss = NelsonSiegelSvenssonCurve(0.03, -0.02, 0.01, -0.01, 0.8, 6.0)
+        self.prices = bond_prices(self.y_nss, self.cash_flows, self.times)
+
+    def test_prices_yields_durations(self):
+        """Test pricing, yields and durations against dense computations."""
+        cash_flows = self.cash_flows.toarray()
+        discount = np.exp(-self.y_nss(self.times) * self.times)
+        self.assertTrue(np.allclose(cash_flows @ discount, self.prices))
+        yields = bond_yields(self.cash_flows, self.times, self.prices)
+        discount = np.exp(-np.outer(yields, self.times))
+        self.assertTrue(np.allclose(np.sum(cash_flows * discount, 1), self.prices))
+        durations = bond_durations(cash_flows, self.times, yields)
+        expected = np.sum(cash_flows * discount * self.times, 1) / self.prices
+        self.assertTrue(np.allclose(expected, durations))
+        # zero-coupon bonds yield the zero rates
+        zero_prices = self.y_nss.discount(self.times[:3])
+        zero_yields = bond_yields(np.eye(3), self.times[:3], zero_prices)
+        self.assertTrue(np.allclose(self.y_nss(self.times[:3]), zero_yields))
+
+    def test_dense_and_sparse_cash_flows(self):
+        """Test that dense and sparse cash flows stay in their format and
+        agree."""
+        cash_flows = self.cash_flows.toarray()
+        self.assertIsInstance(_cash_flow_matrix(cash_flows, self.times), np.ndarray)
+        sparse = _cash_flow_matrix(self.cash_flows.tocoo(), self.times)
+        self.assertIsInstance(sparse, csr_matrix)
+        prices = bond_prices(self.y_nss, cash_flows, self.times)
+        self.assertTrue(np.allclose(prices, self.prices, rtol=1e-14, atol=0))
+        yields = bond_yields(cash_flows, self.times, self.prices)
+        expected = bond_yields(self.cash_flows, self.times, self.prices)
+        self.assertTrue(np.allclose(yields, expected, rtol=1e-12, atol=0))
+
+    def test_calibrate_nss_bonds(self):
+        """Test recovery of a curve from bond prices."""
+        for errors in ("price", "yield"):
+            for weights in (None, "duration"):
+                curve, opt_res = calibrate_nss_bonds(
+                    self.cash_flows,
+                    self.times,
+                    self.prices,
+                    errors=errors,
+                    weights=weights,
+                )
+                self.assertTrue(opt_res.success)
+                self.assertTrue(np.allclose(self.prices, opt_res.fitted_prices))
+                self.assertTrue(
+                    np.allclose(self.y_nss(self.times), curve(self.times), atol=1e-7)
+                )
+        curve, opt_res = calibrate_nss_bonds(
+            self.cash_flows, self.times, self.prices, tau0=(1.0, 5.0)
+        )
+        self.assertTrue(np.allclose(self.prices, opt_res.fitted_prices))
+        # duration weighting is weighting squared errors by 1 / durations**2
+        noisy = self.prices * (1 + 1e-4 * np.cos(np.arange(self.prices.size)))
+        curve, opt_res = calibrate_nss_bonds(
+            self.cash_flows, self.times, noisy, weights="duration"
+        )
+        self.assertTrue(np.allclose(opt_res.durations**-2, opt_res.weights))
+        weighted, _ = calibrate_nss_bonds(
+            self.cash_flows, self.times, noisy, weights=opt_res.durations**-2
+        )
+        self.assertTrue(np.allclose(curve(self.times), weighted(self.times)))
+
+    def test_calibrate_ns_bonds(self):
+        """Test recovery of a Nelson-Siegel curve from bond prices."""
+        y_ns = NelsonSiegelCurve(0.04, -0.03, -0.02, 1.7)
+        prices = bond_prices(y_ns, self.cash_flows.toarray(), self.times)
+        curve, opt_res = calibrate_ns_bonds(
+            self.cash_flows, self.times, prices, errors="yield"
+        )
+        self.assertTrue(opt_res.success)
+        self.assertAlmostEqual(y_ns.tau, curve.tau, places=5)
+        self.assertAlmostEqual(y_ns.beta0, curve.beta0, places=7)
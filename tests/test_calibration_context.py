@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelCurve, NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.calibrate import (
+    CalibrationContext,
+    betas_ns_ols,
+    betas_nss_ols,
+    calibrate_nss_ols_grid,
+    errorfn_nss_ols,
+    jacobian_ns_ols,
+    jacobian_nss_ols,
+)
+
+
+class TestCalibrationContext(unittest.TestCase):
+    """Tests for cached calibration contexts."""
+
+    def setUp(self):
+        self.t = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 25, 30])
+        self.y_ns = NelsonSiegelCurve(0.017, -0.023, 0.24, 2.2)
+        self.y_nss = NelsonSiegelSvenssonCurve(0.03, -0.02, 0.01, -0.01, 0.8, 6.0)
+
+    def test_betas_and_errorfn(self):
+        """Test closed-form betas and error function against OLS."""
+        y = self.y_nss(self.t) + 0.001 * np.sin(self.t)
+        context = CalibrationContext(self.t)
+        tau = (1.5, 4.0)
+        expected, _ = betas_nss_ols(tau, self.t, y)
+        actual = context.betas(tau, y)
+        for field in ("beta0", "beta1", "beta2", "beta3", "tau1", "tau2"):
+            self.assertAlmostEqual(getattr(expected, field), getattr(actual, field))
+        self.assertAlmostEqual(
+            errorfn_nss_ols(tau, self.t, y), context.errorfn(tau, y), places=15
+        )
+        self.assertTrue(
+            np.allclose(jacobian_nss_ols(tau, self.t, y), context.jacobian(tau, y))
+        )
+        context = CalibrationContext(self.t, NelsonSiegelCurve)
+        expected, _ = betas_ns_ols(1.5, self.t, y)
+        self.assertEqual(expected.tau, context.betas(1.5, y).tau)
+        self.assertAlmostEqual(expected.beta2, context.betas(1.5, y).beta2)
+        self.assertTrue(
+            np.allclose(jacobian_ns_ols(1.5, self.t, y), context.jacobian(1.5, y))
+        )
+
+    def test_lru_cache(self):
+        """Test cache hits and bounded least recently used eviction."""
+        context = CalibrationContext(self.t, maxsize=2)
+        context.decomposition((1.0, 2.0))
+        context.decomposition((1.0, 3.0))
+        context.decomposition((1.0, 2.0))
+        self.assertEqual((1, 2), (context.hits, context.misses))
+        context.decomposition((1.0, 4.0))  # evicts (1.0, 3.0)
+        context.decomposition((1.0, 2.0))
+        context.decomposition((1.0, 3.0))
+        self.assertEqual((2, 4), (context.hits, context.misses))
+        context.clear()
+        self.assertEqual((0, 0), (context.hits, context.misses))
+        self.assertRaises(ValueError, CalibrationContext, self.t, float)
+
+    def test_calibration(self):
+        """Test calibration via grid search and local refinement."""
+        context = CalibrationContext(self.t)
+        y_hat, opt_res = context.calibrate(self.y_nss(self.t))
+        self.assertTrue(opt_res.success)
+        self.assertAlmostEqual(self.y_nss.tau1, y_hat.tau1, places=4)
+        self.assertAlmostEqual(self.y_nss.tau2, y_hat.tau2, places=4)
+        self.assertAlmostEqual(self.y_nss.beta3, y_hat.beta3, places=6)
+        # repeated calibration only hits the cache
+        misses = context.misses
+        context.calibrate(self.y_nss(self.t))
+        self.assertEqual(misses, context.misses)
+        # grid search only
+        y_hat, opt_res = context.calibrate(self.y_nss(self.t), refine=False)
+        self.assertEqual(len(context.tau_grid), opt_res.nfev)
+        self.assertIn(y_hat.tau1, context.tau_values)
+        context = CalibrationContext(self.t, NelsonSiegelCurve)
+        y_hat, opt_res = context.calibrate(self.y_ns(self.t))
+        self.assertAlmostEqual(self.y_ns.tau, y_hat.tau, places=5)
+
+    def test_multi_start(self):
+        """Test recovery of taus whose best grid point lies in the basin of
+        another local minimum, against `calibrate_nss_ols_grid`."""
+        t = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+        y = NelsonSiegelSvenssonCurve(0.028, -0.03, -0.04, -0.015, 1.1, 4.0)(t)
+        context = CalibrationContext(t)
+        y_hat, opt_res = context.calibrate(y)
+        self.assertAlmostEqual(1.1, y_hat.tau1, places=6)
+        self.assertAlmostEqual(4.0, y_hat.tau2, places=6)
+        self.assertLess(2 * opt_res.cost, 1e-20)
+        self.assertEqual((3, 2), opt_res.starts.shape)
+        expected, expected_res = calibrate_nss_ols_grid(t, y)
+        self.assertLessEqual(opt_res.cost, expected_res.cost * (1 + 1e-6) + 1e-30)
+        # a single start from the best grid point ends in the wrong minimum
+        y_hat, opt_res = context.calibrate(y, n_starts=1)
+        self.assertGreater(2 * opt_res.cost, 1e-12)
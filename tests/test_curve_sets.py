@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+
+from nelson_siegel_svensson import (
+    NelsonSiegelCurve,
+    NelsonSiegelSvenssonCurve,
+    NelsonSiegelCurveSet,
+    NelsonSiegelSvenssonCurveSet,
+)
+
+
+class TestNelsonSiegelCurveSet(unittest.TestCase):
+    """Tests for vectorized Nelson-Siegel curve sets."""
+
+    def setUp(self):
+        self.curves = [
+            NelsonSiegelCurve(0.017, -0.023, 0.24, 2.2),
+            NelsonSiegelCurve(0.03, -0.01, -0.02, 1.1),
+            NelsonSiegelCurve(0.042, -0.032, -0.027, 1.7),
+        ]
+        self.curve_set = NelsonSiegelCurveSet.from_curves(self.curves)
+        self.t = np.linspace(0, 30, 31)
+
+    def test_round_trip(self):
+        """Test conversion from and to lists of curves."""
+        self.assertEqual(len(self.curves), len(self.curve_set))
+        self.assertEqual(self.curves, self.curve_set.to_curves())
+        self.assertEqual(self.curves[1], self.curve_set[1])
+        self.assertTrue(self.curve_set.tau.flags["C_CONTIGUOUS"])
+
+    def test_broadcast_parameters(self):
+        """Test broadcasting of scalar parameters."""
+        curve_set = NelsonSiegelCurveSet(0.01, [0.0, 0.01], 0.0, 2.0)
+        self.assertEqual(2, len(curve_set))
+        self.assertEqual([0.01, 0.01], curve_set.beta0.tolist())
+        self.assertRaises(ValueError, NelsonSiegelCurveSet, [[0.01]], 0.0, 0.0, 1.0)
+
+    def test_zero_and_forward_against_curves(self):
+        """Test vectorized evaluation against individual curves."""
+        zero = self.curve_set(self.t)
+        forward = self.curve_set.forward(self.t)
+        self.assertEqual((len(self.curves), self.t.size), zero.shape)
+        for i, curve in enumerate(self.curves):
+            self.assertTrue(np.allclose(curve(self.t), zero[i]))
+            self.assertTrue(np.allclose(curve.forward(self.t), forward[i]))
+        self.assertTrue(np.allclose([c(5.0) for c in self.curves], self.curve_set(5.0)))
+
+    def test_factor_matrix(self):
+        """Test shape and values of factor matrices."""
+        fmat = self.curve_set.factor_matrix(self.t)
+        self.assertEqual((len(self.curves), self.t.size, 3), fmat.shape)
+        for i, curve in enumerate(self.curves):
+            self.assertTrue(np.allclose(curve.factor_matrix(self.t), fmat[i]))
+        self.assertEqual((len(self.curves), 3), self.curve_set.factor_matrix(0).shape)
+
+    def test_forward_rates_against_curves(self):
+        """Test vectorized forward integrals and rates against individual
+        curves."""
+        T1, T2 = self.t[:-1], self.t[1:]
+        integral = self.curve_set.forward_integral(T1, T2)
+        rate = self.curve_set.forward_rate(T1, T2, compounding="simple")
+        self.assertEqual((len(self.curves), T1.size), integral.shape)
+        for i, curve in enumerate(self.curves):
+            self.assertTrue(np.allclose(curve.forward_integral(T1, T2), integral[i]))
+            self.assertTrue(np.allclose(curve.forward_rate(T1, T2, "simple"), rate[i]))
+        instantaneous = self.curve_set.forward_rate(self.t, self.t)
+        self.assertTrue(np.allclose(self.curve_set.forward(self.t), instantaneous))
+
+    def test_jacobians_against_curves(self):
+        """Test vectorized Jacobians against individual curves."""
+        zero_jacobian = self.curve_set.zero_jacobian(self.t)
+        forward_jacobian = self.curve_set.forward_jacobian(self.t)
+        self.assertEqual((len(self.curves), self.t.size, 4), zero_jacobian.shape)
+        for i, curve in enumerate(self.curves):
+            self.assertTrue(np.allclose(curve.zero_jacobian(self.t), zero_jacobian[i]))
+            self.assertTrue(
+                np.allclose(curve.forward_jacobian(self.t), forward_jacobian[i])
+            )
+
+    def test_negative_maturities(self):
+        """Test loading derivatives and Jacobians for negative and zero
+        maturities against individual curves."""
+        T = np.array([-2.0, -0.5, 0.0, 0.5, 3.0])
+        dfactors = self.curve_set.factor_derivatives(T)
+        zero_jacobian = self.curve_set.zero_jacobian(T)
+        forward_jacobian = self.curve_set.forward_jacobian(T)
+        for i, curve in enumerate(self.curve_set.to_curves()):
+            for dfactor, expected in zip(dfactors, curve.factor_derivatives(T)):
+                self.assertTrue(np.allclose(expected, dfactor[i]))
+            self.assertTrue(np.allclose(curve.zero_jacobian(T), zero_jacobian[i]))
+            self.assertTrue(np.allclose(curve.forward_jacobian(T), forward_jacobian[i]))
+
+    def test_input_not_modified(self):
+        """Test that evaluation leaves time points untouched."""
+        t = np.array([0.0, 1.0])
+        self.curve_set(t)
+        self.assertEqual([0.0, 1.0], t.tolist())
+
+
+class TestNelsonSiegelSvenssonCurveSet(unittest.TestCase):
+    """Tests for vectorized Nelson-Siegel-Svensson curve sets."""
+
+    def setUp(self):
+        self.curves = [
+            NelsonSiegelSvenssonCurve(0.017, -0.023, 0.24, 0.1, 2.2, 3.1),
+            NelsonSiegelSvenssonCurve(0.038, -0.032, -0.019, -0.02, 2.1, 1.04),
+            NelsonSiegelSvenssonCurve(2.05, -1.82, -2.03, 8.25, 0.87, 14.38),
+        ]
+        self.curve_set = NelsonSiegelSvenssonCurveSet.from_curves(self.curves)
+        self.t = np.linspace(0, 30, 31)
+
+    def test_round_trip(self):
+        """Test conversion from and to lists of curves."""
+        self.assertEqual(len(self.curves), len(self.curve_set))
+        self.assertEqual(self.curves, self.curve_set.to_curves())
+        self.assertEqual(self.curves[2], self.curve_set[2])
+
+    def test_zero_and_forward_against_curves(self):
+        """Test vectorized evaluation against individual curves."""
+        zero = self.curve_set(self.t)
+        forward = self.curve_set.forward(self.t)
+        self.assertEqual((len(self.curves), self.t.size), zero.shape)
+        for i, curve in enumerate(self.curves):
+            self.assertTrue(np.allclose(curve(self.t), zero[i]))
+            self.assertTrue(np.allclose(curve.forward(self.t), forward[i]))
+        self.assertTrue(np.allclose([c(0) for c in self.curves], self.curve_set(0)))
+
+    def test_forward_rates_against_curves(self):
+        """Test vectorized forward integrals and rates against individual
+        curves."""
+        T1, T2 = self.t[:-1], self.t[1:]
+        integral = self.curve_set.forward_integral(T1, T2)
+        rate = self.curve_set.forward_rate(T1, 30.0)
+        self.assertEqual((len(self.curves), T1.size), integral.shape)
+        for i, curve in enumerate(self.curves):
+            self.assertTrue(np.allclose(curve.forward_integral(T1, T2), integral[i]))
+            self.assertTrue(np.allclose(curve.forward_rate(T1, 30.0), rate[i]))
+
+    def test_jacobians_against_curves(self):
+        """Test vectorized Jacobians against individual curves."""
+        zero_jacobian = self.curve_set.zero_jacobian(self.t)
+        forward_jacobian = self.curve_set.forward_jacobian(5.0)
+        self.assertEqual((len(self.curves), self.t.size, 6), zero_jacobian.shape)
+        for i, curve in enumerate(self.curves):
+            self.assertTrue(np.allclose(curve.zero_jacobian(self.t), zero_jacobian[i]))
+            self.assertTrue(
+                np.allclose(curve.forward_jacobian(5.0), forward_jacobian[i])
+            )
+
+    def test_negative_maturities(self):
+        """Test loading derivatives and Jacobians for negative and zero
+        maturities against individual curves."""
+        T = np.array([-2.0, -0.5, 0.0, 0.5, 3.0])
+        dfactors = self.curve_set.factor_derivatives(T)
+        zero_jacobian = self.curve_set.zero_jacobian(T)
+        forward_jacobian = self.curve_set.forward_jacobian(T)
+        for i, curve in enumerate(self.curve_set.to_curves()):
+            for dfactor, expected in zip(dfactors, curve.factor_derivatives(T)):
+                self.assertTrue(np.allclose(expected, dfactor[i]))
+            self.assertTrue(np.allclose(curve.zero_jacobian(T), zero_jacobian[i]))
+            self.assertTrue(np.allclose(curve.forward_jacobian(T), forward_jacobian[i]))
+
+    def test_factor_matrix(self):
+        """Test shape and values of factor matrices."""
+        fmat = self.curve_set.factor_matrix(self.t)
+        self.assertEqual((len(self.curves), self.t.size, 4), fmat.shape)
+        for i, curve in enumerate(self.curves):
+            self.assertTrue(np.allclose(curve.factor_matrix(self.t), fmat[i]))
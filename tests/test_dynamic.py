@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelCurveSet
+from nelson_siegel_svensson.dynamic import DynamicNelsonSiegel, calibrate_dynamic_ns
+
+
+def simulate(model, n_dates, noise, seed=0):
+    """Factors and noisy yield panel simulated from model."""
+    rng = np.random.default_rng(seed)
+    chol = np.linalg.cholesky(model.state_covariance)
+    factors = np.empty((n_dates, 3))
+    x = model.mean
+    for i in range(n_dates):
+        x = model.mean + model.transition @ (x - model.mean) + chol @ rng.normal(size=3)
+        factors[i] = x
+    Y = factors @ model.loadings().T
+    return factors, Y + rng.normal(0.0, noise, Y.shape)
+
+
+class TestDynamicNelsonSiegel(unittest.TestCase):
+    """Tests for the dynamic Nelson-Siegel model."""
+
+    def setUp(self):
+        self.t = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+        self.model = DynamicNelsonSiegel(
+            self.t,
+            1.8,
+            [0.04, -0.02, 0.01],
+            np.diag([0.99, 0.95, 0.9]),
+            np.diag([1e-6, 2e-6, 4e-6]),
+            np.full(self.t.size, 1e-8),
+        )
+
+    def test_filter_and_smoother(self):
+        """Test filter and smoother against the textbook recursions with
+        missing quotes."""
+        factors, Y = simulate(self.model, 200, 1e-4)
+        Y[np.random.default_rng(1).random(Y.shape) < 0.2] = np.nan
+        Y[7] = np.nan
+        filtered = self.model.filter(Y)
+        smoothed = self.model.smooth(Y)
+        L, A = self.model.loadings(), self.model.transition
+        x, P = self.model.mean, self.model.initial_covariance()
+        loglikelihood = 0.0
+        for i, y in enumerate(Y):
+            if i > 0:
+                x = self.model.mean + A @ (x - self.model.mean)
+                P = A @ P @ A.T + self.model.state_covariance
+            obs = np.isfinite(y)
+            F = L[obs] @ P @ L[obs].T + np.diag(self.model.observation_variances[obs])
+            v = y[obs] - L[obs] @ x
+            gain = P @ L[obs].T @ np.linalg.inv(F)
+            x, P = x + gain @ v, P - gain @ L[obs] @ P
+            loglikelihood -= 0.5 * (
+                obs.sum() * np.log(2 * np.pi)
+                + np.linalg.slogdet(F)[1]
+                + v @ np.linalg.solve(F, v)
+            )
+            self.assertTrue(np.allclose(x, filtered.means[i], rtol=1e-10, atol=0))
+            self.assertTrue(np.allclose(P, filtered.covariances[i], rtol=1e-8))
+        self.assertAlmostEqual(loglikelihood, filtered.loglikelihood, places=6)
+        means = filtered.means[-1]
+        for i in range(len(Y) - 2, -1, -1):
+            gain = (
+                filtered.covariances[i]
+                @ A.T
+                @ np.linalg.inv(filtered.predicted_covariances[i + 1])
+            )
+            means = filtered.means[i] + gain @ (means - filtered.predicted_means[i + 1])
+            self.assertTrue(np.allclose(means, smoothed.means[i], rtol=1e-8))
+        # smoothing uses all dates
+        self.assertLess(
+            np.mean(np.abs(smoothed.means - factors)),
+            np.mean(np.abs(filtered.means - factors)),
+        )
+        self.assertIsInstance(smoothed.curves(), NelsonSiegelCurveSet)
+        self.assertEqual(len(Y), len(smoothed.curves()))
+
+    def test_calibration(self):
+        """Test recovery of tau and dynamics from a simulated panel."""
+        _, Y = simulate(self.model, 500, 1e-4)
+        model, opt_res = calibrate_dynamic_ns(self.t, Y, max_iter=10)
+        self.assertAlmostEqual(self.model.tau, model.tau, places=1)
+        self.assertEqual(model.tau, opt_res.x[0])
+        self.assertGreater(opt_res.tau_nfev, 0)
+        self.assertTrue(
+            np.allclose(
+                np.diag(self.model.transition), np.diag(model.transition), atol=0.05
+            )
+        )
+        self.assertTrue(np.allclose(model.observation_variances, 1e-8, rtol=0.3))
+        self.assertAlmostEqual(opt_res.loglikelihood, model.loglikelihood(Y))
+        fixed, fixed_res = calibrate_dynamic_ns(self.t, Y, tau=1.0, max_iter=10)
+        self.assertEqual(1.0, fixed.tau)
+        self.assertEqual(0, fixed_res.tau_nfev)
+        self.assertLess(fixed_res.loglikelihood, opt_res.loglikelihood)
+
+    def test_forecast(self):
+        """Test forecasts of curves reverting to the mean."""
+        _, Y = simulate(self.model, 50, 1e-4)
+        curves, covariances = self.model.forecast(Y, horizon=1000)
+        self.assertIsInstance(curves, NelsonSiegelCurveSet)
+        self.assertEqual(1000, len(curves))
+        self.assertEqual((1000, 3, 3), covariances.shape)
+        self.assertAlmostEqual(self.model.mean[0], curves.beta0[-1], places=5)
+        self.assertTrue(
+            np.allclose(covariances[-1], self.model.initial_covariance(), rtol=1e-3)
+        )
+        filtered = self.model.filter(Y)
+        A, mu = self.model.transition, self.model.mean
+        expected = mu + A @ (filtered.means[-1] - mu)
+        first = curves[0]
+        self.assertAlmostEqual(expected[0], first.beta0)
+        self.assertAlmostEqual(expected[1], first.beta1)
+        self.assertAlmostEqual(expected[2], first.beta2)
+        self.assertEqual(self.model.tau, first.tau)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import subprocess
+import sys
+import unittest
+
+
+def _loaded_modules(code: str) -> str:
+    """Output of code run in a fresh interpreter, followed by the heavy
+    optional modules it has imported.
+    """
+    check = (
+        "\nimport sys\n"
+        "print([m for m in ('scipy', 'matplotlib') if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code + check],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+class TestLazyImports(unittest.TestCase):
+    """Tests that SciPy and matplotlib are only imported when needed."""
+
+    def test_package(self):
+        """Test importing the package and its calibration, bond and risk
+        modules."""
+        code = (
+            "import nelson_siegel_svensson, nelson_siegel_svensson.calibrate\n"
+            "import nelson_siegel_svensson.bonds, nelson_siegel_svensson.risk"
+        )
+        self.assertEqual("[]", _loaded_modules(code))
+
+    def test_key_rate_risk(self):
+        """Test that pricing and key-rate risk of (dense) cash flows need
+        no SciPy."""
+        code = (
+            "import numpy as np\n"
+            "from nelson_siegel_svensson import NelsonSiegelCurve\n"
+            "from nelson_siegel_svensson.bonds import bond_durations, bond_prices\n"
+            "from nelson_siegel_svensson.risk import key_rate_risk\n"
+            "curve = NelsonSiegelCurve(0.04, -0.03, 0.02, 1.5)\n"
+            "t = np.array([1.0, 2.0, 5.0, 10.0, 30.0])\n"
+            "times = np.arange(1.0, 11.0)\n"
+            "cash_flows = np.full((2, 10), 0.03)\n"
+            "cash_flows[0, 5:] = 0.0\n"
+            "cash_flows[[0, 1], [4, 9]] += 1.0\n"
+            "prices = bond_prices(curve, cash_flows, times)\n"
+            "assert np.allclose(cash_flows @ curve.discount(times), prices)\n"
+            "yields = curve(np.array([5.0, 10.0]))\n"
+            "assert np.all(bond_durations(cash_flows, times, yields) > 4)\n"
+            "risk = key_rate_risk(curve, t, curve(t), cash_flows, times)\n"
+            "assert risk.sensitivities.shape == (2, 5)"
+        )
+        self.assertEqual("[]", _loaded_modules(code))
+
+    def test_cli_evaluate(self):
+        """Test that evaluating curves via CLI needs neither SciPy nor
+        matplotlib."""
+        code = (
+            "from nelson_siegel_svensson.cli import cli_main\n"
+            "cli_main(['evaluate', '-c', '{\"beta0\": 0.017, \"beta1\": -0.023,"
+            " \"beta2\": 0.24, \"tau\": 2}', '-t', '[1,2,3]'],"
+            " standalone_mode=False)"
+        )
+        self.assertEqual("[]", _loaded_modules(code))
+
+    def test_calibrate(self):
+        """Test that SciPy is imported on calibration."""
+        code = (
+            "import numpy as np\n"
+            "from nelson_siegel_svensson.calibrate import calibrate_ns_ols\n"
+            "t = np.array([1.0, 2.0, 5.0, 10.0])\n"
+            "calibrate_ns_ols(t, 0.02 + 0.001 * t)"
+        )
+        self.assertEqual("['scipy']", _loaded_modules(code))
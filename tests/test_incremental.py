@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+from scipy.optimize import least_squares
+
+from nelson_siegel_svensson import NelsonSiegelCurve, NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.calibrate import CalibrationContext, calibrate_nss_ols_grid
+from nelson_siegel_svensson.incremental import IncrementalCalibrator
+
+
+class TestIncrementalCalibrator(unittest.TestCase):
+    """Tests for warm-started incremental recalibration."""
+
+    def setUp(self):
+        self.t = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 25, 30])
+        self.y_nss = NelsonSiegelSvenssonCurve(0.03, -0.02, 0.01, -0.01, 0.8, 6.0)
+
+    def test_initial_calibration(self):
+        """Test that the initial fit recovers the true curve."""
+        calibrator = IncrementalCalibrator(self.t, self.y_nss(self.t))
+        self.assertFalse(calibrator.opt_res.warm_start)
+        self.assertAlmostEqual(self.y_nss.tau1, calibrator.curve.tau1, places=4)
+        self.assertAlmostEqual(self.y_nss.tau2, calibrator.curve.tau2, places=4)
+
+    def test_initial_calibration_against_grid(self):
+        """Test that the initial fit is as good as `calibrate_nss_ols_grid`
+        on exact data, including taus off the best grid point's basin."""
+        t = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+        y = NelsonSiegelSvenssonCurve(0.028, -0.03, -0.04, -0.015, 1.1, 4.0)(t)
+        calibrator = IncrementalCalibrator(t, y)
+        expected, expected_res = calibrate_nss_ols_grid(t, y)
+        self.assertLess(2 * calibrator.opt_res.cost, 1e-20)
+        self.assertLessEqual(
+            calibrator.opt_res.cost, expected_res.cost * (1 + 1e-6) + 1e-30
+        )
+        self.assertAlmostEqual(expected.tau1, calibrator.curve.tau1, places=6)
+        self.assertAlmostEqual(expected.tau2, calibrator.curve.tau2, places=6)
+        # recalibration from scratch finds the same fit
+        curve, opt_res = calibrator.recalibrate()
+        self.assertAlmostEqual(1.1, curve.tau1, places=6)
+        self.assertAlmostEqual(4.0, curve.tau2, places=6)
+
+    def test_updates(self):
+        """Test warm-started updates against calibration from scratch."""
+        y = self.y_nss(self.t) + 1e-4 * np.sin(self.t)
+        calibrator = IncrementalCalibrator(self.t, y)
+        # unchanged quotes only require betas
+        curve, opt_res = calibrator.update(self.t[3], y[3])
+        self.assertTrue(opt_res.warm_start)
+        self.assertTrue(opt_res.betas_only)
+        self.assertEqual(0, opt_res.nit)
+        # shifted quotes require new taus
+        tau_previous = calibrator.tau
+        y[:4] += 0.002
+        curve, opt_res = calibrator.update(self.t[:4], y[:4])
+        self.assertTrue(opt_res.success)
+        self.assertFalse(opt_res.betas_only)
+        self.assertTrue(np.array_equal(y, calibrator.y))
+        # locally optimal within tolerance (in the basin of the previous taus)
+        context = CalibrationContext(self.t)
+        expected = least_squares(
+            context.residuals, tau_previous, jac=context.jacobian, args=(y,)
+        )
+        self.assertLessEqual(opt_res.cost, expected.cost * (1 + calibrator.ftol))
+        self.assertAlmostEqual(2 * opt_res.cost, np.sum((curve(self.t) - y) ** 2))
+        self.assertTrue(np.allclose(calibrator.tau, [curve.tau1, curve.tau2]))
+        # new maturities are appended
+        curve, opt_res = calibrator.update(40.0, y[-1])
+        self.assertEqual(self.t.size + 1, calibrator.t.size)
+        self.assertEqual(40.0, calibrator.t[-1])
+        self.assertTrue(opt_res.success)
+
+    def test_nelson_siegel(self):
+        """Test incremental calibration of a Nelson-Siegel curve."""
+        y_ns = NelsonSiegelCurve(0.017, -0.023, 0.24, 2.2)
+        calibrator = IncrementalCalibrator(self.t, y_ns(self.t), NelsonSiegelCurve)
+        self.assertAlmostEqual(y_ns.tau, calibrator.curve.tau, places=5)
+        y_ns.tau = 2.5
+        curve, opt_res = calibrator.update(self.t, y_ns(self.t))
+        self.assertTrue(opt_res.success)
+        self.assertAlmostEqual(y_ns.tau, curve.tau, places=5)
+        self.assertAlmostEqual(y_ns.beta2, curve.beta2, places=6)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import unittest
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.calibrate import calibrate_ns_ols, calibrate_nss_ols
+from nelson_siegel_svensson.instrumentation import (
+    StatsCollector,
+    add_calibration_hook,
+    remove_calibration_hook,
+)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Tests for instrumentation of calibrations."""
+
+    def setUp(self):
+        self.t = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+        self.y = NelsonSiegelSvenssonCurve(3, -2, 1, -1, 0.8, 6.0)(self.t)
+
+    def test_callback(self):
+        """Test traces passed to callbacks against plain calibration."""
+        curve, opt_res = calibrate_nss_ols(self.t, self.y, tau0=(1.0, 3.0))
+        traces = []
+        curve_traced, opt_res_traced = calibrate_nss_ols(
+            self.t, self.y, tau0=(1.0, 3.0), callback=traces.append
+        )
+        self.assertTrue(np.allclose(opt_res.x, opt_res_traced.x))
+        self.assertAlmostEqual(curve.beta0, curve_traced.beta0)
+        (trace,) = traces
+        self.assertIs(trace, opt_res_traced.trace)
+        self.assertEqual("calibrate_nss_ols", trace.function)
+        self.assertEqual(self.t.size, trace.n_points)
+        self.assertEqual([1.0, 3.0], trace.tau_path[0])
+        self.assertEqual(trace.nit + 1, len(trace.tau_path))
+        self.assertEqual(opt_res_traced.x.tolist(), trace.tau_path[-1])
+        self.assertEqual(opt_res_traced.nfev, trace.nfev)
+        self.assertTrue(trace.success)
+        self.assertGreater(trace.seconds, trace.seconds_factors + trace.seconds_lstsq)
+        self.assertAlmostEqual(
+            trace.seconds,
+            trace.seconds_factors + trace.seconds_lstsq + trace.seconds_optimizer,
+        )
+        factors = np.asarray(curve.factor_matrix(self.t))
+        self.assertAlmostEqual(np.linalg.cond(factors), trace.condition_number)
+        self.assertGreaterEqual(trace.max_condition_number, trace.condition_number)
+
+    def test_hooks_and_stats(self):
+        """Test registered hooks and aggregated statistics."""
+        traces = []
+        add_calibration_hook(traces.append)
+        try:
+            calibrate_ns_ols(self.t, self.y, tau0=0.5)
+        finally:
+            remove_calibration_hook(traces.append)
+        calibrate_ns_ols(self.t, self.y)
+        self.assertEqual(1, len(traces))
+        with StatsCollector(n_slowest=2) as stats:
+            for _ in range(3):
+                calibrate_ns_ols(self.t, self.y, tau0=0.5)
+                calibrate_nss_ols(self.t, self.y)
+        calibrate_ns_ols(self.t, self.y)
+        fp = io.StringIO()
+        stats.dump(fp)
+        dumped = json.loads(fp.getvalue())
+        self.assertEqual(
+            {"calibrate_ns_ols", "calibrate_nss_ols"}, set(dumped["functions"])
+        )
+        ns_stats = dumped["functions"]["calibrate_ns_ols"]
+        self.assertEqual(3, ns_stats["count"])
+        self.assertEqual(0, ns_stats["failures"])
+        self.assertEqual(traces[0].nfev, ns_stats["mean_nfev"])
+        self.assertEqual(traces[0].nit, ns_stats["max_nit"])
+        self.assertEqual(2, len(dumped["slowest"]))
@@ -5,11 +5,23 @@ import unittest
 import numpy as np
 from scipy.optimize import minimize
 
-from nelson_siegel_svensson import NelsonSiegelCurve
+from nelson_siegel_svensson import NelsonSiegelCurve, NelsonSiegelCurveSet
 from nelson_siegel_svensson.calibrate import (
     betas_ns_ols,
+    betas_ns_robust,
+    betas_ns_wls,
     errorfn_ns_ols,
+    gradient_ns_ols,
+    jacobian_ns_ols,
+    residuals_ns_ols,
     calibrate_ns_ols,
+    calibrate_ns_ols_bounded,
+    calibrate_ns_ols_panel,
+    calibrate_ns_ols_grid,
+    calibrate_ns_robust,
+    calibrate_ns_wls,
+    empirical_factors,
+    empirical_factors_panel,
 )
 
 
@@ -39,6 +51,30 @@ class TestNelsonSiegelCurveCalibration(unittest.TestCase):
         error2 = errorfn_ns_ols(self.y.tau * 1.1, t, y_target)
         self.assertNotAlmostEqual(0.0, error2)
 
+    def test_nelson_siegel_ols_derivatives(self):
+        """Test analytic gradient and jacobian with respect to tau against
+        finite differences (for tau off the optimum and noisy values).
+        """
+        t = np.linspace(0, 30)
+        y_target = self.y(t) + 1e-3 * np.sin(t)
+        tau = np.array([1.5])
+        h = 1e-6
+        grad_numeric = (
+            errorfn_ns_ols(tau + h, t, y_target) - errorfn_ns_ols(tau - h, t, y_target)
+        ) / (2 * h)
+        grad = gradient_ns_ols(tau, t, y_target)
+        self.assertEqual((1,), grad.shape)
+        self.assertAlmostEqual(grad_numeric, grad[0], places=8)
+        jac_numeric = (
+            residuals_ns_ols(tau + h, t, y_target)
+            - residuals_ns_ols(tau - h, t, y_target)
+        ) / (2 * h)
+        jac = jacobian_ns_ols(tau, t, y_target)
+        self.assertEqual((t.size, 1), jac.shape)
+        self.assertTrue(np.allclose(jac_numeric, jac[:, 0], atol=1e-8))
+        residuals = residuals_ns_ols(tau, t, y_target)
+        self.assertTrue(np.allclose(grad, 2 * jac.T @ residuals))
+
     def test_nelson_siegel_ols_calibration(self):
         """Test ols based calibration of Nelson-Siegel model."""
         t = np.linspace(0, 30)
@@ -96,3 +132,139 @@ class TestNelsonSiegelCurveCalibration(unittest.TestCase):
                 errorfn_ns_ols, x0=tau0, args=(t, y_target), bounds=((0.08, None),)
             )
             self.assertAlmostEqual(self.y.tau, opt_res.x[0], places=places_tau)
+
+    def test_nelson_siegel_ols_panel_calibration(self):
+        """Test ols based calibration of many Nelson-Siegel curves at once."""
+        t = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+        curves = NelsonSiegelCurveSet(
+            [0.017, 0.03, 0.042, 0.02],
+            [-0.023, -0.01, -0.032, 0.01],
+            [0.24, -0.02, -0.027, 0.0],
+            [2.2, 1.1, 1.7, 5.0],
+        )
+        Y = curves(t)
+        Y[1, 3] = np.nan
+        mask = np.zeros(Y.shape, dtype=bool)
+        mask[2, [0, 5]] = True
+        Y[2, 0] = 1.0  # masked outlier
+        Y[3, 2:] = np.nan  # too few points
+        y_hat, opt_res = calibrate_ns_ols_panel(t, Y, mask=mask)
+        self.assertEqual(4, len(y_hat))
+        self.assertEqual([True, True, True, False], opt_res.success.tolist())
+        for i in range(3):
+            self.assertAlmostEqual(curves.tau[i], y_hat.tau[i], places=6)
+            self.assertAlmostEqual(curves.beta0[i], y_hat.beta0[i], places=8)
+            self.assertAlmostEqual(curves.beta1[i], y_hat.beta1[i], places=8)
+            self.assertAlmostEqual(curves.beta2[i], y_hat.beta2[i], places=8)
+        self.assertTrue(np.isnan(y_hat.beta0[3]))
+        self.assertTrue(np.isnan(y_hat.tau[3]))
+        self.assertTrue(np.isnan(opt_res.x[3]).all())
+        # single rows are fitted at least as well as by single curve calibration
+        y_hat, opt_res = calibrate_ns_ols_panel(t, self.y(t))
+        curve, _ = calibrate_ns_ols(t, self.y(t))
+        self.assertAlmostEqual(self.y.tau, y_hat.tau[0], places=6)
+        self.assertLessEqual(opt_res.fun[0], errorfn_ns_ols(curve.tau, t, self.y(t)))
+        self.assertFalse(opt_res.stalled.any())
+        # without tolerances, iterations only stop as the damping blows up
+        Y = curves(t)[:3] + np.random.default_rng(0).normal(0.0, 1e-4, (3, t.size))
+        y_hat, opt_res = calibrate_ns_ols_panel(t, Y, xtol=0.0, ftol=0.0)
+        self.assertEqual([True] * 3, opt_res.stalled.tolist())
+        self.assertFalse(opt_res.success.any())
+        self.assertIn("0 of 3 curves converged, 3 stalled", opt_res.message)
+
+    def test_nelson_siegel_ols_panel_warm_start(self):
+        """Test panel calibration warm-started by taus per row."""
+        t = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+        curves = NelsonSiegelCurveSet(
+            [0.017, 0.03, 0.042],
+            [-0.023, -0.01, -0.032],
+            [0.24, -0.02, -0.027],
+            [2.2, 1.1, 1.7],
+        )
+        Y = curves(t)
+        y_hat, opt_res = calibrate_ns_ols_panel(t, Y, tau0=curves.tau * 1.2)
+        self.assertTrue(opt_res.success.all())
+        self.assertTrue(np.allclose(curves.tau, y_hat.tau))
+        self.assertTrue(np.allclose(curves.beta2, y_hat.beta2))
+        # rows without finite warm start fall back to the grid search
+        y_hat, opt_res = calibrate_ns_ols_panel(t, Y, tau0=[np.nan, 1.0, 2.0])
+        self.assertTrue(opt_res.success.all())
+        self.assertTrue(np.allclose(curves.tau, y_hat.tau))
+        y_hat, opt_res = calibrate_ns_ols_panel(t, Y, tau0=2.0)
+        self.assertTrue(np.allclose(curves.tau, y_hat.tau))
+
+    def test_empirical_factors_panel(self):
+        """Test empirical factors of a yield matrix against those of
+        interpolated yields."""
+        t = np.array([0.5, 0.25, 1, 3, 5, 7, 10, 15, 20, 30])
+        curves = NelsonSiegelCurveSet(
+            [0.017, 0.03, 0.042, 0.02],
+            [-0.023, -0.01, -0.032, 0.01],
+            [0.24, -0.02, -0.027, 0.0],
+            [2.2, 1.1, 1.7, 5.0],
+        )
+        Y = curves(t)
+        Y[1, 1] = np.nan
+        mask = np.zeros(Y.shape, dtype=bool)
+        mask[2, 6] = True
+        Y[3] = np.nan
+        level, slope, curvature = empirical_factors_panel(t, Y, mask=mask)
+        for i in range(3):
+            valid = np.isfinite(Y[i]) & ~mask[i]
+            order = np.argsort(t[valid])
+            key = np.interp([0.25, 2.0, 10.0], t[valid][order], Y[i, valid][order])
+            expected = empirical_factors(*key)
+            self.assertAlmostEqual(expected[0], level[i], places=14)
+            self.assertAlmostEqual(expected[1], slope[i], places=14)
+            self.assertAlmostEqual(expected[2], curvature[i], places=14)
+        self.assertAlmostEqual(Y[0, 1], Y[0, 6] - slope[0], places=14)
+        self.assertTrue(np.isnan(level[3]))
+
+    def test_nelson_siegel_ols_grid_calibration(self):
+        """Test calibration of Nelson-Siegel model by grid search and
+        local refinement."""
+        t = np.linspace(0, 30)
+        y_target = self.y(t)
+        y_hat, opt_res = calibrate_ns_ols_grid(t, y_target)
+        self.assertTrue(opt_res.success)
+        self.assertAlmostEqual(self.y.tau, y_hat.tau, places=6)
+        self.assertAlmostEqual(self.y.beta2, y_hat.beta2, places=6)
+        self.assertEqual(30, opt_res.grid_nfev)
+        self.assertEqual({"grid", "refine", "total"}, set(opt_res.timing))
+        # out of range taus are limited by the grid
+        y_hat, opt_res = calibrate_ns_ols_grid(t, y_target, tau_grid=[0.1, 1.0])
+        self.assertAlmostEqual(1.0, y_hat.tau)
+
+    def test_nelson_siegel_ols_bounded_calibration(self):
+        """Test bounded calibration of Nelson-Siegel model, also from
+        starting values out of bounds."""
+        t = np.linspace(0, 30)
+        y_target = self.y(t)
+        for tau0 in [2.0, -1.0, 100.0]:
+            y_hat, opt_res = calibrate_ns_ols_bounded(t, y_target, tau0=tau0)
+            self.assertTrue(opt_res.success, tau0)
+            self.assertAlmostEqual(self.y.beta0, y_hat.beta0, places=8)
+            self.assertAlmostEqual(self.y.tau, y_hat.tau, places=8)
+        y_hat, opt_res = calibrate_ns_ols_bounded(
+            t, y_target, tau0=10.0, bounds=(0.1, 1.0)
+        )
+        self.assertLessEqual(y_hat.tau, 1.0 * (1 + 1e-12))
+
+    def test_nelson_siegel_weighted_calibration(self):
+        """Test weighted and robust betas and calibration with an
+        outlier."""
+        t = np.linspace(0.5, 30, 20)
+        y_target = self.y(t)
+        y_target[5] += 0.01
+        weights = np.ones(t.size)
+        weights[5] = 0.0
+        y_wls, _ = betas_ns_wls(self.y.tau, t, y_target, weights)
+        self.assertAlmostEqual(self.y.beta2, y_wls.beta2, places=10)
+        y_hat, irls_res = betas_ns_robust(self.y.tau, t, y_target, loss="bisquare")
+        self.assertEqual(0.0, irls_res.weights[5])
+        self.assertAlmostEqual(self.y.beta2, y_hat.beta2, places=10)
+        y_wls, opt_res = calibrate_ns_wls(t, y_target, weights)
+        self.assertAlmostEqual(self.y.tau, y_wls.tau, places=6)
+        y_hat, opt_res = calibrate_ns_robust(t, y_target, loss="bisquare")
+        self.assertAlmostEqual(self.y.tau, y_hat.tau, places=6)
+        self.assertEqual(0.0, opt_res.weights[5])
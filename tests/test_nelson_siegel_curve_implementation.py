@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import json
 import unittest
+from dataclasses import fields, replace
 
 import numpy as np
 
@@ -54,3 +56,152 @@ class TestNelsonSiegelCurveImplementation(unittest.TestCase):
         fmat = self.y.factor_matrix(t)
         self.assertEqual((n, 3), fmat.shape)
         self.assertEqual((3,), self.y.factor_matrix(0.123).shape)
+
+    def test_factors_out(self):
+        """Test factor computation into preallocated buffers"""
+        t = np.array([-1.0, 0.0, 1e-12, 0.5, 5.0, 30.0])
+        t_copy = t.copy()
+        factors = self.y.factors(t)
+        self.assertTrue(np.array_equal(t_copy, t))  # input not modified
+        self.assertEqual([1.0, 0.0], [factors[0][0], factors[1][0]])
+        self.assertEqual([1.0, 0.0], [factors[0][1], factors[1][1]])
+        out = (np.empty_like(t), np.empty_like(t))
+        result = self.y.factors(t, out=out)
+        self.assertIs(out[0], result[0])
+        self.assertIs(out[1], result[1])
+        self.assertTrue(np.array_equal(factors, result))
+        fmat_out = np.empty((t.size, 3))
+        fmat = self.y.factor_matrix(t, out=fmat_out)
+        self.assertIs(fmat_out, fmat)
+        self.assertTrue(
+            np.array_equal(np.column_stack((np.ones(t.size),) + factors), fmat)
+        )
+        self.assertTrue(self.y.factor_matrix(t).flags["C_CONTIGUOUS"])
+        self.assertTrue(
+            np.array_equal(fmat[4:], self.y.factor_matrix(np.array([5, 30])))
+        )
+
+    def test_factor_derivatives(self):
+        """Test derivatives of factor loadings against finite differences"""
+        t = np.linspace(0, 25, 50)
+        h = 1e-6
+        y_up = NelsonSiegelCurve(0, 0, 0, self.y.tau + h)
+        y_down = NelsonSiegelCurve(0, 0, 0, self.y.tau - h)
+        dfmat_numeric = (y_up.factor_matrix(t) - y_down.factor_matrix(t)) / (2 * h)
+        dfmat = self.y.factor_matrix_derivatives(t)
+        self.assertEqual((1, 50, 3), dfmat.shape)
+        self.assertTrue(np.allclose(dfmat[0], dfmat_numeric, atol=1e-8))
+        self.assertEqual((0, 0), self.y.factor_derivatives(0.0))
+
+    def test_scalar_evaluation(self):
+        """Test scalar evaluation path against array evaluation"""
+        t = np.array([0.0, 0.5, 1.0, 5.0, 30.0])
+        for method in ("zero", "forward", "discount"):
+            y_array = getattr(self.y, method)(t)
+            y_scalar = [getattr(self.y, method)(float(t_i)) for t_i in t]
+            self.assertIsInstance(y_scalar[1], float)
+            self.assertTrue(np.allclose(y_array, y_scalar, rtol=1e-14), method)
+        self.assertAlmostEqual(np.exp(-self.y(5) * 5), self.y.discount(5))
+        # tiny times: the scalar path agrees with the array path (expm1)
+        for t_i in (1e-10, 1e-300):
+            for method in ("zero", "discount"):
+                y_array = getattr(self.y, method)(np.array([t_i]))[0]
+                y_scalar = getattr(self.y, method)(t_i)
+                self.assertTrue(np.isclose(y_array, y_scalar, rtol=1e-12, atol=0))
+        y = NelsonSiegelCurve(0.017, -0.023, 0.24, 2.2)
+        y.tau = 4.0  # reciprocal of tau is used
+        self.assertAlmostEqual(y(np.array([5.0]))[0], y(5.0), places=15)
+        y_array_tau = NelsonSiegelCurve(0.017, -0.023, 0.24, np.array([2.2]))
+        self.assertEqual((1,), y_array_tau.zero(5.0).shape)
+
+    def test_vars_round_trip(self):
+        """Test that vars of a curve contains exactly its parameters."""
+        y = NelsonSiegelCurve(**vars(self.y))
+        self.assertEqual(self.y, y)
+        y(5.0)  # scalar evaluation keeps no state on the instance
+        self.assertEqual([f.name for f in fields(y)], list(vars(y)))
+        self.assertEqual(self.y, NelsonSiegelCurve(**json.loads(json.dumps(vars(y)))))
+
+    def test_annuity_and_par_rate(self):
+        """Test annuities and par rates against payment-wise sums"""
+        T = np.array([0.25, 1.0, 2.5, 10.0])
+        for frequency in (1, 2, 4):
+            annuity = self.y.annuity(T, frequency)
+            par_rate = self.y.par_rate(T, frequency)
+            self.assertEqual(T.shape, annuity.shape)
+            for T_i, annuity_i, par_rate_i in zip(T, annuity, par_rate):
+                times = np.arange(T_i, 0, -1 / frequency)
+                accruals = np.minimum(times, 1 / frequency)
+                discounts = [self.y.discount(float(t)) for t in times]
+                self.assertAlmostEqual(np.dot(accruals, discounts), annuity_i)
+                # bond paying the par rate is priced at par
+                price = par_rate_i * annuity_i + self.y.discount(float(T_i))
+                self.assertAlmostEqual(1.0, price)
+        self.assertIsInstance(self.y.par_rate(5.0, 2), float)
+        self.assertAlmostEqual(
+            self.y.par_rate(5.0, 2), self.y.par_rate(T[[2]] * 2, 2)[0]
+        )
+        flat = NelsonSiegelCurve(0.03, 0.0, 0.0, 1.0)
+        self.assertAlmostEqual(np.exp(0.03) - 1, flat.par_rate(7.0))
+        # the limit at maturity 0 is the short rate, approached smoothly
+        short_rate = self.y.beta0 + self.y.beta1
+        with np.errstate(all="raise"):
+            self.assertAlmostEqual(short_rate, self.y.par_rate(0.0), places=15)
+            par_rate = self.y.par_rate(np.array([0.0, 1e-300, 1e-12]), 2)
+        self.assertTrue(np.allclose(short_rate, par_rate, rtol=1e-9, atol=0))
+        self.assertEqual(0.0, self.y.annuity(0.0))
+        self.assertRaises(ValueError, self.y.par_rate, -1.0)
+
+    def test_forward_integral_and_forward_rate(self):
+        """Test closed-form integrals of the forward curve and forward
+        rates between two times against quadrature and zero rates."""
+        from scipy.integrate import quad
+
+        T1 = np.array([0.0, 0.5, 2.0, 10.0, 7.0, 3.0])
+        T2 = np.array([1.0, 0.5, 2.0 + 1e-9, 30.0, 2.0, 3.0])
+        integral = self.y.forward_integral(T1, T2)
+        self.assertEqual(T1.shape, integral.shape)
+        for T1_i, T2_i, integral_i in zip(T1, T2, integral):
+            expected, _ = quad(self.y.forward, T1_i, T2_i, epsabs=1e-14)
+            self.assertAlmostEqual(expected, integral_i, places=12)
+        self.assertTrue(
+            np.allclose(self.y(T2) * T2 - self.y(T1) * T1, integral, atol=1e-15)
+        )
+        rate = self.y.forward_rate(T1, T2)
+        self.assertAlmostEqual(self.y.forward(0.5), rate[1], places=15)
+        self.assertAlmostEqual(self.y.forward(2.0), rate[2], places=9)
+        self.assertAlmostEqual(self.y.forward(3.0), rate[5], places=15)
+        self.assertAlmostEqual(integral[3] / 20.0, rate[3], places=15)
+        simple = self.y.forward_rate(T1[3:5], T2[3:5], compounding="simple")
+        expected = (self.y.discount(T1[3:5]) / self.y.discount(T2[3:5]) - 1) / (
+            T2[3:5] - T1[3:5]
+        )
+        self.assertTrue(np.allclose(expected, simple, rtol=1e-12))
+        # broadcasting of start and end times
+        self.assertEqual(
+            (3,), self.y.forward_rate(1.0, np.array([2.0, 3.0, 4.0])).shape
+        )
+        flat = NelsonSiegelCurve(0.03, 0.0, 0.0, 1.0)
+        self.assertAlmostEqual(0.03, flat.forward_rate(2.0, 5.0), places=15)
+        self.assertAlmostEqual(
+            np.expm1(0.03), flat.forward_rate(2.0, 3.0, compounding="simple")
+        )
+        self.assertRaises(AssertionError, flat.forward_rate, 2.0, 3.0, "annual")
+
+    def test_zero_and_forward_jacobians(self):
+        """Test analytic Jacobians of zero and forward rates with respect
+        to the parameters against central differences."""
+        T = np.array([0.0, 0.01, 0.5, 1.0, 5.0, 10.0, 30.0])
+        h = 1e-6
+        for method in ("zero", "forward"):
+            jacobian = getattr(self.y, method + "_jacobian")(T)
+            self.assertEqual(T.shape + (len(fields(self.y)),), jacobian.shape)
+            for j, field in enumerate(fields(self.y)):
+                value = getattr(self.y, field.name)
+                up = getattr(replace(self.y, **{field.name: value + h}), method)(T)
+                down = getattr(replace(self.y, **{field.name: value - h}), method)(T)
+                self.assertTrue(
+                    np.allclose((up - down) / (2 * h), jacobian[:, j], atol=1e-8)
+                )
+            scalar = getattr(self.y, method + "_jacobian")(5.0)
+            self.assertTrue(np.array_equal(jacobian[4], scalar))
@@ -10,6 +10,7 @@ import click
 from click.testing import CliRunner
 
 from nelson_siegel_svensson import cli, NelsonSiegelCurve, NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.calibrate import calibrate_ns_ols_grid
 
 
 class TestNelson_siegel_svensson(unittest.TestCase):
@@ -56,6 +57,59 @@ class TestNelson_siegel_svensson(unittest.TestCase):
         self.assertEqual(0, result.exit_code)
         self.assertIn("0.0758359", result.output)
 
+    def test_cli_evaluate_batch(self):
+        """Test batch mode of evaluate CLI."""
+        t = [0.0, 1.0, 2.5]
+        expected = np.array([self.y1(np.array(t)), self.y2(np.array(t))])
+        jsonl = "\n".join(
+            [
+                json.dumps(dict(asdict(self.y1), id="a,1")),
+                json.dumps(asdict(self.y2)),
+            ]
+        )
+        csv_rows = [
+            "id,beta0,beta1,beta2,beta3,tau1,tau2",
+            "a,0.017,-0.023,0.24,0,2.2,2.2",
+            "b,0.017,-0.023,0.24,0.1,2.2,3.1",
+        ]
+        param = ["evaluate", "-t", json.dumps(t), "-b", "-", "--chunksize", "1"]
+        result = self.runner.invoke(cli.cli_main, param, input=jsonl)
+        self.assertEqual(0, result.exit_code, result.output)
+        lines = result.output.splitlines()
+        self.assertEqual("id,0.0,1.0,2.5", lines[0])
+        self.assertTrue(lines[1].startswith('"a,1",'))
+        self.assertTrue(lines[2].startswith(","))
+        values = np.array([line.rsplit(",", 3)[1:] for line in lines[1:]], float)
+        self.assertTrue(np.array_equal(expected, values))
+        result = self.runner.invoke(
+            cli.cli_main,
+            param + ["--format", "csv", "--output-format", "jsonl"],
+            input="\n".join(csv_rows),
+        )
+        self.assertEqual(0, result.exit_code, result.output)
+        rows = [json.loads(line) for line in result.output.splitlines()]
+        self.assertEqual(["a", "b"], [row["id"] for row in rows])
+        self.assertTrue(np.allclose(expected, [row["values"] for row in rows]))
+        with self.runner.isolated_filesystem():
+            result = self.runner.invoke(
+                cli.cli_main, param + ["-o", "values.npy"], input=jsonl
+            )
+            self.assertEqual(0, result.exit_code, result.output)
+            self.assertTrue(np.array_equal(expected, np.load("values.npy")))
+            result = self.runner.invoke(
+                cli.cli_main, param + ["-o", "values.npy"], input=""
+            )
+            self.assertEqual((0, 3), np.load("values.npy").shape)
+        result = self.runner.invoke(cli.cli_main, param, input='{"beta0": 0.017}\n')
+        self.assertNotEqual(0, result.exit_code)
+        self.assertIn("invalid curve in line 1", result.output)
+        result = self.runner.invoke(cli.cli_main, param, input=jsonl + "\n{beta0")
+        self.assertNotEqual(0, result.exit_code)
+        self.assertIn("invalid curve in line 3", result.output)
+        self.assertIsInstance(result.exception, SystemExit)
+        result = self.runner.invoke(cli.cli_main, ["evaluate", "-t", "[1]"])
+        self.assertNotEqual(0, result.exit_code)
+
     def test_cli_calibrate(self):
         """Test calibrate CLI."""
         param = ["calibrate", "-t", json.dumps(self.t), "-y", json.dumps(self.y)]
@@ -74,6 +128,89 @@ class TestNelson_siegel_svensson(unittest.TestCase):
         )
         self.assertEqual(0, result.exit_code)
         self.assertIn("0.04179", result.output)
+        result = self.runner.invoke(cli.cli_main, param + ["--method", "bounded"])
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn("tau2", json.loads(result.output))
+        result = self.runner.invoke(
+            cli.cli_main, param + ["--nelson-siegel", "--method", "grid"]
+        )
+        self.assertEqual(0, result.exit_code, result.output)
+        expected, _ = calibrate_ns_ols_grid(np.array(self.t), np.array(self.y))
+        self.assertEqual(asdict(expected), json.loads(result.output))
+
+    def test_cli_calibrate_batch(self):
+        """Test batch mode of calibrate CLI."""
+        single = self.runner.invoke(
+            cli.cli_main,
+            ["calibrate", "-t", json.dumps(self.t), "-y", json.dumps(self.y)],
+        )
+        expected = json.loads(single.output)
+        jsonl = "\n".join(
+            [
+                json.dumps({"id": "a", "times": self.t, "values": self.y}),
+                json.dumps({"values": self.y}),
+            ]
+        )
+        csv_rows = [
+            ",".join(["id"] + [str(t) for t in self.t]),
+            ",".join(["a"] + [str(y) for y in self.y]),
+            ",".join(["b"] + [str(y) for y in self.y[:-1]] + [""]),
+        ]
+        for param, stdin in [
+            (["-b", "-", "-t", json.dumps(self.t)], jsonl),
+            (["-b", "-", "-t", json.dumps(self.t), "-j", "2"], jsonl),
+            (["-b", "-", "--format", "csv"], "\n".join(csv_rows)),
+        ]:
+            result = self.runner.invoke(
+                cli.cli_main, ["calibrate"] + param, input=stdin
+            )
+            self.assertEqual(0, result.exit_code, result.output)
+            first, second = [json.loads(line) for line in result.output.splitlines()]
+            self.assertEqual("a", first.pop("id"))
+            self.assertTrue(first.pop("success"))
+            for key in ("nfev", "sse", "seconds"):
+                self.assertIn(key, first)
+                del first[key]
+            self.assertEqual(expected, first)
+        # missing value of second CSV task dropped
+        self.assertEqual("b", second["id"])
+        self.assertNotEqual(expected["beta0"], second["beta0"])
+        with self.runner.isolated_filesystem():
+            with open("tasks.csv", "w") as f:
+                f.write("\n".join(csv_rows))
+            result = self.runner.invoke(cli.cli_main, ["calibrate", "-b", "tasks.csv"])
+            self.assertEqual(0, result.exit_code, result.output)
+            self.assertEqual(2, len(result.output.splitlines()))
+        result = self.runner.invoke(
+            cli.cli_main, ["calibrate", "-b", "-"], input='{"values": [1.0]}\n'
+        )
+        self.assertNotEqual(0, result.exit_code)
+        self.assertIn("invalid task in line 1", result.output)
+        result = self.runner.invoke(cli.cli_main, ["calibrate", "-t", "[1, 2]"])
+        self.assertNotEqual(0, result.exit_code)
+
+    def test_cli_calibrate_many(self):
+        """Test calibrate-many CLI."""
+        jobs = [
+            {"times": self.t, "values": self.y},
+            {"times": self.t[1:], "values": self.y[1:]},
+        ]
+        stdin = "\n".join(json.dumps(job) for job in jobs) + "\n"
+        param = ["calibrate-many", "--executor", "serial", "--nelson-siegel"]
+        result = self.runner.invoke(cli.cli_main, param, input=stdin)
+        self.assertEqual(0, result.exit_code)
+        lines = result.output.splitlines()
+        self.assertEqual(2, len(lines))
+        first = json.loads(lines[0])
+        self.assertTrue(first.pop("success"))
+        for key in ("nfev", "sse", "seconds"):
+            first.pop(key)
+        single = self.runner.invoke(
+            cli.cli_main,
+            ["calibrate", "-t", json.dumps(self.t), "-y", json.dumps(self.y)]
+            + ["--nelson-siegel"],
+        )
+        self.assertEqual(json.loads(single.output), first)
 
     def test_cli_plot(self):
         """Test plot CLI."""
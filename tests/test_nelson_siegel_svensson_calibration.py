@@ -5,11 +5,24 @@ import unittest
 import numpy as np
 from scipy.optimize import minimize
 
-from nelson_siegel_svensson import NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson import (
+    NelsonSiegelSvenssonCurve,
+    NelsonSiegelSvenssonCurveSet,
+)
 from nelson_siegel_svensson.calibrate import (
     betas_nss_ols,
+    betas_nss_robust,
+    betas_nss_wls,
     errorfn_nss_ols,
+    gradient_nss_ols,
+    jacobian_nss_ols,
+    residuals_nss_ols,
     calibrate_nss_ols,
+    calibrate_nss_ols_bounded,
+    calibrate_nss_ols_panel,
+    calibrate_nss_ols_grid,
+    calibrate_nss_robust,
+    calibrate_nss_wls,
 )
 
 
@@ -42,6 +55,33 @@ class TestNelsonSiegelSvenssonCurveCalibration(unittest.TestCase):
         error2 = errorfn_nss_ols(tau * 1.1, t, y_target)
         self.assertNotAlmostEqual(0.0, error2)
 
+    def test_nelson_siegel_svensson_ols_derivatives(self):
+        """Test analytic gradient and jacobian with respect to tau1 and tau2
+        against finite differences (for taus off the optimum and noisy
+        values).
+        """
+        t = np.linspace(0, 30)
+        y_target = self.y(t) + 1e-3 * np.sin(t)
+        tau = np.array([1.5, 4.0])
+        h = 1e-6
+        grad = gradient_nss_ols(tau, t, y_target)
+        jac = jacobian_nss_ols(tau, t, y_target)
+        self.assertEqual((2,), grad.shape)
+        self.assertEqual((t.size, 2), jac.shape)
+        for i, dtau in enumerate(np.eye(2) * h):
+            grad_numeric = (
+                errorfn_nss_ols(tau + dtau, t, y_target)
+                - errorfn_nss_ols(tau - dtau, t, y_target)
+            ) / (2 * h)
+            self.assertAlmostEqual(grad_numeric, grad[i], places=8)
+            jac_numeric = (
+                residuals_nss_ols(tau + dtau, t, y_target)
+                - residuals_nss_ols(tau - dtau, t, y_target)
+            ) / (2 * h)
+            self.assertTrue(np.allclose(jac_numeric, jac[:, i], atol=1e-8))
+        residuals = residuals_nss_ols(tau, t, y_target)
+        self.assertTrue(np.allclose(grad, 2 * jac.T @ residuals))
+
     def test_nelson_siegel_svensson_ols_calibration(self):
         """Test ols based calibration of Nelson-Siegel-Svensson model."""
         t = np.linspace(0, 30)
@@ -79,3 +119,154 @@ class TestNelsonSiegelSvenssonCurveCalibration(unittest.TestCase):
         tau_hat_2 = minimize(errorfn_nss_ols, x0=tau0[::-1], args=(t, y_target)).x
         self.assertLess(tau_hat_1[0], tau_hat_1[1])
         self.assertGreater(tau_hat_2[0], tau_hat_2[1])
+
+    def test_nelson_siegel_svensson_ols_panel_calibration(self):
+        """Test ols based calibration of many Nelson-Siegel-Svensson
+        curves at once."""
+        t = np.array([0.25, 0.5, 1, 2, 3, 4, 5, 7, 10, 15, 20, 25, 30])
+        curves = NelsonSiegelSvenssonCurveSet.from_curves(
+            [
+                self.y,
+                NelsonSiegelSvenssonCurve(0.038, -0.032, -0.019, -0.02, 2.1, 1.04),
+                NelsonSiegelSvenssonCurve(0.03, -0.02, 0.01, -0.01, 0.8, 6.0),
+            ]
+        )
+        Y = curves(t)
+        Y[2, [1, 6]] = np.nan
+        y_hat, opt_res = calibrate_nss_ols_panel(t, Y)
+        self.assertEqual(3, len(y_hat))
+        self.assertTrue(opt_res.success.all())
+        valid = np.isfinite(Y)
+        self.assertTrue(np.allclose(Y[valid], y_hat(t)[valid], atol=1e-10))
+        self.assertTrue(np.allclose(curves.tau1, y_hat.tau1))
+        self.assertTrue(np.allclose(curves.tau2, y_hat.tau2))
+        # panel fit is at least as good as the single curve calibration
+        for i in range(len(y_hat)):
+            valid = np.isfinite(Y[i])
+            _, single_res = calibrate_nss_ols(t[valid], Y[i, valid])
+            self.assertLessEqual(opt_res.fun[i], single_res.fun + 1e-12)
+        # warm-started by the taus of the previous calibration
+        warm_hat, warm_res = calibrate_nss_ols_panel(t, Y, tau0=opt_res.x)
+        self.assertTrue(warm_res.success.all())
+        self.assertTrue(np.all(warm_res.nit <= 2))
+        self.assertTrue(np.allclose(opt_res.x, warm_res.x))
+        # one pair for all rows (a local fit only)
+        warm_hat, warm_res = calibrate_nss_ols_panel(t, Y, tau0=(1.0, 5.0))
+        self.assertEqual((3, 2), warm_res.x.shape)
+        self.assertAlmostEqual(curves.tau1[2], warm_hat.tau1[2], places=6)
+        # too few points to fit the first row
+        Y[0, 3:] = np.nan
+        y_hat, opt_res = calibrate_nss_ols_panel(t, Y)
+        self.assertEqual([False, True, True], opt_res.success.tolist())
+        self.assertTrue(np.isnan(opt_res.x[0]).all())
+        self.assertTrue(np.isnan(y_hat.tau1[0]) and np.isnan(y_hat.tau2[0]))
+        self.assertTrue(np.isnan(y_hat.beta0[0]) and np.isnan(y_hat.beta3[0]))
+        self.assertTrue(np.isfinite(opt_res.x[1:]).all())
+
+    def test_nelson_siegel_svensson_ols_grid_calibration(self):
+        """Test calibration of Nelson-Siegel-Svensson model by grid search
+        and local refinement, which recovers parameters in contrast to
+        `calibrate_nss_ols` with default starting values."""
+        t = np.linspace(0, 30)
+        y_target = self.y(t)
+        y_hat, opt_res = calibrate_nss_ols_grid(t, y_target)
+        self.assertTrue(opt_res.success)
+        places = 4
+        self.assertAlmostEqual(self.y.beta0, y_hat.beta0, places=places)
+        self.assertAlmostEqual(self.y.beta1, y_hat.beta1, places=places)
+        self.assertAlmostEqual(self.y.beta2, y_hat.beta2, places=places)
+        self.assertAlmostEqual(self.y.beta3, y_hat.beta3, places=places)
+        self.assertAlmostEqual(self.y.tau1, y_hat.tau1, places=places)
+        self.assertAlmostEqual(self.y.tau2, y_hat.tau2, places=places)
+        self.assertLessEqual(
+            2 * opt_res.cost, calibrate_nss_ols(t, y_target)[1].fun + 1e-15
+        )
+        self.assertEqual(2, opt_res.x.size)
+        self.assertEqual(len(opt_res.starts), len(opt_res.local_nfev))
+        y_hat, opt_res = calibrate_nss_ols_grid(
+            t, y_target, tau_grid=np.geomspace(0.5, 10, 10), n_starts=1
+        )
+        self.assertEqual(1, len(opt_res.starts))
+        self.assertEqual(100, opt_res.grid_nfev)
+
+    def test_nelson_siegel_svensson_ols_bounded_calibration(self):
+        """Test bounded calibration of Nelson-Siegel-Svensson model keeping
+        the taus within bounds and separated, also from infeasible or
+        swapped starting values."""
+        t = np.linspace(0, 30)
+        y_target = self.y(t)
+        y_hat, opt_res = calibrate_nss_ols_bounded(t, y_target, min_ratio=1.2)
+        self.assertTrue(opt_res.success)
+        places = 6
+        self.assertAlmostEqual(self.y.beta0, y_hat.beta0, places=places)
+        self.assertAlmostEqual(self.y.beta3, y_hat.beta3, places=places)
+        self.assertAlmostEqual(self.y.tau1, y_hat.tau1, places=places)
+        self.assertAlmostEqual(self.y.tau2, y_hat.tau2, places=places)
+        self.assertTrue(np.allclose([y_hat.tau1, y_hat.tau2], opt_res.x))
+        for tau0 in [(-3.0, 100.0), (5.0, 1.0), (2.0, 2.0)]:
+            y_hat, opt_res = calibrate_nss_ols_bounded(
+                t, y_target, tau0=tau0, bounds=(0.5, 25.0)
+            )
+            self.assertTrue(opt_res.success, tau0)
+            self.assertGreaterEqual(y_hat.tau1, 0.5)
+            self.assertLessEqual(y_hat.tau2, 25.0 * (1 + 1e-12))
+            self.assertGreaterEqual(y_hat.tau2, 1.5 * y_hat.tau1 * (1 - 1e-12))
+        y_hat, opt_res = calibrate_nss_ols_bounded(t, y_target, max_condition=10.0)
+        self.assertFalse(opt_res.success)
+        self.assertEqual(-2, opt_res.status)
+        self.assertGreater(opt_res.condition_number, 10.0)
+        self.assertEqual(1, opt_res.nfev)
+        self.assertAlmostEqual(
+            2 * opt_res.cost, np.sum((y_hat(t) - y_target) ** 2), places=12
+        )
+
+    def test_nelson_siegel_svensson_weighted_betas(self):
+        """Test weighted and robust betas against ordinary least squares
+        without the outliers."""
+        t = np.linspace(0.5, 30, 20)
+        y_target = self.y(t)
+        tau = (self.y.tau1, self.y.tau2)
+        y_ols, _ = betas_nss_ols(tau, t, y_target)
+        y_wls, _ = betas_nss_wls(tau, t, y_target, np.full(t.size, 3.0))
+        self.assertTrue(np.allclose(y_ols(t), y_wls(t), rtol=1e-12))
+        y_outliers = y_target.copy()
+        y_outliers[[4, 11]] += [0.01, -0.02]
+        weights = np.ones(t.size)
+        weights[[4, 11]] = 0.0
+        y_wls, _ = betas_nss_wls(tau, t, y_outliers, weights)
+        self.assertAlmostEqual(self.y.beta0, y_wls.beta0, places=8)
+        for loss in ("huber", "bisquare"):
+            y_hat, irls_res = betas_nss_robust(tau, t, y_outliers, loss=loss)
+            self.assertTrue(irls_res.converged, loss)
+            self.assertLess(irls_res.weights[11], 0.01)
+            self.assertAlmostEqual(self.y.beta0, y_hat.beta0, places=4)
+            self.assertAlmostEqual(self.y.beta3, y_hat.beta3, places=3)
+        y_hat, irls_res = betas_nss_robust(tau, t, y_outliers, loss="bisquare")
+        self.assertEqual(0.0, irls_res.weights[4])
+        self.assertAlmostEqual(self.y.beta3, y_hat.beta3, places=10)
+
+    def test_nelson_siegel_svensson_weighted_calibration(self):
+        """Test weighted and robust calibration with outliers."""
+        t = np.array([0.25, 0.5, 1, 2, 3, 4, 5, 7, 10, 12, 15, 20, 25, 30])
+        y_true = NelsonSiegelSvenssonCurve(0.03, -0.02, 0.01, -0.01, 0.8, 6.0)
+        noise = np.random.default_rng(1).normal(0.0, 2e-5, t.size)
+        y_target = y_true(t) + noise
+        y_target[[3, 9]] += [0.004, -0.003]
+        weights = np.ones(t.size)
+        weights[[3, 9]] = 0.0
+        y_wls, opt_res = calibrate_nss_wls(t, y_target, weights, tau0=(1.0, 5.0))
+        self.assertTrue(opt_res.success)
+        self.assertLess(np.max(np.abs(y_wls(t) - y_true(t))), 1e-4)
+        y_hat, opt_res = calibrate_nss_robust(
+            t, y_target, loss="bisquare", tau0=(1.0, 5.0)
+        )
+        self.assertTrue(opt_res.success)
+        self.assertEqual([0.0, 0.0], opt_res.weights[[3, 9]].tolist())
+        self.assertLess(np.max(np.abs(y_hat(t) - y_true(t))), 1e-4)
+        self.assertGreater(opt_res.scale, 0.0)
+        self.assertGreater(opt_res.irls_nit, 0)
+        y_huber, opt_res = calibrate_nss_robust(t, y_target, tau0=(1.0, 5.0))
+        self.assertTrue(np.all(opt_res.weights[[3, 9]] < 0.1))
+        y_ols, _ = calibrate_nss_wls(t, y_target, np.ones(t.size), tau0=(1.0, 5.0))
+        error_ols = np.max(np.abs(y_ols(t) - y_true(t)))
+        self.assertLess(np.max(np.abs(y_huber(t) - y_true(t))), error_ols / 5)
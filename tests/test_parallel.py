@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelCurve, NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.calibrate import (
+    calibrate_ns_ols_grid,
+    calibrate_nss_ols,
+    calibrate_nss_ols_bounded,
+)
+from nelson_siegel_svensson.parallel import calibrate_iter, calibrate_many
+
+
+class TestCalibrateMany(unittest.TestCase):
+    """Tests for parallel calibration of many curves."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.t = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+        self.y = np.array(
+            [
+                NelsonSiegelSvenssonCurve(
+                    rng.uniform(0.02, 0.05), -0.02, 0.01, -0.01, 0.8, 6.0
+                )(self.t)
+                + rng.normal(0.0, 1e-4, self.t.size)
+                for _ in range(7)
+            ]
+        )
+
+    def test_executors(self):
+        """Test all executors against sequential calibration in order."""
+        expected = [calibrate_nss_ols(self.t, y)[0] for y in self.y]
+        for executor in ("serial", "thread", "process"):
+            results = calibrate_many(
+                self.t, self.y, executor=executor, max_workers=2, chunksize=3
+            )
+            self.assertEqual(len(self.y), len(results))
+            for curve_expected, (curve, status) in zip(expected, results):
+                self.assertIsInstance(curve, NelsonSiegelSvenssonCurve)
+                self.assertTrue(status.success)
+                self.assertEqual([curve.tau1, curve.tau2], status.x.tolist())
+                self.assertGreaterEqual(status.seconds, 0.0)
+                for name, value in vars(curve_expected).items():
+                    self.assertAlmostEqual(value, getattr(curve, name), places=12)
+
+    def test_ragged_jobs(self):
+        """Test jobs with individual time points."""
+        t = [self.t, self.t[2:], self.t[:-1]]
+        y = [self.y[0], self.y[1, 2:], self.y[2, :-1]]
+        results = calibrate_many(
+            t, y, nelson_siegel_svensson=False, method="grid", executor="serial"
+        )
+        for t_i, y_i, (curve, status) in zip(t, y, results):
+            self.assertIsInstance(curve, NelsonSiegelCurve)
+            expected, opt_res = calibrate_ns_ols_grid(t_i, y_i)
+            self.assertAlmostEqual(expected.tau, curve.tau)
+            self.assertAlmostEqual(2 * opt_res.cost, status.sse)
+        self.assertEqual([], calibrate_many(self.t, [], executor="serial"))
+
+    def test_bounded(self):
+        """Test bounded calibration with starting values."""
+        results = calibrate_many(
+            self.t, self.y[:2], method="bounded", tau0=(1.0, 4.0), executor="serial"
+        )
+        for y, (curve, status) in zip(self.y, results):
+            expected, opt_res = calibrate_nss_ols_bounded(self.t, y, tau0=(1.0, 4.0))
+            self.assertTrue(status.success)
+            self.assertEqual(opt_res.nfev, status.nfev)
+            self.assertAlmostEqual(expected.tau2, curve.tau2, places=12)
+
+    def test_grid_tau0(self):
+        """Test that tau0 is rejected for grid calibration before any job
+        is run."""
+        with self.assertRaisesRegex(ValueError, "tau0"):
+            calibrate_many(self.t, self.y, method="grid", tau0=(1.0, 4.0))
+        with self.assertRaisesRegex(ValueError, "tau0"):
+            next(calibrate_iter(zip([self.t], self.y), method="grid", tau0=1.0))
+
+    def test_calibrate_iter(self):
+        """Test streaming calibration against calibrate_many."""
+        expected = calibrate_many(self.t, self.y, executor="serial")
+        consumed = []
+
+        def jobs():
+            for y in self.y:
+                consumed.append(y)
+                yield self.t, y
+
+        results = calibrate_iter(jobs(), executor="thread", max_workers=1, chunksize=2)
+        curve, status = next(results)
+        self.assertLess(len(consumed), len(self.y))  # consumed lazily
+        self.assertEqual(expected[0][0], curve)
+        rest = list(results)
+        self.assertEqual(len(self.y), 1 + len(rest))
+        for (curve_expected, _), (curve, status) in zip(expected[1:], rest):
+            self.assertEqual(curve_expected, curve)
+        self.assertEqual([], list(calibrate_iter([])))
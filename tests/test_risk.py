@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from dataclasses import fields
+
+import numpy as np
+from scipy.optimize import least_squares
+
+from nelson_siegel_svensson import NelsonSiegelCurve, NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.bonds import bond_prices
+from nelson_siegel_svensson.calibrate import betas_nss_ols
+from nelson_siegel_svensson.risk import (
+    KeyRateRisk,
+    calibration_jacobian,
+    key_rate_risk,
+)
+
+
+def parameters(curve):
+    return np.array([getattr(curve, f.name) for f in fields(curve)])
+
+
+def calibrate(curve_type, t, y, x0):
+    """Least squares fit of all parameters to tight tolerances."""
+    opt_res = least_squares(
+        lambda x: curve_type(*x)(t) - y,
+        x0,
+        jac=lambda x: curve_type(*x).zero_jacobian(t),
+        method="lm",
+        xtol=1e-15,
+        ftol=1e-15,
+        gtol=1e-15,
+    )
+    return curve_type(*opt_res.x)
+
+
+class TestKeyRateRisk(unittest.TestCase):
+    """Tests for key-rate risk by analytic propagation of input yields."""
+
+    def setUp(self):
+        self.t = np.array([0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 30])
+        rng = np.random.default_rng(0)
+        self.noise = rng.normal(0.0, 1e-4, self.t.size)
+        # annual coupon bonds maturing in 1 to 25 years
+        self.times = np.arange(1.0, 26.0)
+        maturities = np.array([1, 3, 7, 12, 25])
+        self.cash_flows = np.zeros((maturities.size, self.times.size))
+        for i, maturity in enumerate(maturities):
+            self.cash_flows[i, :maturity] = 0.03
+            self.cash_flows[i, maturity - 1] += 1.0
+
+    def bumped(self, curve_type, y, curve, h):
+        """Central differences of parameters and bond prices by bumping
+        each input yield and recalibrating."""
+        dparams, dprices = [], []
+        for k in range(self.t.size):
+            bump = np.zeros(self.t.size)
+            bump[k] = h
+            up = calibrate(curve_type, self.t, y + bump, parameters(curve))
+            down = calibrate(curve_type, self.t, y - bump, parameters(curve))
+            dparams.append((parameters(up) - parameters(down)) / (2 * h))
+            dprices.append(
+                (
+                    bond_prices(up, self.cash_flows, self.times)
+                    - bond_prices(down, self.cash_flows, self.times)
+                )
+                / (2 * h)
+            )
+        return np.array(dparams).T, np.array(dprices).T
+
+    def test_calibration_jacobian(self):
+        """Test the implicit-function Jacobian of calibrated parameters and
+        key-rate sensitivities of bond prices against recalibration."""
+        for curve in [
+            NelsonSiegelCurve(0.04, -0.03, 0.02, 1.5),
+            NelsonSiegelSvenssonCurve(0.04, -0.03, 0.02, -0.01, 1.5, 6.0),
+        ]:
+            curve_type = type(curve)
+            y = curve(self.t) + self.noise
+            fitted = calibrate(curve_type, self.t, y, parameters(curve))
+            jacobian = calibration_jacobian(fitted, self.t, y)
+            self.assertEqual((len(fields(curve)), self.t.size), jacobian.shape)
+            dparams, dprices = self.bumped(curve_type, y, fitted, 1e-6)
+            scale = np.max(np.abs(jacobian))
+            self.assertTrue(np.allclose(dparams, jacobian, atol=1e-4 * scale))
+            risk = key_rate_risk(fitted, self.t, y, self.cash_flows, self.times)
+            self.assertIsInstance(risk, KeyRateRisk)
+            self.assertEqual((5, self.t.size), risk.sensitivities.shape)
+            self.assertTrue(np.allclose(dprices, risk.sensitivities, atol=1e-4))
+            self.assertTrue(
+                np.allclose(
+                    bond_prices(fitted, self.cash_flows, self.times), risk.prices
+                )
+            )
+            # a parallel shift of all yields shifts the curve in parallel
+            durations = -risk.sensitivities.sum(axis=1) / risk.prices
+            self.assertTrue(np.all(durations > 0))
+            self.assertAlmostEqual(1.0, jacobian[0].sum(), places=6)
+
+    def test_fixed_tau(self):
+        """Test sensitivities with fixed taus against the OLS betas."""
+        curve = NelsonSiegelSvenssonCurve(0.04, -0.03, 0.02, -0.01, 1.5, 6.0)
+        y = curve(self.t) + self.noise
+        jacobian = calibration_jacobian(curve, self.t, y, refit_tau=False)
+        self.assertTrue(np.all(jacobian[4:] == 0))
+        for k in range(self.t.size):
+            bump = np.zeros(self.t.size)
+            bump[k] = 1e-4
+            up, _ = betas_nss_ols((curve.tau1, curve.tau2), self.t, y + bump)
+            down, _ = betas_nss_ols((curve.tau1, curve.tau2), self.t, y)
+            expected = (parameters(up) - parameters(down)) / 1e-4
+            self.assertTrue(np.allclose(expected, jacobian[:, k]))
+
+    def test_portfolio(self):
+        """Test bucketed risk of a portfolio of bonds."""
+        curve = NelsonSiegelCurve(0.04, -0.03, 0.02, 1.5)
+        y = curve(self.t)
+        risk = key_rate_risk(curve, self.t, y, self.cash_flows, self.times)
+        positions = np.array([1.0, -2.0, 0.0, 0.5, 3.0])
+        changes = risk.price_changes()
+        self.assertTrue(np.allclose(1e-4 * risk.sensitivities, changes))
+        self.assertTrue(np.allclose(positions @ changes, risk.portfolio(positions)))
+        # first-order approximation of a recalibrated and repriced bump
+        bump = np.zeros(self.t.size)
+        bump[7] = 1e-4
+        bumped = calibrate(NelsonSiegelCurve, self.t, y + bump, parameters(curve))
+        repriced = bond_prices(bumped, self.cash_flows, self.times)
+        self.assertTrue(np.allclose(repriced - risk.prices, changes[:, 7], rtol=0.02))
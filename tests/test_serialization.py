@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from nelson_siegel_svensson import (
+    NelsonSiegelCurve,
+    NelsonSiegelCurveSet,
+    NelsonSiegelSvenssonCurve,
+)
+from nelson_siegel_svensson.serialization import (
+    curves_to_records,
+    load_curves,
+    record_to_curve,
+    records_to_curve_set,
+    records_to_curves,
+    save_curves,
+    select_dates,
+)
+
+
+class TestSerialization(unittest.TestCase):
+    """Tests for binary serialization of curve collections."""
+
+    def setUp(self):
+        self.curves = [
+            NelsonSiegelSvenssonCurve(0.03, -0.02, 0.01, -0.01, 0.8, 6.0),
+            NelsonSiegelCurve(0.017, -0.023, 0.24, 2.2),
+            NelsonSiegelSvenssonCurve(0.02, -0.01, 0.02, 0.01, 1.1, 4.0),
+        ]
+        self.dates = ["2022-01-04", "2022-01-03", "2022-01-05"]
+        self.ids = ["DE", "US", "GB_GILTS"]
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "curves.npy")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """Test saving and memory-mapped loading of mixed curves."""
+        save_curves(self.path, self.curves, self.dates, self.ids)
+        records = load_curves(self.path)
+        self.assertIsInstance(records, np.memmap)
+        # stored in order of date
+        order = [1, 0, 2]
+        self.assertEqual([self.ids[i] for i in order], records["id"].tolist())
+        self.assertEqual([self.curves[i] for i in order], records_to_curves(records))
+        self.assertEqual(self.curves[1], record_to_curve(records[0]))
+        # curve set of all records
+        t = np.array([0.0, 1.0, 10.0])
+        expected = np.array([self.curves[i](t) for i in order])
+        self.assertTrue(np.allclose(expected, records_to_curve_set(records)(t)))
+        self.assertTrue(np.array_equal(records, load_curves(self.path, None)))
+
+    def test_select_dates(self):
+        """Test selection of single dates and date ranges."""
+        save_curves(self.path, self.curves, self.dates, self.ids)
+        records = load_curves(self.path)
+        self.assertEqual(["DE"], select_dates(records, "2022-01-04")["id"].tolist())
+        selected = select_dates(records, "2022-01-04", "2022-12-31")
+        self.assertEqual(["DE", "GB_GILTS"], selected["id"].tolist())
+        self.assertEqual(0, select_dates(records, "2021-01-01", "2021-12-31").size)
+
+    def test_curve_sets(self):
+        """Test records of curve sets without dates and ids."""
+        curve_set = NelsonSiegelCurveSet.from_curves([self.curves[1]] * 2)
+        records = curves_to_records(curve_set)
+        self.assertEqual([self.curves[1]] * 2, records_to_curves(records))
+        self.assertTrue(np.isnat(records["date"]).all())
+        with self.assertRaises(ValueError):
+            curves_to_records(curve_set, ids=["a"])
+        with self.assertRaises(ValueError):
+            records_to_curves(np.zeros(2))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from nelson_siegel_svensson import NelsonSiegelCurve, NelsonSiegelSvenssonCurve
+from nelson_siegel_svensson.serialization import load_curves
+from nelson_siegel_svensson.store import CurveStore
+
+
+class TestCurveStore(unittest.TestCase):
+    """Tests for the memory-mapped curve store."""
+
+    def setUp(self):
+        self.ns = NelsonSiegelCurve(0.017, -0.023, 0.24, 2.2)
+        self.nss = NelsonSiegelSvenssonCurve(0.03, -0.02, 0.01, -0.01, 0.8, 6.0)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "store")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_append_and_get(self):
+        """Test appending in and out of date order and point lookups."""
+        store = CurveStore(self.path)
+        store.append([self.ns, self.nss], ["2022-01-03", "2022-01-03"], ["US", "DE"])
+        store.append([self.nss], ["2022-01-04"], ["US"])
+        self.assertEqual(self.ns, store.get("2022-01-03", "US"))
+        self.assertEqual(self.nss, store.get(np.datetime64("2022-01-04"), "US"))
+        with self.assertRaises(KeyError):
+            store.get("2022-01-04", "DE")
+        # out of date order, rebuilding the index
+        store.append([self.ns], ["2022-01-01"], ["FR"])
+        self.assertEqual(self.ns, store.get("2022-01-01", "FR"))
+        # replacing a stored curve
+        store.append([self.ns], ["2022-01-04"], ["US"])
+        self.assertEqual(self.ns, store.get("2022-01-04", "US"))
+        # reopened from disk, records file readable by load_curves
+        store = CurveStore(self.path)
+        self.assertEqual(5, len(store))
+        self.assertEqual(self.ns, store.get("2022-01-04", "US"))
+        records = load_curves(os.path.join(self.path, "records.npy"))
+        self.assertEqual(5, records.size)
+        with self.assertRaises(ValueError):
+            store.append([self.ns], ["2022-01-05"], ["X" * 17])
+
+    def test_range_scans(self):
+        """Test range scans by date and market."""
+        store = CurveStore(self.path)
+        dates = np.datetime64("2022-01-03") + np.arange(10)
+        for date in dates:
+            store.append([self.ns, self.nss], [date, date], ["US", "DE"])
+        records = store.records("2022-01-05", "2022-01-06")
+        self.assertEqual(["DE", "US", "DE", "US"], records["id"].tolist())
+        self.assertEqual(20, store.records().size)
+        self.assertEqual(0, store.records("2021-01-01", "2021-12-31").size)
+        self.assertEqual([self.ns] * 3, store.curves("2022-01-10", None, ["US"]))
+        t = np.array([1.0, 10.0])
+        curve_set = store.curve_set(end="2022-01-03")
+        expected = np.array([self.nss(t), self.ns(t)])
+        self.assertTrue(np.allclose(expected, curve_set(t)))